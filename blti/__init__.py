@@ -2,27 +2,81 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
+from django.conf import settings
 from blti.exceptions import BLTIException
-import json
+from blti.serializers import dumps_launch_data, loads_launch_data
+from blti.claims import get_claim_projection
+from blti.metrics import increment_counter
+from uuid import uuid4
+import logging
+import random
+
+
+logger = logging.getLogger(__name__)
 
 
 LTI_DATA_KEY = 'lti_launch_data'
+LTI_DATA_REQUEST_ATTR = '_lti_launch_data'
+LTI_DATA_GENERATION_KEY = 'lti_launch_generation'
+DEFAULT_DATA_SIZE_SAMPLE_RATE = 0.01
 
 
 class BLTI(object):
     def set_session(self, request, **kwargs):
-        if not request.session.exists(request.session.session_key):
-            request.session.create()
+        """
+        Store launch data in the session, leaving a new session unsaved
+        until issue_session_key()
+        """
+        # filter oauth_* parameters and unused claims
+        projection = get_claim_projection()
+        data = projection.project(kwargs)
+
+        serialized = dumps_launch_data(data)
+        request.session[LTI_DATA_KEY] = serialized
+        request.session[LTI_DATA_GENERATION_KEY] = uuid4().hex
+        setattr(request, LTI_DATA_REQUEST_ATTR, (serialized, data))
+
+        self._report_size(serialized, kwargs if projection.active else None)
 
-        # filter oauth_* parameters
-        for key in list(filter(
-                lambda key: key.startswith('oauth_'), kwargs.keys())):
-            kwargs.pop(key)
+    def issue_session_key(self, request):
+        """
+        Save a new session so the launch response has its key.  Logging
+        the launch user in will have saved it already.
+        """
+        if request.session.session_key is None:
+            request.session.save()
 
-        request.session[LTI_DATA_KEY] = json.dumps(kwargs)
+    def _report_size(self, serialized, unprojected=None):
+        size = len(serialized)
+        increment_counter('launch_data.stored')
+        increment_counter('launch_data.bytes', size)
+
+        # serializing the unprojected data again costs about as much as
+        # storing it, so its size is measured for a sample of launches
+        if unprojected is None or random.random() >= getattr(
+                settings, 'LTI_DATA_SIZE_SAMPLE_RATE',
+                DEFAULT_DATA_SIZE_SAMPLE_RATE):
+            return
+
+        unprojected_size = len(dumps_launch_data(unprojected))
+        increment_counter('launch_data.sampled')
+        increment_counter('launch_data.sampled_bytes', size)
+        increment_counter(
+            'launch_data.sampled_unprojected_bytes', unprojected_size)
+        logger.debug(f"launch data stored: {size} bytes "
+                     f"({unprojected_size} bytes before projection)")
 
     def get_session(self, request):
         try:
-            return json.loads(request.session[LTI_DATA_KEY])
+            serialized = request.session[LTI_DATA_KEY]
         except KeyError:
             raise BLTIException('Invalid Session')
+
+        # launch data is decoded at most once per request, and
+        # again only if the session value is replaced
+        cached = getattr(request, LTI_DATA_REQUEST_ATTR, None)
+        if cached is None or cached[0] != serialized:
+            cached = (serialized, loads_launch_data(serialized))
+            setattr(request, LTI_DATA_REQUEST_ATTR, cached)
+
+        return cached[1]
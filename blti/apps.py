@@ -0,0 +1,9 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.apps import AppConfig
+
+
+class BLTIConfig(AppConfig):
+    name = 'blti'
+    default_auto_field = 'django.db.models.AutoField'
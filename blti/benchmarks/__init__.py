@@ -0,0 +1,20 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""
+Microbenchmarks for the request hot paths.  Each module in this package
+provides run(iterations) returning a list of (label, seconds) timings
+or (label, value, unit) measurements, and is run with
+"python manage.py run_benchmarks <module> ...".
+"""
+
+import time
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+
+    return time.perf_counter() - start
@@ -0,0 +1,35 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from blti.benchmarks import timed
+from blti.mock_data import Mock1p3Data
+from blti.models import CanvasData
+
+
+ROLE_FLAGS = ['is_member', 'is_administrator', 'is_canvas_administrator',
+              'is_staff', 'is_instructor', 'is_teaching_assistant',
+              'is_student', 'is_designer']
+
+
+def run(iterations):
+    data = Mock1p3Data().launch_data()
+
+    def construct():
+        CanvasData(**data)
+
+    def construct_authorize():
+        CanvasData(**data).is_member
+
+    def construct_all_flags():
+        # the cost of construction when every flag was computed eagerly
+        blti = CanvasData(**data)
+        for flag in ROLE_FLAGS:
+            getattr(blti, flag)
+
+    return [
+        ('CanvasData()', timed(construct, iterations)),
+        ('CanvasData() + is_member', timed(construct_authorize, iterations)),
+        ('CanvasData() + all role flags',
+         timed(construct_all_flags, iterations)),
+    ]
@@ -0,0 +1,41 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from blti.benchmarks import timed
+from blti.mock_data import Mock1p3Data
+from blti.models import CanvasData, CompactCanvasData
+import tracemalloc
+
+
+def allocated(factory, iterations):
+    # bytes and allocations still held by iterations model instances
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        instances = [factory() for _ in range(iterations)]
+        stats = tracemalloc.take_snapshot().compare_to(before, 'filename')
+    finally:
+        tracemalloc.stop()
+
+    del instances
+    return (sum(s.size_diff for s in stats) / iterations,
+            sum(s.count_diff for s in stats) / iterations)
+
+
+def run(iterations):
+    data = Mock1p3Data().launch_data()
+    results = []
+
+    for label, factory in [
+            ('CanvasData', lambda: CanvasData(**data)),
+            ('CompactCanvasData', lambda: CompactCanvasData(data))]:
+        size, count = allocated(factory, iterations)
+        results += [
+            (f"{label} bytes/instance", size, 'B'),
+            (f"{label} allocations/instance", count, ''),
+            (f"{label} construct + authorize", timed(
+                lambda: factory().is_member, iterations)),
+        ]
+
+    return results
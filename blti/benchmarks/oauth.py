@@ -0,0 +1,84 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, override_settings
+from blti.benchmarks import timed
+from blti.oauth import BLTIOAuthVerifier
+from blti.validators import BLTIRequestValidator
+from oauthlib.oauth1.rfc5849.endpoints.signature_only import (
+    SignatureOnlyEndpoint)
+from oauthlib.common import generate_nonce, generate_timestamp
+import oauthlib.oauth1
+
+
+CONSUMER_KEY = 'XXXXXXXXXXXXXX'
+CONSUMER_SECRET = 'secret'
+LAUNCH_PARAMS = {
+    'lti_message_type': 'basic-lti-launch-request',
+    'lti_version': 'LTI-1p0',
+    'roles': 'Instructor,urn:lti:instrole:ims/lis/Administrator',
+    'context_id': 'xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx',
+    'context_title': 'Benchmark Course',
+    'custom_canvas_course_id': '123456',
+    'custom_canvas_user_id': '654321',
+    'custom_canvas_user_login_id': 'javerage',
+    'lis_person_name_full': 'J Average',
+    'lis_person_contact_email_primary': 'javerage@example.edu',
+    'launch_presentation_return_url': 'https://example.instructure.com/',
+    'tool_consumer_info_product_family_code': 'canvas',
+}
+
+
+class AcceptingNonceStore(object):
+    # a fresh nonce per iteration would time oauthlib signing too
+    def check_and_add(self, key, expires):
+        return True
+
+
+def oauthlib_launch(request):
+    # validate_1p1 before BLTIOAuthVerifier, including the retry
+    # made for a scheme fixed up behind ingress
+    endpoint = SignatureOnlyEndpoint(BLTIRequestValidator())
+    uri = request.build_absolute_uri()
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    valid, oauth_req = endpoint.validate_request(
+        uri, request.method, request.body, headers)
+    if not valid and uri.startswith('http:'):
+        valid, oauth_req = endpoint.validate_request(
+            f"https{uri[4:]}", request.method, request.body, headers)
+
+    return dict(oauth_req.params)
+
+
+def run(iterations):
+    client = oauthlib.oauth1.Client(
+        CONSUMER_KEY, client_secret=CONSUMER_SECRET,
+        signature_type=oauthlib.oauth1.SIGNATURE_TYPE_BODY,
+        nonce=generate_nonce(), timestamp=generate_timestamp())
+    uri, headers, body = client.sign(
+        'https://testserver/launch', http_method='POST', body=LAUNCH_PARAMS,
+        headers={'Content-Type': 'application/x-www-form-urlencoded'})
+
+    factory = RequestFactory()
+    secure = factory.post('/launch', body, content_type=headers[
+        'Content-Type'], secure=True)
+    insecure = factory.post('/launch', body, content_type=headers[
+        'Content-Type'], HTTP_X_FORWARDED_PROTO='https')
+    verifier = BLTIOAuthVerifier()
+
+    with override_settings(
+            ALLOWED_HOSTS=['testserver'],
+            LTI_CONSUMERS={CONSUMER_KEY: CONSUMER_SECRET},
+            LTI_NONCE_STORE='blti.benchmarks.oauth.AcceptingNonceStore',
+            LTI_PROXY_SCHEME_HEADER='HTTP_X_FORWARDED_PROTO'):
+        return [
+            ('oauthlib SignatureOnlyEndpoint', timed(
+                lambda: oauthlib_launch(secure), iterations)),
+            ('BLTIOAuthVerifier', timed(
+                lambda: verifier.verify(secure), iterations)),
+            ('oauthlib SignatureOnlyEndpoint, scheme retry', timed(
+                lambda: oauthlib_launch(insecure), iterations)),
+            ('BLTIOAuthVerifier, proxy scheme', timed(
+                lambda: verifier.verify(insecure), iterations)),
+        ]
@@ -0,0 +1,44 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from blti.benchmarks import timed
+from blti.keyset import PublicKeyCache
+from blti.management.commands.generate_credentials import Command
+from jwcrypto.jwk import JWK
+import json
+import jwt
+
+
+ISSUER = 'https://canvas.instructure.com'
+KID = 'benchmark'
+
+
+def run(iterations):
+    credentials = Command()
+    private_key, public_key = credentials.create_keys()
+    jwk = json.loads(credentials.create_jwk(public_key))
+    jwk['kid'] = KID
+    id_token = jwt.encode({'iss': ISSUER, 'sub': 'benchmark'}, private_key,
+                          algorithm='RS256', headers={'kid': KID})
+
+    def pem_per_launch():
+        # pylti1p3: jwk to pem, parsed again by jwt.decode
+        pem = JWK.from_json(json.dumps(jwk)).export_to_pem()
+        jwt.decode(id_token, pem, algorithms=['RS256'])
+
+    def cold():
+        key = PublicKeyCache().get_key(ISSUER, jwk, 'RS256')
+        jwt.decode(id_token, key, algorithms=['RS256'])
+
+    cache = PublicKeyCache()
+
+    def warm():
+        key = cache.get_key(ISSUER, jwk, 'RS256')
+        jwt.decode(id_token, key, algorithms=['RS256'])
+
+    return [
+        ('RS256 verify, pem per launch', timed(pem_per_launch, iterations)),
+        ('RS256 verify, cold key cache', timed(cold, iterations)),
+        ('RS256 verify, warm key cache', timed(warm, iterations)),
+    ]
@@ -0,0 +1,41 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from blti.benchmarks import timed
+from blti.keyring import Keyring, ToolKey
+from blti.tool_config import BLTIRegistration
+from blti.management.commands.generate_credentials import Command
+from pylti1p3.registration import Registration
+import jwt
+
+
+CLAIMS = {'iss': '10000000000001', 'sub': '10000000000001',
+          'aud': 'https://canvas.instructure.com/login/oauth2/token'}
+
+
+def run(iterations):
+    private_key, public_key = [
+        key.decode('utf-8') for key in Command().create_keys()]
+
+    def sign(registration):
+        # as pylti1p3's service connector signs a client assertion
+        def signing():
+            jwt.encode(CLAIMS, registration.get_tool_private_key(),
+                       algorithm='RS256',
+                       headers={'kid': registration.get_kid()})
+
+        return signing
+
+    pem = Registration().set_tool_private_key(
+        private_key).set_tool_public_key(public_key)
+    own_key = BLTIRegistration().set_tool_private_key(
+        private_key).set_tool_public_key(public_key)
+    keyring = BLTIRegistration(Keyring([
+        ToolKey.generate(private_key, public_key)]))
+
+    return [
+        ('RS256 sign, pem per signing', timed(sign(pem), iterations)),
+        ('RS256 sign, registration key', timed(sign(own_key), iterations)),
+        ('RS256 sign, keyring key', timed(sign(keyring), iterations)),
+    ]
@@ -0,0 +1,58 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from blti.benchmarks import timed
+from blti.tool_config import IndexedToolConf
+from pylti1p3.tool_config import ToolConfDict
+
+
+ISSUER = 'https://canvas.instructure.com'
+REGISTRATION_COUNTS = [10, 1000, 5000]
+DEPLOYMENT_COUNT = 5
+
+
+def tool_conf_json(count):
+    # one issuer, as for Canvas, with count client ids
+    return {ISSUER: [{
+        'default': n == 0,
+        'client_id': f"1000000000{n:04d}",
+        'auth_login_url': f"{ISSUER}/api/lti/authorize_redirect",
+        'auth_token_url': f"{ISSUER}/login/oauth2/token",
+        'key_set_url': f"{ISSUER}/api/lti/security/jwks",
+        'private_key': 'private',
+        'deployment_ids': [f"{n}:{d}" for d in range(DEPLOYMENT_COUNT)],
+    } for n in range(count)]}
+
+
+def run(iterations):
+    results = []
+    for count in REGISTRATION_COUNTS:
+        json_data = tool_conf_json(count)
+        client_id = f"1000000000{count - 1:04d}"
+        deployment_id = f"{count - 1}:{DEPLOYMENT_COUNT - 1}"
+
+        dict_conf = ToolConfDict(json_data)
+        for iss_conf in json_data[ISSUER]:
+            dict_conf.set_private_key(
+                ISSUER, 'private', client_id=iss_conf['client_id'])
+
+        indexed = IndexedToolConf(json_data)
+
+        def launch_lookup(tool_conf):
+            # registration then deployment, as for a message launch
+            def lookup():
+                tool_conf.find_registration_by_params(ISSUER, client_id)
+                tool_conf.find_deployment_by_params(
+                    ISSUER, deployment_id, client_id)
+
+            return lookup
+
+        results += [
+            (f"{count} registrations, ToolConfDict lookup",
+             timed(launch_lookup(dict_conf), iterations)),
+            (f"{count} registrations, indexed lookup",
+             timed(launch_lookup(indexed), iterations)),
+        ]
+
+    return results
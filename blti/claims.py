@@ -0,0 +1,108 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from functools import lru_cache
+
+
+LTI_DATA_CLAIM_BASE = 'https://purl.imsglobal.org/spec/lti/claim/'
+LTI_CUSTOM_CLAIM = f"{LTI_DATA_CLAIM_BASE}custom"
+CUSTOM_PARAMETER_PREFIX = 'custom.'
+
+# claims the launch data models and middleware depend upon
+REQUIRED_CLAIMS = ('tool_platform', 'tool_consumer_info_product_family_code',
+                   'roles', 'custom.canvas_user_login_id')
+
+
+class ClaimSet(object):
+    """
+    Launch data keys matching a list of claim names.  A name matches the
+    1.3 claim of that name, the same 1.1 key and 1.1 keys prefixed by it
+    ("lis" matches lis_person_sourcedid), while "custom.<name>" matches a
+    single custom parameter and full claim urls match only themselves.
+    """
+    def __init__(self, names):
+        self.keys = set()
+        self.custom = set()
+        prefixes = []
+        for name in names:
+            if name.startswith(CUSTOM_PARAMETER_PREFIX):
+                custom_name = name[len(CUSTOM_PARAMETER_PREFIX):]
+                self.custom.add(custom_name)
+                self.keys.add(f"custom_{custom_name}")
+            elif '://' in name:
+                self.keys.add(name)
+            else:
+                self.keys.update([name, f"{LTI_DATA_CLAIM_BASE}{name}"])
+                prefixes.append(f"{name}_")
+
+        self.prefixes = tuple(prefixes)
+
+    def __contains__(self, key):
+        return key in self.keys or key.startswith(self.prefixes)
+
+
+class ClaimProjection(object):
+    """
+    Reduces launch data to the claims a tool uses before it is stored.
+    oauth_* parameters are always dropped, and required claims always
+    kept, however they are named in the include or exclude lists.
+    """
+    _required = ClaimSet(REQUIRED_CLAIMS)
+
+    def __init__(self, include=None, exclude=None):
+        self.active = include is not None or bool(exclude)
+        self._include = ClaimSet(include) if include is not None else None
+        self._exclude = ClaimSet(exclude or [])
+
+    def project(self, data):
+        projected = {}
+        for key, value in data.items():
+            if key.startswith('oauth_'):
+                continue
+
+            if key == LTI_CUSTOM_CLAIM and isinstance(value, dict):
+                value = self._project_custom(value)
+                if value is None:
+                    continue
+            elif not self._keep(key):
+                continue
+
+            projected[key] = value
+
+        return projected
+
+    def _keep(self, key):
+        return key in self._required or not (key in self._exclude or (
+            self._include is not None and key not in self._include))
+
+    def _keep_custom(self, name):
+        if name in self._required.custom:
+            return True
+
+        if LTI_CUSTOM_CLAIM in self._exclude or name in self._exclude.custom:
+            return False
+
+        return self._include is None or LTI_CUSTOM_CLAIM in (
+            self._include) or name in self._include.custom
+
+    def _project_custom(self, custom):
+        custom = {k: v for k, v in custom.items() if self._keep_custom(k)}
+        if not custom and LTI_CUSTOM_CLAIM in self._exclude:
+            return None
+
+        return custom
+
+
+@lru_cache(maxsize=8)
+def _claim_projection(include, exclude):
+    return ClaimProjection(include, exclude)
+
+
+def get_claim_projection():
+    include = getattr(settings, 'LTI_DATA_INCLUDE_CLAIMS', None)
+    exclude = getattr(settings, 'LTI_DATA_EXCLUDE_CLAIMS', None)
+    return _claim_projection(
+        tuple(include) if include is not None else None,
+        tuple(exclude) if exclude else None)
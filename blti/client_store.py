@@ -0,0 +1,195 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from django.core.signing import TimestampSigner, BadSignature
+from django.http import HttpResponse
+from django.urls import reverse
+from django.utils.html import format_html, json_script
+from functools import lru_cache
+from blti.config import get_platform_origins
+from blti.metrics import increment_counter, observe, get_percentile
+from blti.nonce import get_nonce_store
+from numbers import Real
+from uuid import uuid4
+import hashlib
+import secrets
+import time
+import os
+
+
+CLIENT_STORE_SCRIPT = os.path.join(
+    os.path.dirname(__file__), 'static', 'blti', 'js', 'client_store.js')
+CLIENT_STORE_DATA_ID = 'blti-client-store'
+CLIENT_STORE_PAGE = (
+    '<!DOCTYPE html><html><head><meta charset="utf-8">{}'
+    '<script src="{}" nonce="{}"></script></head><body></body></html>')
+CLIENT_STORE_ACTIONS = ('put', 'get')
+CLIENT_STORE_OTHER_ORIGIN = 'other'
+DEFAULT_CLIENT_STORE_TIMEOUT = 5000
+DEFAULT_CLIENT_STORE_TIMEOUT_MIN = 1000
+DEFAULT_CLIENT_STORE_TIMEOUT_MAX = 10000
+DEFAULT_CLIENT_STORE_TIMEOUT_SAMPLES = 20
+MAX_CLIENT_STORE_TIME = 600000
+CLIENT_STORE_BEACON_SALT = 'blti.client_store.beacon'
+DEFAULT_CLIENT_STORE_BEACON_MAX_AGE = 600
+
+
+@lru_cache(maxsize=1)
+def client_store_script():
+    """
+    Content of the client side storage script and its fingerprint,
+    read once
+    """
+    with open(CLIENT_STORE_SCRIPT, 'rb') as f:
+        content = f.read()
+
+    return content, hashlib.sha256(content).hexdigest()[:16]
+
+
+def get_client_store_script_url():
+    return reverse('client-store-script', kwargs={
+        'version': client_store_script()[1]})
+
+
+def get_csp_nonce(request):
+    """
+    The request's CSP nonce when a CSP middleware provides one, and
+    whether the response needs a policy of its own
+    """
+    nonce = getattr(request, 'csp_nonce', None) if request else None
+    if nonce:
+        return str(nonce), False
+
+    return secrets.token_urlsafe(16), True
+
+
+def client_store_response(data, request=None):
+    """
+    Minimal page running the client side storage script with data
+    """
+    nonce, own_policy = get_csp_nonce(request)
+    data = dict(data, beacon=reverse('client-store-beacon'),
+                beacon_token=client_store_beacon_token(
+                    data.get('action'), data.get('origin')))
+    response = HttpResponse(format_html(
+        CLIENT_STORE_PAGE, json_script(data, CLIENT_STORE_DATA_ID),
+        get_client_store_script_url(), nonce))
+
+    if own_policy:
+        response['Content-Security-Policy'] = (
+            f"script-src 'nonce-{nonce}'; object-src 'none'; "
+            "base-uri 'none'")
+
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def client_store_beacon_token(action, origin):
+    """
+    Signed, expiring token naming the flow a page may report timing for
+    """
+    return TimestampSigner(salt=CLIENT_STORE_BEACON_SALT).sign_object({
+        'action': action, 'origin': origin, 'nonce': uuid4().hex})
+
+
+def client_store_beacon_flow(token):
+    """
+    The action and origin of an unexpired beacon token, accepting each
+    token once
+    """
+    max_age = getattr(settings, 'LTI_CLIENT_STORE_BEACON_MAX_AGE',
+                      DEFAULT_CLIENT_STORE_BEACON_MAX_AGE)
+    if not isinstance(token, str):
+        raise ValueError('Missing beacon token')
+
+    try:
+        flow = TimestampSigner(salt=CLIENT_STORE_BEACON_SALT).unsign_object(
+            token, max_age=max_age)
+    except BadSignature:
+        raise ValueError('Invalid beacon token')
+
+    if not get_nonce_store().check_and_add(
+            f"beacon-{flow['nonce']}", time.time() + max_age):
+        raise ValueError('Replayed beacon token')
+
+    return flow['action'], flow['origin']
+
+
+def client_store_metric(action, name, origin):
+    return f"client_store.{action}.{name}.{origin}"
+
+
+def get_client_store_timeout(action, origin):
+    """
+    Milliseconds the storage flow waits on the platform before going
+    ahead without it.  With LTI_CLIENT_STORE_TIMEOUT_PERCENTILE set, and
+    enough reports from the platform origin, the timeout is that
+    percentile of its reported completion times within the min and max
+    bounds, and otherwise LTI_CLIENT_STORE_TIMEOUT.
+    """
+    timeout = getattr(settings, 'LTI_CLIENT_STORE_TIMEOUT',
+                      DEFAULT_CLIENT_STORE_TIMEOUT)
+    percent = getattr(settings, 'LTI_CLIENT_STORE_TIMEOUT_PERCENTILE', None)
+    if not percent:
+        return timeout
+
+    observed = get_percentile(
+        client_store_metric(action, 'complete_ms', origin), percent,
+        min_count=getattr(settings, 'LTI_CLIENT_STORE_TIMEOUT_SAMPLES',
+                          DEFAULT_CLIENT_STORE_TIMEOUT_SAMPLES))
+    if observed is None:
+        return timeout
+
+    return int(max(
+        getattr(settings, 'LTI_CLIENT_STORE_TIMEOUT_MIN',
+                DEFAULT_CLIENT_STORE_TIMEOUT_MIN),
+        min(observed, getattr(settings, 'LTI_CLIENT_STORE_TIMEOUT_MAX',
+                              DEFAULT_CLIENT_STORE_TIMEOUT_MAX))))
+
+
+def _client_store_time(report, name):
+    value = report.get(name)
+    if value is None:
+        return None
+
+    if isinstance(value, bool) or not isinstance(value, Real) or not (
+            0 <= value <= MAX_CLIENT_STORE_TIME):
+        raise ValueError(f"Invalid {name}")
+
+    return value
+
+
+def record_client_store_report(report):
+    """
+    Add a client timing report to the platform origin's histograms.
+    The action and origin are those its beacon token was issued for.
+    Flows that timed out are only counted, so that waits cut short by
+    the timeout don't raise the timeout itself.
+    """
+    action, origin = client_store_beacon_flow(report.get('beacon_token'))
+    if action not in CLIENT_STORE_ACTIONS:
+        raise ValueError('Invalid action')
+
+    # only registered platforms get histograms of their own
+    if origin not in get_platform_origins():
+        origin = CLIENT_STORE_OTHER_ORIGIN
+
+    capabilities_ms = _client_store_time(report, 'capabilities_ms')
+    complete_ms = _client_store_time(report, 'complete_ms')
+    fallback = report.get('fallback') is True
+    if capabilities_ms is not None and complete_ms is not None and (
+            capabilities_ms > complete_ms):
+        raise ValueError('Implausible timing')
+
+    if capabilities_ms is not None:
+        observe(client_store_metric(action, 'capabilities_ms', origin),
+                capabilities_ms)
+
+    if complete_ms is not None and not fallback:
+        observe(client_store_metric(action, 'complete_ms', origin),
+                complete_ms)
+
+    increment_counter(client_store_metric(
+        action, 'fallback' if fallback else 'completed', origin))
@@ -3,22 +3,304 @@
 
 
 import os
+import json
+import time
+import threading
 from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
 from importlib import resources
-from pylti1p3.tool_config import ToolConfJsonFile
-from pylti1p3.contrib.django import DjangoCacheDataStorage
+from blti.tool_config import IndexedToolConf, merge_tool_conf
+from blti.keyring import read_keyring
 
 
 LTI1P3_CONFIG_DIRECTORY_NAME = 'lti_config'
 LTI1P3_CONFIG_FILE_NAME = 'tool.json'
+LTI_KEYRING_FILE_NAME = 'keyring.json'
+DEFAULT_TOOL_CONF_SOURCES = ['blti.config.JSONFileToolConfSource']
+DEFAULT_TOOL_CONF_CHECK_INTERVAL = 5
+TOOL_CONF_GENERATION_KEY = 'blti-tool-conf-generation'
+DEFAULT_LAUNCH_DATA_STORAGE = (
+    'pylti1p3.contrib.django.DjangoCacheDataStorage')
+
+
+class JSONFileToolConfSource(object):
+    """
+    Registrations from the tool.json style files named by
+    LTI_TOOL_CONF_FILES, relative to the LTI config directory, with the
+    key files each references read relative to that file.  Its
+    signature changes with any of those files on disk (mtime, inode or
+    size).
+    """
+    def __init__(self):
+        self._key_files = ()
+
+    def paths(self):
+        return [os.path.join(get_lti_config_directory(), name) for (
+            name) in getattr(settings, 'LTI_TOOL_CONF_FILES', [
+                LTI1P3_CONFIG_FILE_NAME])]
+
+    def load(self):
+        tool_confs = []
+        key_files = []
+        for path in self.paths():
+            if not os.path.isfile(path):
+                raise ImproperlyConfigured(
+                    f"LTI tool config file not found: {path}")
+
+            with open(path, encoding='utf-8') as f:
+                tool_conf = json.load(f)
+
+            for iss_conf in self._conf_items(tool_conf):
+                for key in ['private_key', 'public_key']:
+                    key_file = iss_conf.get(f"{key}_file")
+                    if key_file:
+                        key_file = os.path.join(
+                            os.path.dirname(path), key_file)
+                        key_files.append(key_file)
+                        with open(key_file, encoding='utf-8') as f:
+                            iss_conf[key] = f.read()
+
+            tool_confs.append(tool_conf)
+
+        self._key_files = tuple(key_files)
+        return tool_confs
+
+    def signature(self):
+        return file_signature(self.paths() + list(self._key_files))
+
+    @staticmethod
+    def _conf_items(tool_conf):
+        for iss_conf in tool_conf.values():
+            for conf in (iss_conf if isinstance(iss_conf, list) else [
+                    iss_conf]):
+                if isinstance(conf, dict):
+                    yield conf
+
+
+class KeyringFile(object):
+    """
+    The tool keyring described by LTI_KEYRING_FILE, by default
+    keyring.json in the LTI config directory, if there is one
+    """
+    def __init__(self):
+        self._key_files = ()
+
+    def path(self):
+        return getattr(settings, 'LTI_KEYRING_FILE', os.path.join(
+            get_lti_config_directory(), LTI_KEYRING_FILE_NAME))
+
+    def load(self):
+        path = self.path()
+        if not os.path.isfile(path):
+            self._key_files = ()
+            return None
+
+        keyring, key_files = read_keyring(path)
+        self._key_files = tuple(key_files)
+        return keyring
+
+    def signature(self):
+        return file_signature([self.path()] + list(self._key_files))
+
+
+class ModelToolConfSource(object):
+    """
+    Active LTIRegistration rows with their active deployments and key
+    pairs, read in two queries.  Its signature is the generation counter
+    shared through the Django cache, so no query is made until a
+    registration changes.
+    """
+    def load(self):
+        from blti.models import LTIRegistration, LTIDeployment
+
+        # read before the rows, so a change committed meanwhile
+        # prompts another load
+        get_tool_conf_generation(refresh=True)
+
+        deployment_ids = {}
+        for registration_id, deployment_id in LTIDeployment.objects.filter(
+                is_active=True, registration__is_active=True).values_list(
+                    'registration_id', 'deployment_id'):
+            deployment_ids.setdefault(registration_id, []).append(
+                deployment_id)
+
+        tool_conf = {}
+        for registration in LTIRegistration.objects.filter(
+                is_active=True).select_related('key_pair').order_by('id'):
+            key_pair = registration.key_pair
+            tool_conf.setdefault(registration.issuer, []).append({
+                'default': registration.is_default,
+                'client_id': registration.client_id,
+                'auth_login_url': registration.auth_login_url,
+                'auth_token_url': registration.auth_token_url,
+                'auth_audience': registration.auth_audience or None,
+                'key_set_url': registration.key_set_url or None,
+                'key_set': registration.key_set,
+                'private_key': key_pair.private_key if key_pair else None,
+                'public_key': key_pair.public_key if key_pair else None,
+                'deployment_ids': deployment_ids.get(registration.pk, []),
+            })
+
+        return [tool_conf]
+
+    def signature(self):
+        return get_tool_conf_generation()
+
+
+class ToolConfCache(object):
+    """
+    Process-wide tool configuration, merged from the sources named by
+    LTI_TOOL_CONF_SOURCES and indexed for lookup.  Sources are loaded
+    once, and again only when the signature of one of them changes or
+    reload() is called.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tool_conf = None
+        self._sources = ()
+        self._signature = None
+        self.version = 0
+
+    def get(self):
+        if self._tool_conf is None or self._changed():
+            with self._lock:
+                if self._tool_conf is None or self._changed():
+                    self._load()
+
+        return self._tool_conf
+
+    def reload(self):
+        with self._lock:
+            self._tool_conf = None
+            self._sources = ()
+            self._signature = None
+
+    def _load(self):
+        sources = get_tool_conf_sources()
+        tool_confs = []
+        for source in sources:
+            tool_confs.extend(source.load())
+
+        keyring_file = KeyringFile()
+        keyring = keyring_file.load()
+
+        self._sources = sources + [keyring_file]
+        self._signature = self._source_signature()
+        self._tool_conf = IndexedToolConf(
+            merge_tool_conf(tool_confs), keyring=keyring)
+        self.version += 1
+
+    def _changed(self):
+        return self._source_signature() != self._signature
+
+    def _source_signature(self):
+        return tuple(source.signature() for source in self._sources)
+
+
+def file_signature(paths):
+    # changes with any of the files on disk (mtime, inode or size)
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_ino, st.st_size))
+        except OSError:
+            signature.append((path, None, None, None))
+
+    return tuple(signature)
+
+
+_tool_conf_cache = ToolConfCache()
 
 
 def get_tool_conf():
-    return ToolConfJsonFile(get_lti_config_path())
+    return _tool_conf_cache.get()
+
+
+def get_keyring():
+    """
+    The tool keyring, or None without a keyring manifest
+    """
+    return _tool_conf_cache.get().keyring
+
+
+def get_tool_conf_version():
+    _tool_conf_cache.get()
+    return _tool_conf_cache.version
+
+
+def get_registration_index():
+    """
+    Client ids registered for each issuer in the tool configuration
+    """
+    return _tool_conf_cache.get().get_client_ids()
+
+
+def get_platform_origins():
+    """
+    Origins of the registered platforms' authorization endpoints
+    """
+    return _tool_conf_cache.get().get_platform_origins()
+
+
+def _tool_conf_generation_cache():
+    return caches[getattr(settings, 'LTI_TOOL_CONF_CACHE', 'default')]
+
+
+_tool_conf_generation = (None, 0)
+
+
+def get_tool_conf_generation(refresh=False):
+    """
+    The shared tool configuration generation, read from the cache at
+    most once per LTI_TOOL_CONF_CHECK_INTERVAL seconds
+    """
+    global _tool_conf_generation
+    generation, checked = _tool_conf_generation
+    now = time.time()
+    if refresh or generation is None or now - checked >= getattr(
+            settings, 'LTI_TOOL_CONF_CHECK_INTERVAL',
+            DEFAULT_TOOL_CONF_CHECK_INTERVAL):
+        cache = _tool_conf_generation_cache()
+        generation = cache.get(TOOL_CONF_GENERATION_KEY)
+        if generation is None:
+            # unset or evicted, start past any earlier count
+            cache.add(TOOL_CONF_GENERATION_KEY, time.time_ns())
+            generation = cache.get(TOOL_CONF_GENERATION_KEY)
+
+        _tool_conf_generation = (generation, now)
+
+    return generation
+
+
+def bump_tool_conf_generation():
+    """
+    Have every process reload its tool configuration
+    """
+    global _tool_conf_generation
+    cache = _tool_conf_generation_cache()
+    try:
+        cache.incr(TOOL_CONF_GENERATION_KEY)
+    except ValueError:
+        cache.add(TOOL_CONF_GENERATION_KEY, time.time_ns())
+
+    _tool_conf_generation = (None, 0)
+
+
+def get_tool_conf_sources():
+    return [import_string(source)() for source in getattr(
+        settings, 'LTI_TOOL_CONF_SOURCES', DEFAULT_TOOL_CONF_SOURCES)]
+
+
+def reload_tool_conf():
+    _tool_conf_cache.reload()
 
 
 def get_launch_data_storage():
-    return DjangoCacheDataStorage()
+    return import_string(getattr(
+        settings, 'LTI_LAUNCH_DATA_STORAGE', DEFAULT_LAUNCH_DATA_STORAGE))()
 
 
 def get_lti_config_directory():
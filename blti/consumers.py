@@ -0,0 +1,148 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from blti.config import get_lti_config_directory
+import threading
+import logging
+import time
+import json
+import os
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONSUMER_BACKENDS = ['blti.consumers.SettingsConsumerBackend']
+DEFAULT_CONSUMER_REGISTRY_TTL = 300
+DEFAULT_CONSUMER_NEGATIVE_TTL = 60
+LTI_CONSUMERS_FILE_NAME = 'consumers.json'
+
+
+class SettingsConsumerBackend(object):
+    def consumers(self):
+        return getattr(settings, 'LTI_CONSUMERS', {})
+
+
+class ModelConsumerBackend(object):
+    def consumers(self):
+        from blti.models import LTIConsumer
+        return dict(LTIConsumer.objects.filter(
+            is_active=True).values_list('key', 'secret'))
+
+
+class JSONFileConsumerBackend(object):
+    """
+    Consumer keys and secrets as a JSON object in LTI_CONSUMERS_FILE,
+    by default consumers.json in the LTI config directory
+    """
+    def consumers(self):
+        path = getattr(settings, 'LTI_CONSUMERS_FILE', os.path.join(
+            get_lti_config_directory(), LTI_CONSUMERS_FILE_NAME))
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+
+class ConsumerRegistry(object):
+    """
+    In-memory index of consumer secrets from the configured backends,
+    refreshed every ttl seconds.  An unknown key triggers at most one
+    early refresh per negative_ttl seconds and is then remembered as
+    unknown for negative_ttl seconds.
+    """
+    max_unknown = 10000
+
+    def __init__(self, backends, ttl, negative_ttl):
+        self._backends = backends
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._index = {}
+        self._unknown = {}
+        self._refreshed = None
+        self._expires = 0
+
+    def get_secret(self, consumer_key):
+        now = time.time()
+        if now >= self._expires:
+            self.refresh(if_expired=True)
+
+        secret = self._index.get(consumer_key)
+        if secret is not None:
+            return secret
+
+        if self._unknown.get(consumer_key, 0) > now:
+            return None
+
+        if self._refreshed is None or (
+                now - self._refreshed >= self._negative_ttl):
+            self.refresh()
+            secret = self._index.get(consumer_key)
+            if secret is not None:
+                return secret
+
+        if len(self._unknown) >= self.max_unknown:
+            self._unknown = {}
+
+        self._unknown[consumer_key] = now + self._negative_ttl
+        return None
+
+    def refresh(self, if_expired=False):
+        with self._lock:
+            # threads that waited on the lock find the index reloaded
+            if if_expired and time.time() < self._expires:
+                return
+
+            index = {}
+            try:
+                # earlier backends take precedence
+                for backend in reversed(self._backends):
+                    index.update(backend.consumers())
+            except Exception as ex:
+                logger.exception(f"LTI consumer refresh failed: {ex}")
+                self._expires = time.time() + self._negative_ttl
+                return
+
+            self._index = index
+            self._unknown = {}
+            self._refreshed = time.time()
+            self._expires = self._refreshed + self._ttl
+
+
+_consumer_registry = None
+_consumer_registry_lock = threading.Lock()
+
+
+def get_consumer_registry():
+    global _consumer_registry
+    if _consumer_registry is None:
+        with _consumer_registry_lock:
+            if _consumer_registry is None:
+                _consumer_registry = ConsumerRegistry(
+                    [import_string(backend)() for backend in getattr(
+                        settings, 'LTI_CONSUMER_BACKENDS',
+                        DEFAULT_CONSUMER_BACKENDS)],
+                    getattr(settings, 'LTI_CONSUMER_REGISTRY_TTL',
+                            DEFAULT_CONSUMER_REGISTRY_TTL),
+                    getattr(settings, 'LTI_CONSUMER_NEGATIVE_TTL',
+                            DEFAULT_CONSUMER_NEGATIVE_TTL))
+
+    return _consumer_registry
+
+
+def reset_consumer_registry():
+    global _consumer_registry
+    with _consumer_registry_lock:
+        _consumer_registry = None
+
+
+@receiver(setting_changed)
+def _consumer_setting_changed(sender, setting, **kwargs):
+    if setting.startswith('LTI_CONSUMER'):
+        reset_consumer_registry()
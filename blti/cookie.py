@@ -1,7 +1,20 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+from django.conf import settings
+from django.core.signing import BadSignature
 from pylti1p3.contrib.django.cookie import DjangoCookieService
+import http.cookies as Cookie
+
+
+# Add support for the Partitioned attribute (native from Python 3.14)
+if "partitioned" not in Cookie.Morsel._reserved:
+    Cookie.Morsel._reserved["partitioned"] = "Partitioned"
+    Cookie.Morsel._flags.add("partitioned")
+
+COOKIES_ALLOWED_COOKIE_NAME = 'lti1p3-cookies-allowed'
+COOKIES_ALLOWED_SALT = 'blti.cookie.cookies_allowed'
+DEFAULT_COOKIES_ALLOWED_MAX_AGE = 30 * 24 * 3600
 
 
 class BLTICookieService(DjangoCookieService):
@@ -10,3 +23,35 @@ class BLTICookieService(DjangoCookieService):
 
     def set_request_cookie(self, name, value):
         self._request.set_request_cookie(self._get_key(name), value)
+
+
+def _cookies_allowed_max_age():
+    return getattr(settings, 'LTI_COOKIES_ALLOWED_MAX_AGE',
+                   DEFAULT_COOKIES_ALLOWED_MAX_AGE)
+
+
+def cookies_allowed_remembered(request):
+    """
+    True if the browser passed the cookie check in this partition
+    """
+    try:
+        return request.get_signed_cookie(
+            COOKIES_ALLOWED_COOKIE_NAME, salt=COOKIES_ALLOWED_SALT,
+            max_age=_cookies_allowed_max_age()) == '1'
+    except (KeyError, BadSignature):
+        return False
+
+
+def remember_cookies_allowed(request, response):
+    """
+    Sign the browser's passing the cookie check into a partitioned
+    cookie, so later logins in this partition skip the check
+    """
+    response.set_signed_cookie(
+        COOKIES_ALLOWED_COOKIE_NAME, '1', salt=COOKIES_ALLOWED_SALT,
+        max_age=_cookies_allowed_max_age(), path='/', httponly=True,
+        secure=request.is_secure(),
+        samesite='None' if request.is_secure() else 'Lax')
+
+    if request.is_secure():
+        response.cookies[COOKIES_ALLOWED_COOKIE_NAME]['partitioned'] = True
@@ -0,0 +1,99 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from blti.exceptions import BLTIException
+import base64
+import json
+
+
+LTI_ID_TOKEN_REQUEST_ATTR = '_lti_id_token'
+
+
+def urlsafe_b64decode(value):
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+
+class IdToken(object):
+    """
+    An LTI 1.3 id_token split into its header, payload and signature
+    segments and decoded once, along with the registration of its
+    issuer once that has been looked up
+    """
+    def __init__(self, id_token):
+        self.id_token = id_token
+        self._decoded = None
+        self._registration = None
+
+    @property
+    def header(self):
+        return self.decode()[0]
+
+    @property
+    def payload(self):
+        return self.decode()[1]
+
+    @property
+    def signature(self):
+        return self.decode()[2]
+
+    @property
+    def iss(self):
+        return self.payload.get('iss')
+
+    @property
+    def client_id(self):
+        aud = self.payload.get('aud')
+        return aud[0] if isinstance(aud, list) else aud
+
+    def decode(self):
+        if self._decoded is None:
+            parts = (self.id_token or '').split('.')
+            if len(parts) != 3:
+                raise BLTIException(
+                    'Invalid id_token, JWT must contain 3 parts')
+
+            try:
+                header = json.loads(urlsafe_b64decode(parts[0]))
+                payload = json.loads(urlsafe_b64decode(parts[1]))
+                signature = urlsafe_b64decode(parts[2])
+            except Exception:
+                raise BLTIException("Invalid JWT format, can't be decoded")
+
+            if not (isinstance(header, dict) and isinstance(payload, dict)):
+                raise BLTIException("Invalid JWT format, can't be decoded")
+
+            self._decoded = (header, payload, signature)
+
+        return self._decoded
+
+    def find_registration(self, tool_conf, **kwargs):
+        """
+        The issuer's registration in tool_conf, looked up as the
+        message launch does and remembered for later callers
+        """
+        if self._registration is None or self._registration[0] is not (
+                tool_conf):
+            kwargs['jwt_body'] = self.payload
+            if tool_conf.check_iss_has_one_client(self.iss):
+                registration = tool_conf.find_registration(
+                    self.iss, **kwargs)
+            else:
+                registration = tool_conf.find_registration_by_params(
+                    self.iss, self.client_id, **kwargs)
+
+            self._registration = (tool_conf, registration)
+
+        return self._registration[1]
+
+
+def get_id_token(request, id_token):
+    """
+    The parsed id_token shared by everything handling the request
+    """
+    parsed = getattr(request, LTI_ID_TOKEN_REQUEST_ATTR, None)
+    if parsed is None or parsed.id_token != id_token:
+        parsed = IdToken(id_token)
+        setattr(request, LTI_ID_TOKEN_REQUEST_ATTR, parsed)
+
+    return parsed
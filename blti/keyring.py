@@ -0,0 +1,177 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.core.exceptions import ImproperlyConfigured
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key)
+from datetime import datetime, timezone
+from jwcrypto.jwk import JWK
+import json
+import os
+
+
+KEY_STATUS_NEXT = 'next'
+KEY_STATUS_CURRENT = 'current'
+KEY_STATUS_RETIRING = 'retiring'
+KEY_STATUS_RETIRED = 'retired'
+KEYRING_KEY_DIRECTORY = 'keys'
+KEY_STATUSES = (KEY_STATUS_NEXT, KEY_STATUS_CURRENT, KEY_STATUS_RETIRING,
+                KEY_STATUS_RETIRED)
+
+
+class ToolKey(object):
+    """
+    Tool signing key.  Its private key object and public JWK are built
+    from the PEM content once, when first used.
+    """
+    def __init__(self, kid, created, status, private_key, public_key):
+        if status not in KEY_STATUSES:
+            raise ValueError(f"Invalid key status: {status}")
+
+        self.kid = kid
+        self.created = created
+        self.status = status
+        self.private_key = private_key
+        self.public_key = public_key
+        self._signing_key = None
+        self._jwk = None
+
+    @property
+    def signing_key(self):
+        if self._signing_key is None:
+            self._signing_key = load_pem_private_key(
+                self.private_key.encode('utf-8'), password=None)
+
+        return self._signing_key
+
+    @property
+    def jwk(self):
+        if self._jwk is None:
+            jwk = JWK.from_pem(self.public_key.encode('utf-8')).export_public(
+                as_dict=True)
+            jwk.update({'kid': self.kid, 'alg': 'RS256', 'use': 'sig'})
+            self._jwk = jwk
+
+        return self._jwk
+
+    @classmethod
+    def generate(cls, private_key, public_key, status=KEY_STATUS_CURRENT):
+        return cls(JWK.from_pem(public_key.encode('utf-8')).thumbprint(),
+                   datetime.now(timezone.utc), status, private_key,
+                   public_key)
+
+
+class Keyring(object):
+    """
+    The tool's signing keys.  The newest current key signs, and every
+    key yet to be retired is published in the tool JWKS, so platforms
+    can fetch a next key before it signs and verify a retiring key's
+    messages until it is retired.
+    """
+    def __init__(self, keys):
+        self.keys = sorted(keys, key=lambda key: key.created)
+        self._current = None
+        for key in self.keys:
+            if key.status == KEY_STATUS_CURRENT:
+                self._current = key
+
+    def current(self):
+        return self._current
+
+    def get(self, kid):
+        for key in self.keys:
+            if key.kid == kid:
+                return key
+
+    def published(self):
+        return [key for key in self.keys if key.status != KEY_STATUS_RETIRED]
+
+    def jwks(self):
+        return [key.jwk for key in self.published()]
+
+    def rotate(self, new_key=None):
+        """
+        Retire retiring keys, demote the current key to retiring and
+        promote new_key, or else the newest next key, to current.  A
+        new_key with status next is staged without rotating.
+        """
+        if new_key is not None and new_key.status == KEY_STATUS_NEXT:
+            return Keyring(self.keys + [new_key])
+
+        if new_key is None:
+            staged = [k for k in self.keys if k.status == KEY_STATUS_NEXT]
+            if not staged:
+                raise ValueError('No next key to promote')
+
+            new_key = staged[-1]
+
+        status = {KEY_STATUS_CURRENT: KEY_STATUS_RETIRING,
+                  KEY_STATUS_RETIRING: KEY_STATUS_RETIRED}
+        keys = [ToolKey(k.kid, k.created, status.get(k.status, k.status),
+                        k.private_key, k.public_key) for k in self.keys if (
+                            k.kid != new_key.kid)]
+        return Keyring(keys + [ToolKey(
+            new_key.kid, new_key.created, KEY_STATUS_CURRENT,
+            new_key.private_key, new_key.public_key)])
+
+
+def read_keyring(path):
+    """
+    The keyring described by the manifest at path, along with the
+    key files it references relative to the manifest
+    """
+    key_dir = os.path.dirname(path)
+    keys = []
+    files = []
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        for entry in manifest['keys']:
+            key = {}
+            for name in ['private_key', 'public_key']:
+                key_file = os.path.join(key_dir, entry[f"{name}_file"])
+                files.append(key_file)
+                with open(key_file, encoding='utf-8') as f:
+                    key[name] = f.read()
+
+            keys.append(ToolKey(
+                entry['kid'], datetime.fromisoformat(entry['created']),
+                entry['status'], **key))
+    except (OSError, ValueError, KeyError, TypeError) as ex:
+        raise ImproperlyConfigured(f"Invalid LTI keyring {path}: {ex}")
+
+    return Keyring(keys), files
+
+
+def write_keyring(path, keyring):
+    """
+    Write the keyring manifest and any key files not yet written,
+    replacing the manifest last so readers never see a partial keyring
+    """
+    key_dir = os.path.dirname(path)
+    os.makedirs(os.path.join(key_dir, KEYRING_KEY_DIRECTORY), exist_ok=True)
+
+    entries = []
+    for key in keyring.keys:
+        entry = {'kid': key.kid, 'created': key.created.isoformat(),
+                 'status': key.status}
+        for name, ext, mode in [('private_key', 'key', 0o600),
+                                ('public_key', 'pub', 0o644)]:
+            key_file = os.path.join(KEYRING_KEY_DIRECTORY, f"{key.kid}.{ext}")
+            key_path = os.path.join(key_dir, key_file)
+            if not os.path.exists(key_path):
+                fd = os.open(key_path, os.O_WRONLY | os.O_CREAT, mode)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(getattr(key, name))
+
+            entry[f"{name}_file"] = key_file
+
+        entries.append(entry)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'keys': entries}, f, indent=2)
+
+    os.replace(tmp_path, path)
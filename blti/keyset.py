@@ -0,0 +1,278 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from django.core.cache import caches
+from pylti1p3.exception import LtiException
+from blti.metrics import increment_counter
+from concurrent.futures import Future
+from collections import OrderedDict
+from functools import lru_cache
+import threading
+import requests
+import logging
+import hashlib
+import json
+import jwt
+import time
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY_SET_MAX_AGE = 3600
+DEFAULT_KEY_SET_MIN_AGE = 60
+DEFAULT_KEY_SET_STALE_AGE = 3600
+DEFAULT_KEY_SET_TIMEOUT = 5
+DEFAULT_PUBLIC_KEY_CACHE_SIZE = 256
+
+
+class KeySet(object):
+    """
+    A platform JWKS indexed by kid, with the times it is fresh until
+    and may be served stale until
+    """
+    def __init__(self, url, jwks, fresh_until, stale_until):
+        self.url = url
+        self.jwks = jwks
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.keys = {}
+        for key in jwks.get('keys', []):
+            self.keys.setdefault(key.get('kid'), []).append(key)
+
+    def cached(self):
+        return {'url': self.url, 'jwks': self.jwks,
+                'fresh_until': self.fresh_until,
+                'stale_until': self.stale_until}
+
+
+def cache_control_lifetimes(header):
+    """
+    Fresh and stale-while-revalidate lifetimes from a Cache-Control
+    header, falling back to the configured defaults
+    """
+    directives = {}
+    for directive in (header or '').split(','):
+        name, _, value = directive.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+
+    def seconds(name, default):
+        try:
+            return max(0, int(directives[name]))
+        except (KeyError, ValueError):
+            return default
+
+    if 'no-store' in directives or 'no-cache' in directives:
+        max_age = 0
+    else:
+        max_age = seconds('max-age', getattr(
+            settings, 'LTI_KEY_SET_MAX_AGE', DEFAULT_KEY_SET_MAX_AGE))
+
+    # a floor keeps platforms that forbid caching from costing
+    # a fetch for every launch
+    max_age = max(max_age, getattr(
+        settings, 'LTI_KEY_SET_MIN_AGE', DEFAULT_KEY_SET_MIN_AGE))
+    stale_age = seconds('stale-while-revalidate', getattr(
+        settings, 'LTI_KEY_SET_STALE_AGE', DEFAULT_KEY_SET_STALE_AGE))
+
+    return max_age, stale_age
+
+
+class PlatformKeySetStore(object):
+    """
+    Platform key sets kept in process and shared through the Django
+    cache named by LTI_KEY_SET_CACHE.  A key set past its freshness is
+    served while refreshed in the background, an unknown kid prompts one
+    refetch per LTI_KEY_SET_MIN_AGE, and only one fetch per issuer is
+    in flight at a time.
+    """
+    key_prefix = 'blti-keyset'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key_sets = {}
+        self._flights = {}
+        self._refetched = {}
+        self._session = requests.Session()
+
+    def get_keys(self, iss, key_set_url, kid):
+        """
+        Return the keys with the given kid in the issuer's key set
+        """
+        now = time.time()
+        key_set = self._key_sets.get(iss)
+        if key_set is None or key_set.url != key_set_url or (
+                now >= key_set.stale_until):
+            key_set = self._fetch(iss, key_set_url)
+        elif now >= key_set.fresh_until:
+            increment_counter('keyset.stale')
+            self._refresh(iss, key_set_url)
+
+        keys = key_set.keys.get(kid)
+        if keys is None and self._may_refetch(iss, now):
+            increment_counter('keyset.unknown_kid')
+            key_set = self._fetch(iss, key_set_url, shared=False)
+            keys = key_set.keys.get(kid)
+
+        return keys or []
+
+    def _may_refetch(self, iss, now):
+        with self._lock:
+            if now - self._refetched.get(iss, 0) < getattr(
+                    settings, 'LTI_KEY_SET_MIN_AGE', DEFAULT_KEY_SET_MIN_AGE):
+                return False
+
+            self._refetched[iss] = now
+            return True
+
+    def _refresh(self, iss, key_set_url):
+        flight, leader = self._join_flight(iss)
+        if leader:
+            threading.Thread(target=self._background_fetch,
+                             args=(iss, key_set_url, flight),
+                             daemon=True).start()
+
+    def _background_fetch(self, iss, key_set_url, flight):
+        self._lead_flight(flight, iss, key_set_url, True)
+        try:
+            flight.result()
+        except LtiException as ex:
+            logger.warning(f"Key set refresh failed: {ex}")
+
+    def _fetch(self, iss, key_set_url, shared=True):
+        # callers arriving while a fetch is in flight wait on its result
+        flight, leader = self._join_flight(iss)
+        if leader:
+            self._lead_flight(flight, iss, key_set_url, shared)
+
+        return flight.result()
+
+    def _join_flight(self, iss):
+        """
+        The issuer's fetch in flight, and whether the caller begins it
+        """
+        with self._lock:
+            flight = self._flights.get(iss)
+            if flight is not None:
+                return flight, False
+
+            flight = self._flights[iss] = Future()
+            return flight, True
+
+    def _lead_flight(self, flight, iss, key_set_url, shared):
+        try:
+            flight.set_result(self._load(iss, key_set_url, shared))
+        except Exception as ex:
+            flight.set_exception(ex)
+        finally:
+            with self._lock:
+                del self._flights[iss]
+
+    def _load(self, iss, key_set_url, shared):
+        cache = caches[getattr(settings, 'LTI_KEY_SET_CACHE', 'default')]
+        cache_key = '{}:{}'.format(self.key_prefix, hashlib.sha256(
+            key_set_url.encode('utf-8')).hexdigest())
+
+        if shared:
+            cached = cache.get(cache_key)
+            if cached and time.time() < cached['fresh_until']:
+                key_set = KeySet(**cached)
+                self._key_sets[iss] = key_set
+                return key_set
+
+        try:
+            key_set = self._request(key_set_url)
+        except LtiException as ex:
+            # rather than fail launches, keep the previous key set
+            previous = self._key_sets.get(iss)
+            if previous is None or previous.url != key_set_url:
+                raise
+
+            # and back off, retrying once the minimum age has passed
+            logger.warning(f"Serving previous key set: {ex}")
+            retry_age = getattr(
+                settings, 'LTI_KEY_SET_MIN_AGE', DEFAULT_KEY_SET_MIN_AGE)
+            fresh_until = time.time() + retry_age
+            key_set = KeySet(
+                key_set_url, previous.jwks, fresh_until,
+                max(previous.stale_until, fresh_until + retry_age))
+            self._key_sets[iss] = key_set
+            return key_set
+
+        self._key_sets[iss] = key_set
+        cache.set(cache_key, key_set.cached(),
+                  max(1, int(key_set.stale_until - time.time())))
+        return key_set
+
+    def _request(self, key_set_url):
+        increment_counter('keyset.fetch')
+        try:
+            response = self._session.get(key_set_url, timeout=getattr(
+                settings, 'LTI_KEY_SET_TIMEOUT', DEFAULT_KEY_SET_TIMEOUT))
+            response.raise_for_status()
+            jwks = response.json()
+        except (requests.exceptions.RequestException, ValueError) as ex:
+            increment_counter('keyset.fetch_error')
+            raise LtiException(f"Error fetching key set {key_set_url}: {ex}")
+
+        if not isinstance(jwks, dict) or not isinstance(
+                jwks.get('keys'), list):
+            raise LtiException(f"Invalid key set from {key_set_url}")
+
+        max_age, stale_age = cache_control_lifetimes(
+            response.headers.get('Cache-Control'))
+        now = time.time()
+        return KeySet(key_set_url, jwks, now + max_age,
+                      now + max_age + stale_age)
+
+
+@lru_cache(maxsize=1)
+def get_key_set_store():
+    return PlatformKeySetStore()
+
+
+class PublicKeyCache(object):
+    """
+    Public key objects ready for signature verification, keyed by
+    issuer, kid and a fingerprint of the JWK they were built from, and
+    bounded to LTI_PUBLIC_KEY_CACHE_SIZE least recently used entries
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()
+
+    def get_key(self, iss, jwk, alg):
+        fingerprint = hashlib.sha256(json.dumps(
+            jwk, sort_keys=True).encode('utf-8')).hexdigest()
+        cache_key = (iss, jwk.get('kid'), fingerprint, alg)
+
+        with self._lock:
+            key = self._keys.get(cache_key)
+            if key is not None:
+                self._keys.move_to_end(cache_key)
+
+        if key is not None:
+            increment_counter('public_key.hit')
+            return key
+
+        increment_counter('public_key.miss')
+        try:
+            key = jwt.PyJWK(jwk, algorithm=alg).key
+        except (jwt.PyJWKError, jwt.InvalidKeyError, ValueError,
+                TypeError) as ex:
+            raise LtiException(f"Can't convert JWT key: {ex}")
+
+        max_size = getattr(settings, 'LTI_PUBLIC_KEY_CACHE_SIZE',
+                           DEFAULT_PUBLIC_KEY_CACHE_SIZE)
+        with self._lock:
+            self._keys[cache_key] = key
+            while len(self._keys) > max_size:
+                self._keys.popitem(last=False)
+
+        return key
+
+
+@lru_cache(maxsize=1)
+def get_public_key_cache():
+    return PublicKeyCache()
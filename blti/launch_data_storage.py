@@ -0,0 +1,79 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from django.core.signing import TimestampSigner, BadSignature
+from django.utils.crypto import constant_time_compare
+from pylti1p3.launch_data_storage.base import LaunchDataStorage
+from blti.nonce import get_nonce_store
+from uuid import uuid4
+import time
+
+
+DEFAULT_STATE_MAX_AGE = 300
+STATE_PREFIX = 'state-'
+NONCE_KEY_PREFIX = 'lti1p3-nonce-'
+
+
+class SignedStateLaunchDataStorage(LaunchDataStorage):
+    """
+    Launch data storage keeping nothing server side.  The OIDC state is
+    a signed, expiring token carrying the nonce, so a launch is checked
+    against the state it returns, and each nonce is accepted once by the
+    LTI_NONCE_STORE replay filter.  Launch data is not saved for later
+    retrieval by launch id.
+    """
+    salt = 'blti.launch_data_storage'
+
+    def __init__(self, *args, **kwargs):
+        self._signer = TimestampSigner(salt=self.salt, sep='.')
+
+    def get_session_cookie_name(self):
+        # the state cookie alone identifies the browser
+        return None
+
+    def max_age(self):
+        return getattr(
+            settings, 'LTI_OIDC_STATE_MAX_AGE', DEFAULT_STATE_MAX_AGE)
+
+    def create_state(self):
+        """
+        A new (state, nonce) pair for an OIDC login
+        """
+        nonce = uuid4().hex
+        return f"{STATE_PREFIX}{self._signer.sign(nonce)}", nonce
+
+    def state_nonce(self, state):
+        """
+        The nonce carried by an unexpired state token, else None
+        """
+        if not state or not state.startswith(STATE_PREFIX):
+            return None
+
+        try:
+            return self._signer.unsign(
+                state[len(STATE_PREFIX):], max_age=self.max_age())
+        except BadSignature:
+            return None
+
+    def can_set_keys_expiration(self):
+        return True
+
+    def get_value(self, key):
+        return None
+
+    def set_value(self, key, value, exp=None):
+        pass
+
+    def check_value(self, key):
+        if not key.startswith(NONCE_KEY_PREFIX) or self._request is None:
+            return False
+
+        nonce = key[len(NONCE_KEY_PREFIX):]
+        state_nonce = self.state_nonce(self._request.get_param('state'))
+        if not state_nonce or not constant_time_compare(nonce, state_nonce):
+            return False
+
+        return get_nonce_store().check_and_add(
+            f"oidc-{nonce}", time.time() + self.max_age())
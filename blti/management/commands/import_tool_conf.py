@@ -0,0 +1,85 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from blti.config import get_lti_config_path
+from blti.models import LTIKeyPair, LTIRegistration, LTIDeployment
+from jwcrypto.jwk import JWK
+import json
+import os
+
+
+class Command(BaseCommand):
+    help = 'Import LTI 1.3 registrations from a tool.json file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('tool_conf_file', type=str, nargs='?')
+
+    def read_key(self, config_dir, key_file):
+        with open(os.path.join(config_dir, key_file)) as f:
+            return f.read()
+
+    def key_pair(self, private_key, public_key):
+        jwk = JWK.from_pem(private_key.encode('utf-8'))
+        if not public_key:
+            public_key = jwk.export_to_pem().decode('utf-8')
+
+        key_pair, _ = LTIKeyPair.objects.get_or_create(
+            kid=jwk.thumbprint(), defaults={
+                'private_key': private_key, 'public_key': public_key})
+        return key_pair
+
+    def import_registration(self, config_dir, iss, conf):
+        try:
+            private_key = self.read_key(config_dir, conf['private_key_file'])
+            public_key = self.read_key(
+                config_dir, conf['public_key_file']) if (
+                    conf.get('public_key_file')) else None
+        except OSError as ex:
+            raise CommandError(f"Cannot read keys for {iss}: {ex}")
+
+        registration, _ = LTIRegistration.objects.update_or_create(
+            issuer=iss, client_id=conf['client_id'], defaults={
+                'is_default': conf.get('default', False),
+                'auth_login_url': conf['auth_login_url'],
+                'auth_token_url': conf['auth_token_url'],
+                'auth_audience': conf.get('auth_audience') or '',
+                'key_set_url': conf.get('key_set_url') or '',
+                'key_set': conf.get('key_set'),
+                'key_pair': self.key_pair(private_key, public_key),
+                'is_active': True})
+
+        for deployment_id in conf['deployment_ids']:
+            LTIDeployment.objects.update_or_create(
+                registration=registration, deployment_id=deployment_id,
+                defaults={'is_active': True})
+
+        return len(conf['deployment_ids'])
+
+    def handle(self, *args, **options):
+        path = options['tool_conf_file'] or get_lti_config_path()
+        config_dir = os.path.dirname(path)
+        try:
+            with open(path) as f:
+                tool_conf = json.load(f)
+        except (OSError, ValueError) as ex:
+            raise CommandError(f"Cannot read {path}: {ex}")
+
+        registrations = deployments = 0
+        with transaction.atomic():
+            for iss, iss_conf in tool_conf.items():
+                # a single conf item is the issuer's default
+                confs = iss_conf if isinstance(iss_conf, list) else [
+                    dict(iss_conf, default=True)]
+                for conf in confs:
+                    try:
+                        deployments += self.import_registration(
+                            config_dir, iss, conf)
+                    except KeyError as ex:
+                        raise CommandError(f"Missing {ex} in {iss} config")
+
+                    registrations += 1
+
+        self.stdout.write(f"Imported {registrations} registrations and "
+                          f"{deployments} deployments from {path}")
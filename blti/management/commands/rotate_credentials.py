@@ -0,0 +1,71 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.core.management.base import BaseCommand, CommandError
+from blti.config import KeyringFile
+from blti.keyring import (
+    Keyring, ToolKey, KEY_STATUS_NEXT, KEY_STATUS_CURRENT, KEY_STATUS_RETIRED,
+    KEYRING_KEY_DIRECTORY, read_keyring, write_keyring)
+from blti.management.commands.generate_credentials import (
+    Command as GenerateCredentials)
+import os
+
+
+class Command(BaseCommand):
+    help = ('Rotate the tool keyring: the current key retires after one '
+            'more rotation and a new key signs')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keyring-file', type=str,
+            help='keyring manifest, by default LTI_KEYRING_FILE')
+        parser.add_argument(
+            '--stage', action='store_true',
+            help='publish a new key without signing with it yet')
+        parser.add_argument(
+            '--promote', action='store_true',
+            help='sign with the newest staged key')
+        parser.add_argument(
+            '--purge', action='store_true',
+            help='remove retired keys and their files')
+
+    def new_key(self, status):
+        private_key, public_key = GenerateCredentials().create_keys()
+        return ToolKey.generate(private_key.decode('utf-8'),
+                                public_key.decode('utf-8'), status=status)
+
+    def handle(self, *args, **options):
+        path = options['keyring_file'] or KeyringFile().path()
+        keyring = read_keyring(path)[0] if os.path.isfile(path) else (
+            Keyring([]))
+
+        try:
+            if options['purge']:
+                retired = [k for k in keyring.keys if (
+                    k.status == KEY_STATUS_RETIRED)]
+                keyring = Keyring([k for k in keyring.keys if (
+                    k.status != KEY_STATUS_RETIRED)])
+            elif options['promote']:
+                keyring = keyring.rotate()
+            else:
+                keyring = keyring.rotate(self.new_key(
+                    KEY_STATUS_NEXT if options['stage'] else (
+                        KEY_STATUS_CURRENT)))
+        except ValueError as ex:
+            raise CommandError(ex)
+
+        write_keyring(path, keyring)
+
+        if options['purge']:
+            key_dir = os.path.join(
+                os.path.dirname(path), KEYRING_KEY_DIRECTORY)
+            for key in retired:
+                for ext in ['key', 'pub']:
+                    try:
+                        os.remove(os.path.join(key_dir, f"{key.kid}.{ext}"))
+                    except FileNotFoundError:
+                        pass
+
+        for key in keyring.keys:
+            self.stdout.write(f"{key.kid} {key.status} "
+                              f"{key.created.isoformat()}")
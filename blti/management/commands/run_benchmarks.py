@@ -0,0 +1,30 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.core.management.base import BaseCommand, CommandError
+from importlib import import_module
+
+
+class Command(BaseCommand):
+    help = 'Run blti microbenchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('benchmarks', type=str, nargs='+')
+        parser.add_argument('--iterations', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        for name in options['benchmarks']:
+            try:
+                benchmark = import_module(f"blti.benchmarks.{name}")
+            except ImportError:
+                raise CommandError(f"Unknown benchmark: {name}")
+
+            self.stdout.write(f"{name} ({iterations} iterations)")
+            for result in benchmark.run(iterations):
+                if len(result) == 3:
+                    self.stdout.write("  {}: {:.1f}{}".format(*result))
+                else:
+                    label, seconds = result
+                    self.stdout.write("  {}: {:.3f}s, {:.2f}us/op".format(
+                        label, seconds, seconds * 1000000 / iterations))
@@ -0,0 +1,83 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from pylti1p3.contrib.django import DjangoMessageLaunch
+from pylti1p3.exception import LtiException
+from pylti1p3.tool_config.abstract import ToolConfAbstract
+from pylti1p3.actions import Action
+from blti.exceptions import BLTIException
+from blti.id_token import IdToken
+from blti.keyset import get_key_set_store, get_public_key_cache
+
+
+class BLTIMessageLaunch(DjangoMessageLaunch):
+    """
+    DjangoMessageLaunch taking platform keys from the shared key set
+    store rather than fetching key_set_url for every launch, and
+    verifying with cached public key objects.  The id_token and its
+    registration are shared with the launch view through set_id_token().
+    """
+    _id_token = None
+
+    def set_id_token(self, id_token):
+        self._id_token = id_token
+        return self
+
+    def get_id_token(self):
+        id_token = self._get_id_token()
+        if self._id_token is None or self._id_token.id_token != id_token:
+            self._id_token = IdToken(id_token)
+
+        return self._id_token
+
+    def validate_jwt_format(self):
+        id_token = self.get_id_token()
+        try:
+            self._jwt['header'] = id_token.header
+            self._jwt['body'] = id_token.payload
+        except BLTIException as ex:
+            raise LtiException(str(ex))
+
+        return self
+
+    def validate_registration(self):
+        config: ToolConfAbstract = self._tool_config
+        self._registration = self.get_id_token().find_registration(
+            config, action=Action.MESSAGE_LAUNCH, request=self._request)
+
+        if not self._registration:
+            raise LtiException('Registration not found.')
+
+        if self.get_client_id() != self._registration.get_client_id():
+            raise LtiException('Client id not registered for this issuer')
+
+        return self
+
+    def get_public_key(self):
+        header = self._jwt.get('header', {})
+        kid = header.get('kid')
+        alg = header.get('alg')
+        if not kid:
+            raise LtiException('JWT KID not found')
+        if not alg:
+            raise LtiException('JWT ALG not found')
+
+        iss = self.get_iss()
+        key_set = self._registration.get_key_set()
+        if key_set:
+            keys = [k for k in key_set.get('keys', []) if (
+                k.get('kid') == kid)]
+        else:
+            key_set_url = self._registration.get_key_set_url()
+            if not (key_set_url and key_set_url.startswith((
+                    'http://', 'https://'))):
+                raise LtiException(f"Invalid URL: {key_set_url}")
+
+            keys = get_key_set_store().get_keys(iss, key_set_url, kid)
+
+        for key in keys:
+            if key.get('alg', 'RS256') == alg:
+                return get_public_key_cache().get_key(iss, key, alg), alg
+
+        raise LtiException('Unable to find public key')
@@ -0,0 +1,118 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+"""
+In-process counters for request hot paths
+"""
+
+import threading
+from collections import Counter
+
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def increment_counter(name, count=1):
+    with _counters_lock:
+        _counters[name] += count
+
+
+def get_counters(prefix=''):
+    with _counters_lock:
+        return {k: v for k, v in _counters.items() if k.startswith(prefix)}
+
+
+def reset_counters(prefix=''):
+    with _counters_lock:
+        for name in [k for k in _counters if k.startswith(prefix)]:
+            del _counters[name]
+
+
+# upper bounds, in milliseconds, of client timing histogram buckets
+HISTOGRAM_BUCKETS = (50, 100, 250, 500, 1000, 1500, 2000, 3000, 5000,
+                     8000, 13000, 21000)
+
+
+class Histogram(object):
+    """
+    Counts of observed values in fixed buckets, the last bucket
+    counting values beyond the largest bound
+    """
+    def __init__(self, bounds=HISTOGRAM_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+
+    def observe(self, value):
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, percent):
+        """
+        Upper bound of the bucket holding the given percentile, or
+        infinity if it lies beyond the largest bound
+        """
+        rank = self.count * percent / 100
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return float('inf')
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'buckets': dict(zip(
+                [str(b) for b in self.bounds] + ['+Inf'], self.counts))
+        }
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def observe(name, value):
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+
+        histogram.observe(value)
+
+
+def get_histograms(prefix=''):
+    with _histograms_lock:
+        return {k: h.as_dict() for k, h in _histograms.items() if (
+            k.startswith(prefix))}
+
+
+def get_percentile(name, percent, min_count=1):
+    """
+    The histogram's percentile, or None with fewer than min_count
+    observations
+    """
+    with _histograms_lock:
+        histogram = _histograms.get(name)
+        if histogram is None or histogram.count < min_count:
+            return None
+
+        return histogram.percentile(percent)
+
+
+def reset_histograms(prefix=''):
+    with _histograms_lock:
+        for name in [k for k in _histograms if k.startswith(prefix)]:
+            del _histograms[name]
@@ -11,10 +11,14 @@ against request forgeries from other sites.
 
 from django.conf import settings
 from django.contrib.auth import authenticate, login
-from blti import BLTI
+from blti import BLTI, LTI_DATA_GENERATION_KEY
 from blti.exceptions import BLTIException
 
 
+LTI_AUTH_GENERATION_KEY = 'lti_auth_generation'
+LTI_AUTH_REQUEST_ATTR = '_lti_authentication'
+
+
 class CSRFHeaderMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -46,18 +50,34 @@ class LTISessionAuthenticationMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
+        # launch views log the launch user in as launch data is stored
+        setattr(request, LTI_AUTH_REQUEST_ATTR, self)
+        self.authenticate(request)
+        return self.get_response(request)
+
+    def authenticate(self, request):
         try:
             lti_launch_parameters = BLTI().get_session(request)
             lti_user = lti_launch_parameters.get(
                 "https://purl.imsglobal.org/spec/lti/claim/custom", {}).get(
                     "canvas_user_login_id")
-            if lti_user:
+            if lti_user and not self._authenticated(request, lti_user):
                 user = authenticate(request, remote_user=lti_user)
-                login(request, user)
+                if user:
+                    login(request, user)
+                    request.session[LTI_AUTH_GENERATION_KEY] = (
+                        request.session.get(LTI_DATA_GENERATION_KEY))
         except BLTIException:
             pass
 
-        return self.get_response(request)
+    def _authenticated(self, request, lti_user):
+        # already logged in as the launch user for this launch
+        user = getattr(request, 'user', None)
+        return bool(
+            user and user.is_authenticated and
+            user.get_username() == lti_user and
+            request.session.get(LTI_AUTH_GENERATION_KEY) == (
+                request.session.get(LTI_DATA_GENERATION_KEY)))
 
 
 class SameSiteMiddleware:
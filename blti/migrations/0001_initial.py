@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LTIConsumer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=30, unique=True)),
+                ('secret', models.CharField(max_length=255)),
+                ('description', models.CharField(blank=True, default='', max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('added_date', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blti', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LTIKeyPair',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kid', models.CharField(max_length=255, unique=True)),
+                ('private_key', models.TextField()),
+                ('public_key', models.TextField()),
+                ('added_date', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LTIRegistration',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('issuer', models.CharField(max_length=255)),
+                ('client_id', models.CharField(max_length=255)),
+                ('is_default', models.BooleanField(default=False)),
+                ('auth_login_url', models.CharField(max_length=255)),
+                ('auth_token_url', models.CharField(max_length=255)),
+                ('auth_audience', models.CharField(blank=True, default='', max_length=255)),
+                ('key_set_url', models.CharField(blank=True, default='', max_length=255)),
+                ('key_set', models.JSONField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('added_date', models.DateTimeField(auto_now_add=True)),
+                ('key_pair', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='blti.ltikeypair')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LTIDeployment',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('deployment_id', models.CharField(max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('added_date', models.DateTimeField(auto_now_add=True)),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deployments', to='blti.ltiregistration')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='ltiregistration',
+            constraint=models.UniqueConstraint(fields=('issuer', 'client_id'), name='blti_registration_client_id'),
+        ),
+        migrations.AddConstraint(
+            model_name='ltideployment',
+            constraint=models.UniqueConstraint(fields=('registration', 'deployment_id'), name='blti_deployment_id'),
+        ),
+    ]
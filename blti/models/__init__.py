@@ -1,4 +1,6 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
-from .canvas import CanvasData
+from .canvas import CanvasData, CompactCanvasData
+from .consumer import LTIConsumer
+from .registration import LTIKeyPair, LTIRegistration, LTIDeployment
@@ -5,10 +5,13 @@ from django.db import models
 from pylti1p3.roles import (
     AbstractRole, StaffRole, TeachingAssistantRole,
     DesignerRole, ObserverRole, TransientRole)
+from functools import cached_property, lru_cache
+from types import MappingProxyType
 import re
 
 
 LTI_DATA_CLAIM_BASE = 'https://purl.imsglobal.org/spec/lti/claim/'
+LTI_1P3_ROLES_CLAIM = f"{LTI_DATA_CLAIM_BASE}roles"
 
 
 # System Admin role is across all contexts (courses)
@@ -28,81 +31,145 @@ class StudentRole(AbstractRole):
     _context_roles = ("Learner")
 
 
-class LTILaunchData(object):
-    def __init__(self, **data):
-        self._data = data
-        self.platform_name = self._data.get(
+RE_ROLE_NS = re.compile(r'^urn:lti:(?:inst|sys)?role:ims/lis/([A-Za-z]+)$')
+AGGREGATE_ROLES = {
+    'member': ['Administrator', 'Instructor', 'TeachingAssistant',
+               'ContentDeveloper', 'Learner', 'Observer'],
+    'admin': ['Administrator', 'Instructor', 'TeachingAssistant',
+              'ContentDeveloper'],
+}
+
+# role flags as bits of a per-launch role mask
+ROLE_MEMBER = 1 << 0
+ROLE_ADMINISTRATOR = 1 << 1
+ROLE_CANVAS_ADMINISTRATOR = 1 << 2
+ROLE_STAFF = 1 << 3
+ROLE_INSTRUCTOR = 1 << 4
+ROLE_TEACHING_ASSISTANT = 1 << 5
+ROLE_STUDENT = 1 << 6
+ROLE_DESIGNER = 1 << 7
+
+# role checks only consult class-level role tables, so a single
+# instance of each serves every launch
+ROLE_PARSER = AbstractRole({})
+
+# role bit, 1.1 role names and 1.3 role checks that grant it
+ROLE_DEFINITIONS = (
+    (ROLE_MEMBER, AGGREGATE_ROLES['member'], (
+        StaffRole({}), TeacherRole({}), TeachingAssistantRole({}),
+        StudentRole({}), ObserverRole({}))),
+    (ROLE_ADMINISTRATOR, AGGREGATE_ROLES['admin'], (
+        SystemAdministratorRole({}), TeacherRole({}),
+        TeachingAssistantRole({}), DesignerRole({}))),
+    (ROLE_CANVAS_ADMINISTRATOR, ['Administrator'], (
+        SystemAdministratorRole({}),)),
+    (ROLE_STAFF, ['Administrator', 'Instructor'], (StaffRole({}),)),
+    (ROLE_INSTRUCTOR, ['Instructor'], (TeacherRole({}),)),
+    (ROLE_TEACHING_ASSISTANT, ['TeachingAssistant'], (
+        TeachingAssistantRole({}),)),
+    (ROLE_STUDENT, ['Learner'], (StudentRole({}),)),
+    (ROLE_DESIGNER, ['ContentDeveloper'], (DesignerRole({}),)),
+)
+
+ROLE_MASK_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=ROLE_MASK_CACHE_SIZE)
+def _1p1_role_mask(role_name):
+    mask = 0
+    for role_bit, role_names, role_checks in ROLE_DEFINITIONS:
+        if role_name in role_names:
+            mask |= role_bit
+
+    return mask
+
+
+@lru_cache(maxsize=ROLE_MASK_CACHE_SIZE)
+def _1p3_role_mask(role_name, role_type):
+    mask = 0
+    for role_bit, role_names, role_checks in ROLE_DEFINITIONS:
+        for role_check in role_checks:
+            if role_check._check_access(role_name, role_type):
+                mask |= role_bit
+                break
+
+    return mask
+
+
+def _1p1_role_names(data):
+    # 1.1 roles string as plain and namespaced role names
+    try:
+        roles = data['roles'].split(',')
+    except KeyError:
+        return
+
+    for role in roles:
+        yield role
+        m = RE_ROLE_NS.match(role)
+        if m and m.group(1):
+            yield m.group(1)
+
+
+def _1p3_role_names(data):
+    # 1.3 roles claim as (role name, role type)
+    for role in data.get(LTI_1P3_ROLES_CLAIM, []):
+        yield ROLE_PARSER.parse_role_str(role)
+
+
+class LaunchClaims(object):
+    """
+    Claim accessors and role flags shared by the launch data models,
+    which provide _data and role_mask
+    """
+    __slots__ = ()
+
+    @property
+    def is_member(self):
+        return bool(self.role_mask & ROLE_MEMBER)
+
+    @property
+    def is_administrator(self):
+        return bool(self.role_mask & ROLE_ADMINISTRATOR)
+
+    @property
+    def is_canvas_administrator(self):
+        return bool(self.role_mask & ROLE_CANVAS_ADMINISTRATOR)
+
+    @property
+    def is_staff(self):
+        return bool(self.role_mask & ROLE_STAFF)
+
+    @property
+    def is_instructor(self):
+        return bool(self.role_mask & ROLE_INSTRUCTOR)
+
+    @property
+    def is_teaching_assistant(self):
+        return bool(self.role_mask & ROLE_TEACHING_ASSISTANT)
+
+    @property
+    def is_student(self):
+        return bool(self.role_mask & ROLE_STUDENT)
+
+    @property
+    def is_designer(self):
+        return bool(self.role_mask & ROLE_DESIGNER)
+
+    def _launch_role_mask(self):
+        mask = 0
+        for role_name in set(_1p1_role_names(self._data)):
+            mask |= _1p1_role_mask(role_name)
+
+        for role_name, role_type in set(_1p3_role_names(self._data)):
+            mask |= _1p3_role_mask(role_name, role_type)
+
+        return mask
+
+    def _platform_name(self):
+        return self._data.get(
             'tool_consumer_info_product_family_code',
             self.claim_tool_platform('product_family_code'))
 
-        self.is_member = self._1p1_roles(
-            ['member']) or (
-                StaffRole(self._data).check() or
-                TeacherRole(self._data).check() or
-                TeachingAssistantRole(self._data).check() or
-                StudentRole(self._data).check() or
-                ObserverRole(self._data).check())
-
-        self.is_administrator = self._1p1_roles(
-            ['admin']) or (
-                SystemAdministratorRole(self._data).check() or
-                TeacherRole(self._data).check() or
-                TeachingAssistantRole(self._data).check() or
-                DesignerRole(self._data).check())
-
-        self.is_canvas_administrator = self._1p1_roles(
-            ['Administrator']) or (
-                SystemAdministratorRole(self._data).check())
-
-        self.is_staff = self._1p1_roles(
-            ['Administrator', 'Instructor']) or (
-                StaffRole(self._data).check())
-
-        self.is_instructor = self._1p1_roles(
-            ['Instructor']) or (
-                TeacherRole(self._data).check())
-
-        self.is_teaching_assistant = self._1p1_roles(
-            ['TeachingAssistant']) or (
-                TeachingAssistantRole(self._data).check())
-
-        self.is_student = self._1p1_roles(
-            ['Learner']) or (
-                StudentRole(self._data).check())
-
-        self.is_designer = self._1p1_roles(
-            ['ContentDeveloper']) or (
-                DesignerRole(self._data).check())
-
-    def _1p1_roles(self, valid_roles):
-        RE_ROLE_NS = re.compile(
-            r'^urn:lti:(?:inst|sys)?role:ims/lis/([A-Za-z]+)$')
-        AGGREGATE_ROLES = {
-            'member': ['Administrator', 'Instructor', 'TeachingAssistant',
-                       'ContentDeveloper', 'Learner', 'Observer'],
-            'admin': ['Administrator', 'Instructor', 'TeachingAssistant',
-                      'ContentDeveloper'],
-        }
-
-        try:
-            roles = self._data['roles'].split(',')
-        except KeyError:
-            return False
-
-        for valid_role in valid_roles:
-            if valid_role in AGGREGATE_ROLES:
-                return self._1p1_roles(AGGREGATE_ROLES[valid_role])
-
-            for role in roles:
-                if role == valid_role:
-                    return True
-
-                m = RE_ROLE_NS.match(role)
-                if m and m.group(1) and m.group(1) == valid_role:
-                    return True
-
-        return False
-
     def claim_tool_platform(self, key, default=None):
         return self._claim_data('tool_platform', key, default)
 
@@ -135,3 +202,38 @@ class LTILaunchData(object):
         # treat lti 1.3 unset substitution value as null string
         return "" if (
             isinstance(value, str) and value and value[0] == '$') else value
+
+
+class LTILaunchData(LaunchClaims):
+    def __init__(self, **data):
+        self._data = data
+        self.platform_name = self._platform_name()
+
+    @cached_property
+    def role_mask(self):
+        # launch roles reduced to role bits on first access
+        return self._launch_role_mask()
+
+
+class CompactLTILaunchData(LaunchClaims):
+    """
+    Read-only launch data model without an instance dict.  Attributes
+    are derived on access from a single immutable view of the launch
+    claims, which is shared rather than copied when passed as data.
+    """
+    __slots__ = ('_data', '_role_mask')
+
+    def __init__(self, data=None, **kwargs):
+        self._data = MappingProxyType(data if data is not None else kwargs)
+        self._role_mask = None
+
+    @property
+    def platform_name(self):
+        return self._platform_name()
+
+    @property
+    def role_mask(self):
+        if self._role_mask is None:
+            self._role_mask = self._launch_role_mask()
+
+        return self._role_mask
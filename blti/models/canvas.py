@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 
-from .base import LTILaunchData
+from .base import LTILaunchData, CompactLTILaunchData
 
 
 class CanvasData(LTILaunchData):
@@ -46,3 +46,98 @@ class CanvasData(LTILaunchData):
 
         # Canvas hostname
         self.canvas_api_domain = self.claim_custom('canvas_api_domain')
+
+
+class CompactCanvasData(CompactLTILaunchData):
+    """
+    CanvasData attributes computed on access from the launch claims
+    """
+    __slots__ = ()
+
+    def __init__(self, data=None, **kwargs):
+        super(CompactCanvasData, self).__init__(data, **kwargs)
+
+        if self.platform_name != 'canvas':
+            raise ValueError('This is not a Canvas LTI launch')
+
+    # Canvas internal IDs
+    @property
+    def canvas_course_id(self):
+        return self.claim_custom('canvas_course_id')
+
+    @property
+    def canvas_user_id(self):
+        return self.claim_custom('canvas_user_id')
+
+    @property
+    def canvas_account_id(self):
+        return self.claim_custom('canvas_account_id')
+
+    # SIS IDs
+    @property
+    def course_sis_id(self):
+        return self.claim_lis('course_offering_sourcedid')
+
+    @property
+    def user_sis_id(self):
+        return self.claim_lis('person_sourcedid')
+
+    @property
+    def account_sis_id(self):
+        return self.claim_custom('canvas_account_sis_id')
+
+    # Course attributes
+    @property
+    def course_short_name(self):
+        return self.claim_context('label')
+
+    @property
+    def course_long_name(self):
+        return self.claim_context('title')
+
+    # User attributes
+    @property
+    def user_login_id(self):
+        return self.claim_custom('canvas_user_login_id')
+
+    @property
+    def user_full_name(self):
+        return self._data.get(
+            'lis_person_name_full', self._data.get('name'))
+
+    @property
+    def user_first_name(self):
+        return self._data.get(
+            'lis_person_name_given', self._data.get('given_name'))
+
+    @property
+    def user_last_name(self):
+        return self._data.get(
+            'lis_person_name_family', self._data.get('family_name'))
+
+    @property
+    def user_email(self):
+        return self._data.get(
+            'lis_person_contact_email_primary', self._data.get('email'))
+
+    @property
+    def user_avatar_url(self):
+        return self._data.get('user_image', self._data.get('picture'))
+
+    @property
+    def user_roles(self):
+        return self.claim_custom('canvas_membership_roles')
+
+    # LTI app attributes
+    @property
+    def link_title(self):
+        return self.claim_resource_link('title')
+
+    @property
+    def return_url(self):
+        return self.claim_launch_presentation('return_url')
+
+    # Canvas hostname
+    @property
+    def canvas_api_domain(self):
+        return self.claim_custom('canvas_api_domain')
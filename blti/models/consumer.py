@@ -0,0 +1,19 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.db import models
+
+
+class LTIConsumer(models.Model):
+    """
+    LTI 1.1 consumer key and shared secret
+    """
+    key = models.CharField(max_length=30, unique=True)
+    secret = models.CharField(max_length=255)
+    description = models.CharField(max_length=255, blank=True, default='')
+    is_active = models.BooleanField(default=True)
+    added_date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,76 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+
+class LTIKeyPair(models.Model):
+    """
+    Tool key pair used to sign messages for LTI 1.3 registrations
+    """
+    kid = models.CharField(max_length=255, unique=True)
+    private_key = models.TextField()
+    public_key = models.TextField()
+    added_date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.kid
+
+
+class LTIRegistration(models.Model):
+    """
+    LTI 1.3 platform registration, one tool.json issuer conf item
+    """
+    issuer = models.CharField(max_length=255)
+    client_id = models.CharField(max_length=255)
+    is_default = models.BooleanField(default=False)
+    auth_login_url = models.CharField(max_length=255)
+    auth_token_url = models.CharField(max_length=255)
+    auth_audience = models.CharField(max_length=255, blank=True, default='')
+    key_set_url = models.CharField(max_length=255, blank=True, default='')
+    key_set = models.JSONField(null=True, blank=True)
+    key_pair = models.ForeignKey(
+        LTIKeyPair, on_delete=models.PROTECT, null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    added_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['issuer', 'client_id'],
+                                    name='blti_registration_client_id')
+        ]
+
+    def __str__(self):
+        return f"{self.issuer} {self.client_id}"
+
+
+class LTIDeployment(models.Model):
+    """
+    Deployment id issued by the platform for a registration
+    """
+    registration = models.ForeignKey(
+        LTIRegistration, on_delete=models.CASCADE, related_name='deployments')
+    deployment_id = models.CharField(max_length=255)
+    is_active = models.BooleanField(default=True)
+    added_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['registration', 'deployment_id'],
+                                    name='blti_deployment_id')
+        ]
+
+    def __str__(self):
+        return self.deployment_id
+
+
+@receiver([post_save, post_delete], sender=LTIKeyPair)
+@receiver([post_save, post_delete], sender=LTIRegistration)
+@receiver([post_save, post_delete], sender=LTIDeployment)
+def _registration_changed(sender, **kwargs):
+    # processes reload their tool configuration once the change commits
+    from blti.config import bump_tool_conf_generation
+    transaction.on_commit(bump_tool_conf_generation)
@@ -0,0 +1,75 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from collections import OrderedDict
+from functools import lru_cache
+import threading
+import time
+
+
+DEFAULT_NONCE_STORE = 'blti.nonce.LocalNonceStore'
+
+
+class LocalNonceStore(object):
+    """
+    In-process nonce store, split into independently locked LRU shards
+    bounded to max_size entries in total
+    """
+    max_size = 100000
+    shard_count = 16
+
+    def __init__(self):
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(
+            self.shard_count)]
+        self._shard_size = max(1, self.max_size // self.shard_count)
+
+    def check_and_add(self, key, expires):
+        """
+        Record key until the expires timestamp, returning False if it
+        was already recorded and has yet to expire
+        """
+        lock, entries = self._shards[hash(key) % self.shard_count]
+        now = time.time()
+        with lock:
+            expiry = entries.get(key)
+            if expiry is not None and expiry > now:
+                return False
+
+            entries[key] = expires
+            entries.move_to_end(key)
+
+            # drop expired and least recently added entries
+            while entries and (len(entries) > self._shard_size or (
+                    next(iter(entries.values())) <= now)):
+                entries.popitem(last=False)
+
+        return True
+
+
+class CacheNonceStore(object):
+    """
+    Nonce store shared by all processes through the Django cache named
+    by LTI_NONCE_CACHE, relying on the atomicity of cache.add()
+    """
+    key_prefix = 'blti-nonce'
+
+    def __init__(self):
+        self._cache = caches[getattr(settings, 'LTI_NONCE_CACHE', 'default')]
+
+    def check_and_add(self, key, expires):
+        timeout = max(1, int(expires - time.time()))
+        return self._cache.add(f"{self.key_prefix}:{key}", 1, timeout)
+
+
+@lru_cache(maxsize=8)
+def _nonce_store(nonce_store_path):
+    return import_string(nonce_store_path)()
+
+
+def get_nonce_store():
+    return _nonce_store(getattr(
+        settings, 'LTI_NONCE_STORE', DEFAULT_NONCE_STORE))
@@ -3,6 +3,7 @@
 
 from blti.redirect import BLTIRedirect
 from blti.cookies_allowed_check import BLTICookiesAllowedCheckPage
+from blti.launch_data_storage import STATE_PREFIX
 from pylti1p3.request import Request
 from pylti1p3.contrib.django import DjangoOIDCLogin
 from pylti1p3.contrib.django.request import DjangoRequest
@@ -10,6 +11,8 @@ from pylti1p3.contrib.django.cookie import DjangoCookieService
 
 
 class BLTIOIDCLogin(DjangoOIDCLogin):
+    _signed_state = None
+
     def __init__(
         self,
         request,
@@ -34,6 +37,10 @@ class BLTIOIDCLogin(DjangoOIDCLogin):
             launch_data_storage,
         )
 
+    def is_new_window_request(self):
+        # reloaded by the cookie check, or opened in a new window
+        return self._is_new_window_request()
+
     def get_cookies_allowed_js_check(self) -> str:
         protocol = "https" if self._request.is_secure() else "http"
         params_lst = [
@@ -64,7 +71,32 @@ class BLTIOIDCLogin(DjangoOIDCLogin):
 
         return page.get_html()
 
+    def _prepare_redirect_url(self, launch_url):
+        # storage without server side state provides signed values for
+        # the state and nonce the login generates
+        create_state = getattr(
+            self._launch_data_storage, 'create_state', None)
+        self._signed_state = create_state() if create_state else None
+        try:
+            return super()._prepare_redirect_url(launch_url)
+        finally:
+            self._signed_state = None
+
+    def _get_uuid(self):
+        # the login's state is "state-" followed by this value
+        if self._signed_state:
+            return self._signed_state[0][len(STATE_PREFIX):]
+
+        return super()._get_uuid()
+
+    def _generate_nonce(self):
+        if self._signed_state:
+            return self._signed_state[1]
+
+        return super()._generate_nonce()
+
     def get_redirect(self, url):
         return BLTIRedirect(
             url, cookie_service=self._cookie_service,
-            session_service=self._session_service)
+            session_service=self._session_service,
+            request=self._request._request)
@@ -0,0 +1,110 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from django.http import HttpResponse
+from blti.exceptions import BLTIException
+from blti.config import get_registration_index
+from blti.consumers import get_consumer_registry
+from urllib.parse import unquote
+import re
+
+
+DEFAULT_LAUNCH_MAX_BODY_SIZE = 131072
+DEFAULT_ID_TOKEN_MAX_SIZE = 65536
+DEFAULT_ID_TOKEN_ALGORITHMS = ['RS256', 'RS384', 'RS512', 'PS256', 'PS384',
+                               'PS512', 'ES256', 'ES384', 'ES512']
+MAX_KID_LENGTH = 256
+
+RE_OAUTH_TOKEN = re.compile(r'^[a-zA-Z0-9_-]+$')
+RE_OAUTH_TIMESTAMP = re.compile(r'^[0-9]{10}$')
+
+UNAUTHORIZED_CONTENT = (
+    b'<!DOCTYPE html><html><head><title>Unauthorized</title></head>'
+    b'<body><h2>Unauthorized</h2></body></html>')
+
+
+class BLTILaunchRejected(BLTIException):
+    def __init__(self, reason):
+        super(BLTILaunchRejected, self).__init__(f"Launch rejected: {reason}")
+        self.reason = reason
+
+
+def unauthorized_response():
+    return HttpResponse(UNAUTHORIZED_CONTENT, status=401)
+
+
+class BLTILaunchPreValidator(object):
+    """
+    Structural checks cheap enough to reject junk launch requests
+    before signatures are verified.  Anything rejected here would
+    also fail full validation.
+    """
+    def validate_size(self, request):
+        try:
+            size = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            raise BLTILaunchRejected('size')
+
+        if size > getattr(settings, 'LTI_LAUNCH_MAX_BODY_SIZE',
+                          DEFAULT_LAUNCH_MAX_BODY_SIZE):
+            raise BLTILaunchRejected('size')
+
+    def validate_1p1(self, request):
+        params = request.POST if request.method == 'POST' else request.GET
+
+        def oauth(name):
+            # as the signature verifier sees them, the oauth parameters
+            # may be in the query string of a posted launch
+            value = params.get(name, request.GET.get(name))
+            return unquote(value) if value is not None else None
+
+        client_key = oauth('oauth_consumer_key')
+        if not (oauth('oauth_signature') and client_key and (
+                oauth('oauth_signature_method') == 'HMAC-SHA1') and (
+                    oauth('oauth_version') in (None, '1.0'))):
+            raise BLTILaunchRejected('oauth')
+
+        nonce = oauth('oauth_nonce') or ''
+        if not (12 <= len(client_key) <= 30 and 20 <= len(nonce) <= 50 and (
+                RE_OAUTH_TOKEN.match(client_key)) and (
+                    RE_OAUTH_TOKEN.match(nonce)) and (
+                        RE_OAUTH_TIMESTAMP.match(
+                            oauth('oauth_timestamp') or ''))):
+            raise BLTILaunchRejected('oauth')
+
+        if get_consumer_registry().get_secret(client_key) is None:
+            raise BLTILaunchRejected('consumer')
+
+    def validate_1p3(self, request, id_token):
+        if not id_token.id_token:
+            raise BLTILaunchRejected('id_token')
+
+        if len(id_token.id_token) > getattr(
+                settings, 'LTI_ID_TOKEN_MAX_SIZE', DEFAULT_ID_TOKEN_MAX_SIZE):
+            raise BLTILaunchRejected('size')
+
+        try:
+            header = id_token.header
+            iss = id_token.iss
+            client_id = id_token.client_id
+        except BLTIException:
+            raise BLTILaunchRejected('jwt')
+
+        if header.get('alg') not in getattr(
+                settings, 'LTI_ID_TOKEN_ALGORITHMS',
+                DEFAULT_ID_TOKEN_ALGORITHMS):
+            raise BLTILaunchRejected('alg')
+
+        kid = header.get('kid')
+        if not (kid and isinstance(kid, str) and len(kid) <= MAX_KID_LENGTH):
+            raise BLTILaunchRejected('kid')
+
+        client_ids = get_registration_index().get(iss) if (
+            isinstance(iss, str)) else None
+        if client_ids is None:
+            raise BLTILaunchRejected('iss')
+
+        if not isinstance(client_id, str) or client_id not in client_ids:
+            raise BLTILaunchRejected('client_id')
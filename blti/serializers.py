@@ -0,0 +1,142 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from blti.exceptions import BLTIException
+from functools import lru_cache
+import base64
+import json
+import zlib
+
+
+DEFAULT_LAUNCH_DATA_SERIALIZER = 'blti.serializers.JSONLaunchDataSerializer'
+
+# serialized launch data other than plain json begins with
+# "blti:<format version>:<encoding>:"
+LAUNCH_DATA_HEADER = 'blti'
+LAUNCH_DATA_FORMAT_VERSION = '1'
+ENCODING_JSON = 'j'
+ENCODING_ZLIB = 'z'
+
+# static dictionary of long claim key prefixes and their short codes
+CLAIM_KEY_PREFIXES = (
+    ('https://purl.imsglobal.org/spec/lti/claim/', '~c/'),
+    ('https://purl.imsglobal.org/spec/lti-ags/claim/', '~a/'),
+    ('https://purl.imsglobal.org/spec/lti-nrps/claim/', '~n/'),
+    ('https://purl.imsglobal.org/spec/lti-dl/claim/', '~d/'),
+    ('https://purl.imsglobal.org/spec/lti-gs/claim/', '~g/'),
+    ('https://purl.imsglobal.org/spec/lti/', '~l/'),
+    ('https://www.instructure.com/', '~i/'),
+)
+CLAIM_KEY_CODES = {code: prefix for prefix, code in CLAIM_KEY_PREFIXES}
+CLAIM_KEY_ESCAPE = '~'
+
+
+class JSONLaunchDataSerializer(object):
+    """
+    Launch data as a plain json string, the original session format
+    """
+    def dumps(self, data):
+        return json.dumps(data)
+
+    def loads(self, value):
+        return json.loads(value)
+
+
+class CompactLaunchDataSerializer(JSONLaunchDataSerializer):
+    """
+    Launch data as compact json with long claim keys replaced by short
+    codes, optionally zlib compressed when larger than compress_min_size
+    """
+    compress = False
+    compress_min_size = 512
+    compress_level = 6
+
+    def dumps(self, data):
+        content = json.dumps({
+            self._encode_key(k): v for k, v in data.items()},
+            separators=(',', ':'))
+
+        encoding = ENCODING_JSON
+        if self.compress and len(content) >= self.compress_min_size:
+            encoding = ENCODING_ZLIB
+            content = base64.b64encode(zlib.compress(
+                content.encode('utf-8'), self.compress_level)).decode('ascii')
+
+        return ':'.join([LAUNCH_DATA_HEADER, LAUNCH_DATA_FORMAT_VERSION,
+                         encoding, content])
+
+    def loads(self, value):
+        try:
+            header, version, encoding, content = value.split(':', 3)
+        except ValueError:
+            raise BLTIException('Invalid launch data')
+
+        if (header != LAUNCH_DATA_HEADER or
+                version != LAUNCH_DATA_FORMAT_VERSION):
+            raise BLTIException(f"Unknown launch data format: {version}")
+
+        if encoding not in (ENCODING_JSON, ENCODING_ZLIB):
+            raise BLTIException(f"Unknown launch data encoding: {encoding}")
+
+        try:
+            if encoding == ENCODING_ZLIB:
+                content = zlib.decompress(
+                    base64.b64decode(content)).decode('utf-8')
+
+            return {self._decode_key(k): v for k, v in json.loads(
+                content).items()}
+        except (ValueError, KeyError, zlib.error) as ex:
+            raise BLTIException(f"Invalid launch data: {ex}")
+
+    def _encode_key(self, key):
+        if key.startswith(CLAIM_KEY_ESCAPE):
+            return f"{CLAIM_KEY_ESCAPE}{key}"
+
+        for prefix, code in CLAIM_KEY_PREFIXES:
+            if key.startswith(prefix):
+                return f"{code}{key[len(prefix):]}"
+
+        return key
+
+    def _decode_key(self, key):
+        if key.startswith(CLAIM_KEY_ESCAPE):
+            if key.startswith(CLAIM_KEY_ESCAPE, 1):
+                return key[1:]
+
+            return f"{CLAIM_KEY_CODES[key[:3]]}{key[3:]}"
+
+        return key
+
+
+class CompressedLaunchDataSerializer(CompactLaunchDataSerializer):
+    compress = True
+
+
+@lru_cache(maxsize=8)
+def _serializer(serializer_path):
+    return import_string(serializer_path)()
+
+
+def get_launch_data_serializer():
+    return _serializer(getattr(
+        settings, 'LTI_DATA_SERIALIZER', DEFAULT_LAUNCH_DATA_SERIALIZER))
+
+
+def dumps_launch_data(data):
+    return get_launch_data_serializer().dumps(data)
+
+
+def loads_launch_data(value):
+    # read plain json and headed values whichever serializer is
+    # configured, so sessions written before a change remain valid
+    if value.startswith('{'):
+        return json.loads(value)
+
+    if value.startswith(f"{LAUNCH_DATA_HEADER}:"):
+        return _serializer(
+            'blti.serializers.CompactLaunchDataSerializer').loads(value)
+
+    return get_launch_data_serializer().loads(value)
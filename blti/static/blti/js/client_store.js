@@ -0,0 +1,189 @@
+/*
+ * LTI client side storage redirects.  Per-request values are read from
+ * the JSON block with id "blti-client-store":
+ *
+ *   put: store the OIDC state, nonce and session id with the platform
+ *        before redirecting to the authorization location
+ *   get: fetch them back and post them to the launch location
+ *
+ * Time to the platform's capabilities response and to completion, or
+ * falling back after the timeout, is reported to the beacon url with
+ * the page's beacon token.
+ */
+(function () {
+    "use strict";
+
+    var config = JSON.parse(
+            document.getElementById("blti-client-store").textContent),
+        location_url = new URL(config.location),
+        client_data;
+
+    if (config.action === "put") {
+        client_data = {
+            nonce: location_url.searchParams.get("nonce"),
+            state: location_url.searchParams.get("state"),
+            session_cookie_value: config.session_cookie_value
+        };
+    } else {
+        client_data = {
+            nonce: null,
+            state: null,
+            session_cookie_value: null
+        };
+    }
+
+    var state = (config.action === "put") ? client_data.state :
+            config.parameters.state,
+        origin = config.origin || location_url.origin,
+        stored = {},
+        started = null,
+        timing = {beacon_token: config.beacon_token},
+        redirected = false;
+
+    function messageId(prop) {
+        return prop + "_" + state;
+    }
+
+    function ltiClientStore(frame, data) {
+        window.parent.frames[frame].postMessage(data, origin);
+    }
+
+    function formInput(f, k, v) {
+        var i = document.createElement("input");
+        i.type = "hidden";
+        i.name = k;
+        i.value = v;
+        f.appendChild(i);
+    }
+
+    function elapsed() {
+        return Math.round(window.performance.now() - started);
+    }
+
+    function report() {
+        if (started === null || !config.beacon || !navigator.sendBeacon) {
+            return;
+        }
+
+        navigator.sendBeacon(config.beacon, JSON.stringify(timing));
+    }
+
+    function fallBack() {
+        if (!redirected) {
+            timing.fallback = true;
+            doRedirection();
+        }
+    }
+
+    function completeAndRedirect() {
+        timing.complete_ms = elapsed();
+        doRedirection();
+    }
+
+    function doRedirection() {
+        if (redirected) {
+            return;
+        }
+
+        redirected = true;
+        report();
+
+        if (config.action === "put") {
+            window.location = config.location;
+            return;
+        }
+
+        var f = document.createElement("form");
+        f.action = config.location;
+        f.method = "POST";
+
+        formInput(f, "lti1p3_session_id", client_data.session_cookie_value);
+        formInput(f, "lti1p3_state", client_data.state);
+        formInput(f, "lti1p3_nonce", client_data.nonce);
+        for (var p in config.parameters) {
+            formInput(f, p, config.parameters[p]);
+        }
+
+        document.body.appendChild(f);
+        f.submit();
+    }
+
+    function complete(values) {
+        for (var prop in client_data) {
+            if (!values[prop]) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    function sendClientData(frame) {
+        for (var prop in client_data) {
+            var message = {
+                subject: "lti." + config.action + "_data",
+                message_id: messageId(prop),
+                key: prop
+            };
+
+            if (config.action === "put") {
+                message.value = client_data[prop];
+            }
+
+            ltiClientStore(frame, message);
+        }
+    }
+
+    function ltiClientStoreResponse(event) {
+        var message = event.data,
+            subject = "lti." + config.action + "_data";
+
+        switch (message.subject) {
+            case "lti.capabilities.response":
+                if (timing.capabilities_ms === undefined) {
+                    timing.capabilities_ms = elapsed();
+                }
+
+                var supported = message.supported_messages;
+                for (var i = 0; i < supported.length; i++) {
+                    if (supported[i].subject === subject) {
+                        sendClientData(supported[i].frame);
+                    }
+                }
+                break;
+            case subject + ".response":
+                if (config.action === "put") {
+                    stored[message.key] = true;
+                    if (complete(stored)) {
+                        completeAndRedirect();
+                    }
+                } else {
+                    client_data[message.key] = message.value;
+                    if (complete(client_data)) {
+                        completeAndRedirect();
+                    }
+                }
+                break;
+        }
+
+        if (message.error) {
+            console.error("event " + message.subject + " error (" +
+                          message.error.code + "): " + message.error.message);
+        }
+    }
+
+    function clientStoreAndRedirect() {
+        if (config.action === "put" && !complete(client_data)) {
+            doRedirection();
+            return;
+        }
+
+        started = window.performance.now();
+        window.parent.postMessage({subject: "lti.capabilities"}, "*");
+        if (config.timeout) {
+            setTimeout(fallBack, config.timeout);
+        }
+    }
+
+    window.addEventListener("message", ltiClientStoreResponse);
+    document.addEventListener("DOMContentLoaded", clientStoreAndRedirect);
+}());
@@ -10,11 +10,16 @@ from blti.models import CanvasData
 from blti.validators import BLTIRequestValidator, Roles
 from blti.performance import log_response_time
 from blti import BLTI, LTI_DATA_KEY
+from blti.serializers import loads_launch_data
 from blti.mock_data import Mock1p3Data
 from blti.exceptions import BLTIException
+from blti.metrics import get_counters, reset_counters
+from blti.nonce import LocalNonceStore, _nonce_store
 from oauthlib.common import generate_timestamp, generate_nonce
 from urllib.parse import urlencode
+import oauthlib.oauth1
 import time
+import json
 import mock
 import os
 
@@ -134,6 +139,80 @@ class RequestValidator1p1Test(TestCase):
                 'X', '1234567890', '', self.request))
 
 
+class NonceStoreTest(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().post(
+            '/test', data=LTI_LAUNCH_PARAMS, secure=True)
+        _nonce_store.cache_clear()
+        reset_counters('oauth.nonce')
+
+    def test_replayed_nonce(self):
+        timestamp = int(time.time())
+        nonce = generate_nonce()
+        validator = BLTIRequestValidator()
+        self.assertTrue(validator.validate_timestamp_and_nonce(
+            'X', timestamp, nonce, self.request))
+
+        # same request revalidated
+        self.assertTrue(validator.validate_timestamp_and_nonce(
+            'X', timestamp, nonce, self.request))
+
+        self.assertFalse(BLTIRequestValidator().validate_timestamp_and_nonce(
+            'X', timestamp, nonce, self.request))
+        self.assertTrue(BLTIRequestValidator().validate_timestamp_and_nonce(
+            'Y', timestamp, nonce, self.request))
+        self.assertEqual(
+            get_counters('oauth.nonce'), {'oauth.nonce.replay': 1})
+
+    @override_settings(LTI_NONCE_STORE='blti.nonce.CacheNonceStore')
+    def test_replayed_nonce_cache(self):
+        timestamp = int(time.time())
+        nonce = generate_nonce()
+        self.assertTrue(BLTIRequestValidator().validate_timestamp_and_nonce(
+            'X', timestamp, nonce, self.request))
+        self.assertFalse(BLTIRequestValidator().validate_timestamp_and_nonce(
+            'X', timestamp, nonce, self.request))
+
+    def test_local_store_expiry(self):
+        store = LocalNonceStore()
+        now = time.time()
+        self.assertTrue(store.check_and_add('a', now - 1))
+        self.assertTrue(store.check_and_add('a', now + 60))
+        self.assertFalse(store.check_and_add('a', now + 60))
+
+    def test_local_store_bounded(self):
+        with mock.patch.object(LocalNonceStore, 'max_size', 32):
+            store = LocalNonceStore()
+            expires = time.time() + 60
+            for i in range(1000):
+                self.assertTrue(store.check_and_add(f"nonce-{i}", expires))
+
+            self.assertLessEqual(
+                sum(len(entries) for lock, entries in store._shards), 32)
+
+    @override_settings(LTI_CONSUMERS={'XXXXXXXXXXXXXX': 'secret'})
+    def test_replayed_launch(self):
+        client = oauthlib.oauth1.Client(
+            'XXXXXXXXXXXXXX', client_secret='secret',
+            signature_type=oauthlib.oauth1.SIGNATURE_TYPE_BODY)
+        params = {k: v for k, v in LTI_LAUNCH_PARAMS.items() if (
+            not k.startswith('oauth_'))}
+        params['roles'] = 'Instructor'
+        uri, headers, body = client.sign(
+            'https://testserver/', http_method='POST', body=params,
+            headers={'Content-Type': 'application/x-www-form-urlencoded'})
+
+        response = self.client.post(
+            '/', body, content_type=headers['Content-Type'], secure=True)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(
+            '/', body, content_type=headers['Content-Type'], secure=True)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(
+            get_counters('oauth.nonce'), {'oauth.nonce.replay': 1})
+
+
 class CanvasRolesTest(TestCase):
     def setUp(self):
         self.params = LTI_LAUNCH_PARAMS
@@ -213,6 +292,19 @@ class CanvasRolesTest(TestCase):
             BLTIException, Roles(
                 CanvasData(**self.params)).authorize, role='Manager')
 
+    def test_authorize_without_role_mask(self):
+        launch_data = mock.Mock(
+            spec=['is_member', 'is_instructor', 'is_student'],
+            is_member=True, is_instructor=True, is_student=False)
+        self.assertEqual(None, Roles(launch_data).authorize(
+            role='instructor'))
+        self.assertEqual(None, Roles(launch_data).authorize(
+            role=['member', 'instructor'], match='all'))
+        self.assertRaises(
+            BLTIException, Roles(launch_data).authorize, role='student')
+        self.assertRaises(
+            BLTIException, Roles(launch_data).authorize, role='admin')
+
 
 class BLTI1p1SessionTest(TestCase):
     def setUp(self):
@@ -246,6 +338,26 @@ class BLTI1p1SessionTest(TestCase):
         self.assertEqual(len(blti_data), 36)
         self.assertRaises(KeyError, lambda: blti_data['oauth_consumer_key'])
 
+    def test_get_session_decoded_once(self):
+        blti = BLTI()
+        blti.set_session(self.request, **LTI_LAUNCH_PARAMS)
+
+        # fresh request sharing the session
+        request = RequestFactory().get('/test')
+        request.session = self.request.session
+        with mock.patch('blti.loads_launch_data',
+                        wraps=loads_launch_data) as loads:
+            data = blti.get_session(request)
+            self.assertIs(blti.get_session(request), data)
+            self.assertIs(BLTI().get_session(request), data)
+            self.assertEqual(loads.call_count, 1)
+
+            # replaced session value is decoded again
+            request.session[LTI_DATA_KEY] = json.dumps({'roles': 'Learner'})
+            self.assertEqual(
+                blti.get_session(request), {'roles': 'Learner'})
+            self.assertEqual(loads.call_count, 2)
+
 
 class BLTIDecoratorTest(TestCase):
     def setUp(self):
@@ -0,0 +1,133 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from blti import BLTI
+from blti.claims import ClaimProjection
+from blti.metrics import get_counters, reset_counters
+from blti.mock_data import Mock1p3Data
+from blti.serializers import dumps_launch_data
+from blti.models import CanvasData
+from blti.tests.test_blti_1p1 import LTI_LAUNCH_PARAMS
+import mock
+
+
+CLAIM = 'https://purl.imsglobal.org/spec/lti/claim/'
+AGS_CLAIM = 'https://purl.imsglobal.org/spec/lti-ags/claim/endpoint'
+
+
+class ClaimProjectionTest(TestCase):
+    def setUp(self):
+        self.data = Mock1p3Data().launch_data()
+        self.data[AGS_CLAIM] = {'lineitems': 'https://example.edu/items'}
+
+    def test_no_projection(self):
+        projection = ClaimProjection()
+        self.assertFalse(projection.active)
+        self.assertEqual(projection.project(self.data), self.data)
+
+    def test_exclude(self):
+        projected = ClaimProjection(exclude=[
+            'lis', 'launch_presentation', AGS_CLAIM, 'custom.canvas_user_id',
+            'roles']).project(self.data)
+
+        self.assertNotIn(f"{CLAIM}lis", projected)
+        self.assertNotIn(f"{CLAIM}launch_presentation", projected)
+        self.assertNotIn(AGS_CLAIM, projected)
+        self.assertNotIn('canvas_user_id', projected[f"{CLAIM}custom"])
+        self.assertIn('canvas_course_id', projected[f"{CLAIM}custom"])
+        self.assertIn(f"{CLAIM}context", projected)
+
+        # required claims are kept
+        self.assertIn(f"{CLAIM}roles", projected)
+
+    def test_include(self):
+        projected = ClaimProjection(include=[
+            'context', 'custom.canvas_course_id', 'sub']).project(self.data)
+
+        self.assertEqual(set(projected.keys()), {
+            'sub', f"{CLAIM}context", f"{CLAIM}custom",
+            f"{CLAIM}tool_platform", f"{CLAIM}roles"})
+        self.assertEqual(set(projected[f"{CLAIM}custom"].keys()), {
+            'canvas_course_id', 'canvas_user_login_id'})
+
+        blti = CanvasData(**projected)
+        self.assertEqual(blti.canvas_course_id, '9752574')
+        self.assertEqual(blti.course_short_name, 'PSYCH 101 A')
+        self.assertIsNone(blti.course_sis_id)
+
+    def test_exclude_required(self):
+        projected = ClaimProjection(exclude=[
+            'custom', f"{CLAIM}tool_platform", f"{CLAIM}roles"]).project(
+                self.data)
+
+        self.assertEqual(projected[f"{CLAIM}custom"], {
+            'canvas_user_login_id': 'javerage'})
+        self.assertIn(f"{CLAIM}tool_platform", projected)
+        self.assertIn(f"{CLAIM}roles", projected)
+
+        projected = ClaimProjection(exclude=[
+            'custom', 'tool']).project(LTI_LAUNCH_PARAMS)
+        self.assertEqual(
+            projected['custom_canvas_user_login_id'],
+            LTI_LAUNCH_PARAMS['custom_canvas_user_login_id'])
+        self.assertNotIn('custom_canvas_user_id', projected)
+        self.assertIn('tool_consumer_info_product_family_code', projected)
+
+    def test_1p1(self):
+        projected = ClaimProjection(include=[
+            'context', 'custom.canvas_user_id']).project(LTI_LAUNCH_PARAMS)
+
+        self.assertEqual(set(projected.keys()), {
+            'context_id', 'context_label', 'context_title', 'roles',
+            'custom_canvas_user_id', 'custom_canvas_user_login_id',
+            'tool_consumer_info_product_family_code'})
+
+
+class ClaimProjectionSessionTest(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().post('/test')
+        SessionMiddleware(get_response=mock.MagicMock()).process_request(
+            self.request)
+        reset_counters('launch_data')
+
+    @override_settings(LTI_DATA_EXCLUDE_CLAIMS=['lis', 'launch_presentation'],
+                       LTI_DATA_SIZE_SAMPLE_RATE=1)
+    def test_set_session(self):
+        data = Mock1p3Data().launch_data()
+        BLTI().set_session(self.request, **data)
+
+        stored = BLTI().get_session(self.request)
+        self.assertNotIn(f"{CLAIM}lis", stored)
+        self.assertIn(f"{CLAIM}context", stored)
+
+        counters = get_counters('launch_data')
+        self.assertEqual(counters['launch_data.stored'], 1)
+        self.assertEqual(counters['launch_data.sampled'], 1)
+        self.assertEqual(counters['launch_data.sampled_bytes'],
+                         counters['launch_data.bytes'])
+        self.assertLess(counters['launch_data.sampled_bytes'],
+                        counters['launch_data.sampled_unprojected_bytes'])
+
+    @override_settings(LTI_DATA_SIZE_SAMPLE_RATE=1)
+    def test_set_session_unprojected(self):
+        BLTI().set_session(self.request, **Mock1p3Data().launch_data())
+
+        # without projection there is nothing to measure
+        counters = get_counters('launch_data')
+        self.assertEqual(counters['launch_data.stored'], 1)
+        self.assertNotIn('launch_data.sampled', counters)
+
+    @override_settings(LTI_DATA_EXCLUDE_CLAIMS=['lis', 'launch_presentation'],
+                       LTI_DATA_SIZE_SAMPLE_RATE=0)
+    def test_set_session_not_sampled(self):
+        with mock.patch('blti.dumps_launch_data',
+                        wraps=dumps_launch_data) as dumps:
+            BLTI().set_session(self.request, **Mock1p3Data().launch_data())
+            self.assertEqual(dumps.call_count, 1)
+
+        counters = get_counters('launch_data')
+        self.assertEqual(counters['launch_data.stored'], 1)
+        self.assertNotIn('launch_data.sampled', counters)
@@ -0,0 +1,79 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import TestCase
+from blti.config import (
+    get_tool_conf, get_tool_conf_version, get_registration_index,
+    reload_tool_conf)
+from blti.tool_config import IndexedToolConf
+from blti.tests.utils import (
+    LTIConfigDirectory, tool_conf_json, TEST_ISSUER, TEST_CLIENT_ID)
+import mock
+import os
+
+
+class ToolConfCacheTest(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = mock.patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    def test_parsed_once(self):
+        with mock.patch('blti.config.IndexedToolConf',
+                        wraps=IndexedToolConf) as tool_conf_class:
+            tool_conf = get_tool_conf()
+            self.assertIs(get_tool_conf(), tool_conf)
+            self.assertIs(get_tool_conf(), tool_conf)
+            self.assertEqual(tool_conf_class.call_count, 1)
+
+        reg = tool_conf.find_registration_by_issuer(TEST_ISSUER)
+        self.assertEqual(reg.get_client_id(), TEST_CLIENT_ID)
+
+    def test_reload_on_config_change(self):
+        tool_conf = get_tool_conf()
+        version = get_tool_conf_version()
+
+        self.config_dir.write_tool_conf(
+            tool_conf_json(client_id='20000000000002'))
+
+        reloaded = get_tool_conf()
+        self.assertIsNot(reloaded, tool_conf)
+        self.assertEqual(get_tool_conf_version(), version + 1)
+        self.assertEqual(reloaded.find_registration_by_issuer(
+            TEST_ISSUER).get_client_id(), '20000000000002')
+
+    def test_reload_on_key_change(self):
+        tool_conf = get_tool_conf()
+        self.config_dir.write_keys(regenerate=True)
+
+        reloaded = get_tool_conf()
+        self.assertIsNot(reloaded, tool_conf)
+        self.assertEqual(reloaded.find_registration_by_issuer(
+            TEST_ISSUER).get_tool_public_key(), self.config_dir.public_key)
+
+    def test_explicit_reload(self):
+        tool_conf = get_tool_conf()
+        reload_tool_conf()
+        self.assertIsNot(get_tool_conf(), tool_conf)
+
+    def test_registration_index(self):
+        self.assertEqual(get_registration_index(), {
+            TEST_ISSUER: frozenset([TEST_CLIENT_ID])})
+        self.assertIs(get_registration_index(), get_registration_index())
+
+        self.config_dir.write_tool_conf(
+            tool_conf_json(client_id='20000000000002'))
+        self.assertEqual(get_registration_index(), {
+            TEST_ISSUER: frozenset(['20000000000002'])})
+
+    def test_missing_config(self):
+        os.remove(os.path.join(self.config_dir.path, 'tool.json'))
+        self.assertRaises(Exception, get_tool_conf)
@@ -0,0 +1,136 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import TestCase, override_settings
+from blti.consumers import (
+    ConsumerRegistry, ModelConsumerBackend, JSONFileConsumerBackend,
+    get_consumer_registry)
+from blti.models import LTIConsumer
+from blti.validators import BLTIRequestValidator
+from blti.tests.utils import LTIConfigDirectory
+import threading
+import json
+import mock
+import time
+import os
+
+
+class StubConsumerBackend(object):
+    def __init__(self, consumers):
+        self.data = consumers
+        self.calls = 0
+
+    def consumers(self):
+        self.calls += 1
+        return dict(self.data)
+
+
+class ConsumerRegistryTest(TestCase):
+    def test_index(self):
+        backend = StubConsumerBackend({'A': 'secretA'})
+        registry = ConsumerRegistry([backend], 300, 60)
+        self.assertEqual(registry.get_secret('A'), 'secretA')
+        self.assertEqual(registry.get_secret('A'), 'secretA')
+        self.assertEqual(backend.calls, 1)
+
+    def test_precedence(self):
+        registry = ConsumerRegistry([
+            StubConsumerBackend({'A': 'first'}),
+            StubConsumerBackend({'A': 'second', 'B': 'secretB'})], 300, 60)
+        self.assertEqual(registry.get_secret('A'), 'first')
+        self.assertEqual(registry.get_secret('B'), 'secretB')
+
+    @mock.patch('blti.consumers.time.time')
+    def test_unknown_key(self, mock_time):
+        mock_time.return_value = 1000
+        backend = StubConsumerBackend({'A': 'secretA'})
+        registry = ConsumerRegistry([backend], 300, 60)
+        self.assertIsNone(registry.get_secret('X'))
+        self.assertIsNone(registry.get_secret('X'))
+        self.assertIsNone(registry.get_secret('Y'))
+        self.assertEqual(backend.calls, 1)
+
+        # new key is picked up once the negative ttl passes
+        backend.data['X'] = 'secretX'
+        mock_time.return_value = 1061
+        self.assertEqual(registry.get_secret('X'), 'secretX')
+        self.assertEqual(backend.calls, 2)
+
+    @mock.patch('blti.consumers.time.time')
+    def test_ttl_refresh(self, mock_time):
+        mock_time.return_value = 1000
+        backend = StubConsumerBackend({'A': 'secretA'})
+        registry = ConsumerRegistry([backend], 300, 60)
+        self.assertEqual(registry.get_secret('A'), 'secretA')
+
+        backend.data['A'] = 'rotated'
+        mock_time.return_value = 1200
+        self.assertEqual(registry.get_secret('A'), 'secretA')
+        mock_time.return_value = 1300
+        self.assertEqual(registry.get_secret('A'), 'rotated')
+
+    @mock.patch('blti.consumers.time.time')
+    def test_failed_refresh(self, mock_time):
+        mock_time.return_value = 1000
+        backend = StubConsumerBackend({'A': 'secretA'})
+        registry = ConsumerRegistry([backend], 300, 60)
+        self.assertEqual(registry.get_secret('A'), 'secretA')
+
+        mock_time.return_value = 1300
+        with mock.patch.object(
+                backend, 'consumers', side_effect=Exception('down')):
+            with self.assertLogs('blti.consumers', level='ERROR'):
+                self.assertEqual(registry.get_secret('A'), 'secretA')
+
+    def test_single_expiry_refresh(self):
+        backend = StubConsumerBackend({'A': 'secretA'})
+        registry = ConsumerRegistry([backend], 300, 60)
+        self.assertEqual(registry.get_secret('A'), 'secretA')
+
+        # threads that all saw the index expire reload it once
+        registry._expires = 0
+        consumers = backend.consumers
+        backend.consumers = lambda: (time.sleep(0.1), consumers())[1]
+        threads = [threading.Thread(target=registry.get_secret, args=('A',))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(backend.calls, 2)
+
+    def test_model_backend(self):
+        LTIConsumer.objects.create(key='A', secret='secretA')
+        LTIConsumer.objects.create(key='B', secret='secretB', is_active=False)
+        self.assertEqual(ModelConsumerBackend().consumers(), {'A': 'secretA'})
+
+    def test_json_file_backend(self):
+        config = LTIConfigDirectory()
+        try:
+            with mock.patch.dict(
+                    os.environ, {'LTI_CONFIG_DIRECTORY': config.path}):
+                self.assertEqual(JSONFileConsumerBackend().consumers(), {})
+
+                config.write('consumers.json',
+                             json.dumps({'A': 'secretA'}))
+                self.assertEqual(
+                    JSONFileConsumerBackend().consumers(), {'A': 'secretA'})
+        finally:
+            config.cleanup()
+
+    @override_settings(LTI_CONSUMERS={'A': 'secretA'})
+    def test_validator(self):
+        validator = BLTIRequestValidator()
+        self.assertEqual(validator.get_client_secret('A', None), 'secretA')
+        self.assertEqual(validator.get_client_secret('X', None),
+                         validator.dummy_client)
+
+    def test_settings_changed(self):
+        with self.settings(LTI_CONSUMERS={'A': 'secretA'}):
+            self.assertEqual(get_consumer_registry().get_secret('A'),
+                             'secretA')
+        with self.settings(LTI_CONSUMERS={'A': 'rotated'}):
+            self.assertEqual(get_consumer_registry().get_secret('A'),
+                             'rotated')
@@ -0,0 +1,107 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from unittest.mock import patch, MagicMock
+from blti.config import get_tool_conf, reload_tool_conf
+from blti.exceptions import BLTIException
+from blti.id_token import IdToken, get_id_token
+from blti.message_launch import BLTIMessageLaunch
+from blti.tests.utils import (
+    LTIConfigDirectory, TEST_ISSUER, TEST_CLIENT_ID, rsa_test_key)
+from pylti1p3.exception import LtiException
+import json
+import jwt
+import os
+
+
+def id_token(**kwargs):
+    payload = {'iss': TEST_ISSUER, 'aud': TEST_CLIENT_ID, 'sub': 'x'}
+    payload.update(kwargs)
+    return jwt.encode(payload, rsa_test_key().exportKey(format='PEM'),
+                      algorithm='RS256', headers={'kid': 'kid-1'})
+
+
+class IdTokenTest(TestCase):
+    def test_decode(self):
+        token = IdToken(id_token(aud=[TEST_CLIENT_ID, 'other']))
+        with patch('blti.id_token.json.loads', wraps=json.loads) as loads:
+            self.assertEqual(token.header['kid'], 'kid-1')
+            self.assertEqual(token.iss, TEST_ISSUER)
+            self.assertEqual(token.client_id, TEST_CLIENT_ID)
+            self.assertEqual(len(token.signature), 256)
+            self.assertEqual(loads.call_count, 2)
+
+    def test_invalid(self):
+        for value in [None, '', 'a.b', 'a.b.c', f"{id_token()[4:]}"]:
+            with self.assertRaises(BLTIException):
+                IdToken(value).payload
+
+    def test_find_registration(self):
+        tool_conf = MagicMock()
+        tool_conf.check_iss_has_one_client.return_value = False
+        token = IdToken(id_token())
+
+        registration = token.find_registration(tool_conf)
+        self.assertIs(token.find_registration(tool_conf), registration)
+        tool_conf.find_registration_by_params.assert_called_once_with(
+            TEST_ISSUER, TEST_CLIENT_ID, jwt_body=token.payload)
+
+    def test_get_id_token(self):
+        request = RequestFactory().post('/')
+        value = id_token()
+        token = get_id_token(request, value)
+        self.assertIs(get_id_token(request, value), token)
+        self.assertIsNot(get_id_token(request, id_token(sub='y')), token)
+
+    def test_message_launch(self):
+        value = id_token()
+        request = RequestFactory().post('/', {'id_token': value})
+        token = get_id_token(request, value)
+        message_launch = BLTIMessageLaunch(
+            request, None).set_id_token(token).validate_jwt_format()
+        self.assertIs(message_launch._jwt['body'], token.payload)
+        self.assertIs(message_launch._jwt['header'], token.header)
+
+        request = RequestFactory().post('/', {'id_token': 'a.b'})
+        with self.assertRaisesRegex(LtiException, 'must contain 3 parts'):
+            BLTIMessageLaunch(request, None).validate_jwt_format()
+
+
+class ClientStoreRedirectTest(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    def test_client_store_redirect(self):
+        tool_conf = get_tool_conf()
+        with patch.object(
+                tool_conf, 'find_registration_by_params',
+                wraps=tool_conf.find_registration_by_params) as mocked:
+            response = self.client.post(reverse('lti-launch-data'), {
+                'state': 'state-ac00bf57-bdd7-47c8-8b95-918f94797aef',
+                'id_token': id_token(),
+                'lti_storage_target': 'client_store'
+            }, secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, TEST_ISSUER)
+        self.assertEqual(mocked.call_count, 1)
+
+    def test_client_store_redirect_unknown_issuer(self):
+        response = self.client.post(reverse('lti-launch-data'), {
+            'state': 'state-ac00bf57-bdd7-47c8-8b95-918f94797aef',
+            'id_token': id_token(iss='https://unknown.example.edu'),
+            'lti_storage_target': 'client_store'
+        }, secure=True)
+        self.assertEqual(response.status_code, 401)
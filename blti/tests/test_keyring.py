@@ -0,0 +1,154 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import TestCase
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from Crypto.PublicKey import RSA
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key)
+from blti.config import get_tool_conf, get_keyring, reload_tool_conf
+from blti.keyring import (
+    Keyring, ToolKey, KEY_STATUS_NEXT, KEY_STATUS_CURRENT,
+    KEY_STATUS_RETIRING, KEY_STATUS_RETIRED)
+from blti.tests.utils import (
+    LTIConfigDirectory, tool_conf_json, TEST_ISSUER, TEST_CLIENT_ID)
+from io import StringIO
+import mock
+import json
+import jwt
+import os
+
+
+def create_keys():
+    key = RSA.generate(2048)
+    return (key.exportKey(format='PEM'),
+            key.publickey().exportKey(format='PEM'))
+
+
+def tool_key(status=KEY_STATUS_CURRENT):
+    private_key, public_key = create_keys()
+    return ToolKey.generate(private_key.decode('utf-8'),
+                            public_key.decode('utf-8'), status=status)
+
+
+class KeyringTest(TestCase):
+    def statuses(self, keyring):
+        return [key.status for key in keyring.keys]
+
+    def test_rotate(self):
+        first = tool_key()
+        keyring = Keyring([first])
+        self.assertIs(keyring.current(), first)
+
+        keyring = keyring.rotate(tool_key(KEY_STATUS_NEXT))
+        self.assertEqual(self.statuses(keyring), [
+            KEY_STATUS_CURRENT, KEY_STATUS_NEXT])
+        self.assertEqual(keyring.current().kid, first.kid)
+
+        next_kid = keyring.keys[1].kid
+        keyring = keyring.rotate()
+        self.assertEqual(self.statuses(keyring), [
+            KEY_STATUS_RETIRING, KEY_STATUS_CURRENT])
+        self.assertEqual(keyring.current().kid, next_kid)
+        self.assertRaises(ValueError, keyring.rotate)
+
+        keyring = keyring.rotate(tool_key())
+        self.assertEqual(self.statuses(keyring), [
+            KEY_STATUS_RETIRED, KEY_STATUS_RETIRING, KEY_STATUS_CURRENT])
+        self.assertEqual([jwk['kid'] for jwk in keyring.jwks()],
+                         [key.kid for key in keyring.keys[1:]])
+
+    def test_key_material(self):
+        key = tool_key()
+        with mock.patch('blti.keyring.load_pem_private_key',
+                        wraps=load_pem_private_key) as load:
+            self.assertIs(key.signing_key, key.signing_key)
+            self.assertEqual(load.call_count, 1)
+
+        token = jwt.encode({'sub': 'a'}, key.signing_key, algorithm='RS256',
+                           headers={'kid': key.kid})
+        public_key = jwt.PyJWK(key.jwk).key
+        self.assertEqual(jwt.decode(token, public_key, algorithms=['RS256']),
+                         {'sub': 'a'})
+        self.assertEqual(key.jwk['kid'], key.kid)
+        self.assertRaises(ValueError, ToolKey, 'kid', key.created, 'lost',
+                          key.private_key, key.public_key)
+
+
+@mock.patch('blti.management.commands.rotate_credentials.'
+            'GenerateCredentials.create_keys', side_effect=create_keys)
+class RotateCredentialsTest(TestCase):
+    def setUp(self):
+        tool_conf = tool_conf_json()
+        del tool_conf[TEST_ISSUER][0]['private_key_file']
+        del tool_conf[TEST_ISSUER][0]['public_key_file']
+        self.config_dir = LTIConfigDirectory(tool_conf)
+        self.environ = mock.patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    def rotate(self, *args):
+        call_command('rotate_credentials', *args, stdout=StringIO())
+        return [(key.kid, key.status) for key in get_keyring().keys]
+
+    def registration(self):
+        return get_tool_conf().find_registration_by_params(
+            TEST_ISSUER, TEST_CLIENT_ID)
+
+    def published_kids(self):
+        response = self.client.get(reverse('jwks'))
+        return [key['kid'] for key in json.loads(response.content)['keys']]
+
+    def test_rotation(self, mock_create_keys):
+        self.assertIsNone(get_keyring())
+        self.assertIsNone(self.registration().get_tool_private_key())
+
+        keys = self.rotate()
+        self.assertEqual([status for _, status in keys], [KEY_STATUS_CURRENT])
+        first_kid = keys[0][0]
+        self.assertEqual(self.registration().get_kid(), first_kid)
+        self.assertIs(self.registration().get_tool_private_key(),
+                      get_keyring().current().signing_key)
+        self.assertEqual(self.published_kids(), [first_kid])
+
+        keys = self.rotate('--stage')
+        next_kid = keys[1][0]
+        self.assertEqual(self.registration().get_kid(), first_kid)
+        self.assertEqual(self.published_kids(), [first_kid, next_kid])
+
+        keys = self.rotate('--promote')
+        self.assertEqual(keys, [(first_kid, KEY_STATUS_RETIRING),
+                                (next_kid, KEY_STATUS_CURRENT)])
+        self.assertEqual(self.registration().get_kid(), next_kid)
+
+        keys = self.rotate()
+        self.assertEqual([status for _, status in keys], [
+            KEY_STATUS_RETIRED, KEY_STATUS_RETIRING, KEY_STATUS_CURRENT])
+        self.assertEqual(self.published_kids(), [k for k, _ in keys[1:]])
+
+        self.rotate('--purge')
+        self.assertEqual(len(get_keyring().keys), 2)
+        self.assertFalse(os.path.exists(os.path.join(
+            self.config_dir.path, 'keys', f"{first_kid}.key")))
+
+    def test_registration_key(self, mock_create_keys):
+        # registrations with their own key pair keep signing with it
+        self.config_dir.write_tool_conf(tool_conf_json())
+        self.rotate()
+        registration = self.registration()
+        self.assertNotEqual(registration.get_kid(),
+                            get_keyring().current().kid)
+        self.assertEqual(len(self.published_kids()), 2)
+
+    def test_promote_without_staged_key(self, mock_create_keys):
+        self.rotate()
+        self.assertRaises(CommandError, self.rotate, '--promote')
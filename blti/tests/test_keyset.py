@@ -0,0 +1,299 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, TestCase
+from django.core.cache import caches
+from blti.keyset import (
+    PlatformKeySetStore, PublicKeyCache, cache_control_lifetimes,
+    get_key_set_store, get_public_key_cache)
+from blti.message_launch import BLTIMessageLaunch
+from blti.metrics import get_counters, reset_counters
+from blti.tests.utils import TEST_ISSUER, rsa_test_key, public_jwk
+from pylti1p3.registration import Registration
+from pylti1p3.exception import LtiException
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import json
+import mock
+import time
+import jwt
+
+
+class StubJWKSHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+
+        time.sleep(server.delay)
+        content = json.dumps(server.jwks).encode('utf-8')
+        self.send_response(server.status)
+        self.send_header('Content-Type', 'application/json')
+        if server.cache_control:
+            self.send_header('Cache-Control', server.cache_control)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubJWKSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super(StubJWKSServer, self).__init__(
+            ('127.0.0.1', 0), StubJWKSHandler)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.delay = 0
+        self.status = 200
+        self.cache_control = None
+        self.jwks = {'keys': [public_jwk(rsa_test_key(), 'kid-1')]}
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/jwks"
+        threading.Thread(target=self.serve_forever, args=(0.05,),
+                         daemon=True).start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class PlatformKeySetStoreTest(TestCase):
+    def setUp(self):
+        self.server = StubJWKSServer()
+        caches['default'].clear()
+        reset_counters('keyset')
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _wait_for_hits(self, hits):
+        for _ in range(100):
+            if self.server.hits >= hits:
+                return
+            time.sleep(0.01)
+
+    def test_get_keys(self):
+        store = PlatformKeySetStore()
+        keys = store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        self.assertEqual(keys[0]['kid'], 'kid-1')
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        self.assertEqual(self.server.hits, 1)
+
+    def test_cache_control(self):
+        self.server.cache_control = 'public, max-age=600'
+        store = PlatformKeySetStore()
+        now = time.time()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        key_set = store._key_sets[TEST_ISSUER]
+        self.assertAlmostEqual(key_set.fresh_until, now + 600, delta=5)
+        self.assertAlmostEqual(key_set.stale_until, now + 4200, delta=5)
+
+    def test_lifetimes(self):
+        self.assertEqual(cache_control_lifetimes(None), (3600, 3600))
+        self.assertEqual(cache_control_lifetimes(
+            'max-age=300, stale-while-revalidate=30'), (300, 30))
+        self.assertEqual(cache_control_lifetimes('no-store'), (60, 3600))
+        self.assertEqual(cache_control_lifetimes('max-age=x'), (3600, 3600))
+        with self.settings(LTI_KEY_SET_MIN_AGE=0):
+            self.assertEqual(cache_control_lifetimes('no-cache'), (0, 3600))
+
+    def test_stale_while_revalidate(self):
+        store = PlatformKeySetStore()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        store._key_sets[TEST_ISSUER].fresh_until = 0
+        caches['default'].clear()
+
+        self.server.delay = 0.5
+        start = time.time()
+        keys = store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        self.assertEqual(keys[0]['kid'], 'kid-1')
+        self.assertLess(time.time() - start, 0.5)
+
+        self._wait_for_hits(2)
+        self.assertEqual(self.server.hits, 2)
+        self.assertEqual(get_counters('keyset.stale'), {'keyset.stale': 1})
+
+    def test_expired(self):
+        store = PlatformKeySetStore()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        store._key_sets[TEST_ISSUER].fresh_until = 0
+        store._key_sets[TEST_ISSUER].stale_until = 0
+        caches['default'].clear()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        self.assertEqual(self.server.hits, 2)
+
+    def test_unknown_kid(self):
+        store = PlatformKeySetStore()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+
+        self.server.jwks = {'keys': [public_jwk(rsa_test_key(), 'kid-2')]}
+        keys = store.get_keys(TEST_ISSUER, self.server.url, 'kid-2')
+        self.assertEqual(keys[0]['kid'], 'kid-2')
+        self.assertEqual(self.server.hits, 2)
+
+        # refetched at most once per minimum age
+        self.assertEqual(
+            store.get_keys(TEST_ISSUER, self.server.url, 'kid-3'), [])
+        self.assertEqual(self.server.hits, 2)
+
+    def test_single_flight(self):
+        store = PlatformKeySetStore()
+        self.server.delay = 0.2
+        results = []
+
+        def launch():
+            results.append(store.get_keys(
+                TEST_ISSUER, self.server.url, 'kid-1'))
+
+        threads = [threading.Thread(target=launch) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(keys[0]['kid'] == 'kid-1' for keys in results))
+        self.assertEqual(self.server.hits, 1)
+
+    def test_shared_cache(self):
+        PlatformKeySetStore().get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        keys = PlatformKeySetStore().get_keys(
+            TEST_ISSUER, self.server.url, 'kid-1')
+        self.assertEqual(keys[0]['kid'], 'kid-1')
+        self.assertEqual(self.server.hits, 1)
+
+    def test_fetch_failure(self):
+        store = PlatformKeySetStore()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        store._key_sets[TEST_ISSUER].fresh_until = 0
+        store._key_sets[TEST_ISSUER].stale_until = 0
+        caches['default'].clear()
+
+        self.server.status = 500
+        keys = store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        self.assertEqual(keys[0]['kid'], 'kid-1')
+
+        with self.assertRaises(LtiException):
+            PlatformKeySetStore().get_keys(
+                TEST_ISSUER, self.server.url, 'kid-1')
+
+    def test_fetch_failure_backoff(self):
+        store = PlatformKeySetStore()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        store._key_sets[TEST_ISSUER].fresh_until = 0
+        store._key_sets[TEST_ISSUER].stale_until = 0
+        caches['default'].clear()
+
+        self.server.status = 500
+        now = time.time()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        key_set = store._key_sets[TEST_ISSUER]
+        self.assertAlmostEqual(key_set.fresh_until, now + 60, delta=5)
+        self.assertAlmostEqual(key_set.stale_until, now + 120, delta=5)
+
+        # the failing platform isn't asked again until the backoff ends
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        self.assertEqual(self.server.hits, 2)
+
+    def test_single_refresh(self):
+        store = PlatformKeySetStore()
+        store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+        store._key_sets[TEST_ISSUER].fresh_until = 0
+
+        with mock.patch('blti.keyset.threading.Thread') as mock_thread:
+            for _ in range(5):
+                store.get_keys(TEST_ISSUER, self.server.url, 'kid-1')
+
+        self.assertEqual(mock_thread.call_count, 1)
+        self.assertEqual(get_counters('keyset.stale'), {'keyset.stale': 5})
+
+    def _message_launch(self, **kwargs):
+        message_launch = BLTIMessageLaunch(
+            RequestFactory().post('/', data=kwargs), None)
+        message_launch._registration = Registration().set_key_set_url(
+            self.server.url)
+        return message_launch.set_auto_validation(enable=False)
+
+    def test_message_launch(self):
+        get_key_set_store.cache_clear()
+        message_launch = self._message_launch().set_jwt({
+            'header': {'kid': 'kid-1', 'alg': 'RS256'},
+            'body': {'iss': TEST_ISSUER}})
+
+        public_key, alg = message_launch.get_public_key()
+        self.assertEqual(alg, 'RS256')
+        self.assertEqual(public_key.public_numbers().n, rsa_test_key().n)
+        self.assertEqual(self.server.hits, 1)
+
+        message_launch.set_jwt({
+            'header': {'kid': 'kid-1', 'alg': 'RS384'},
+            'body': {'iss': TEST_ISSUER}})
+        with self.assertRaisesRegex(LtiException, 'Unable to find'):
+            message_launch.get_public_key()
+
+    def test_message_launch_signature(self):
+        get_key_set_store.cache_clear()
+        get_public_key_cache.cache_clear()
+        reset_counters('public_key')
+        id_token = jwt.encode(
+            {'iss': TEST_ISSUER, 'sub': 'x'},
+            rsa_test_key().exportKey(format='PEM'), algorithm='RS256',
+            headers={'kid': 'kid-1'})
+
+        for _ in range(2):
+            message_launch = self._message_launch(
+                id_token=id_token).set_jwt({
+                    'header': {'kid': 'kid-1', 'alg': 'RS256'},
+                    'body': {'iss': TEST_ISSUER}})
+            message_launch.validate_jwt_signature()
+
+        self.assertEqual(get_counters('public_key'), {
+            'public_key.miss': 1, 'public_key.hit': 1})
+
+        message_launch = self._message_launch(
+            id_token=f"{id_token[:-4]}AAAA").set_jwt({
+                'header': {'kid': 'kid-1', 'alg': 'RS256'},
+                'body': {'iss': TEST_ISSUER}})
+        with self.assertRaisesRegex(LtiException, "Can't decode id_token"):
+            message_launch.validate_jwt_signature()
+
+
+class PublicKeyCacheTest(TestCase):
+    def setUp(self):
+        reset_counters('public_key')
+        self.jwk = public_jwk(rsa_test_key(), 'kid-1')
+
+    def test_get_key(self):
+        cache = PublicKeyCache()
+        key = cache.get_key(TEST_ISSUER, self.jwk, 'RS256')
+        self.assertIs(cache.get_key(TEST_ISSUER, self.jwk, 'RS256'), key)
+        self.assertEqual(get_counters('public_key'), {
+            'public_key.miss': 1, 'public_key.hit': 1})
+
+        # the same kid with different key material
+        jwk = dict(self.jwk, e='AQAB', n=public_jwk(
+            rsa_test_key(regenerate=True), 'kid-1')['n'])
+        self.assertIsNot(cache.get_key(TEST_ISSUER, jwk, 'RS256'), key)
+        self.assertEqual(get_counters('public_key')['public_key.miss'], 2)
+
+    def test_bounded(self):
+        cache = PublicKeyCache()
+        with self.settings(LTI_PUBLIC_KEY_CACHE_SIZE=2):
+            for iss in ['a', 'b', 'c']:
+                cache.get_key(iss, self.jwk, 'RS256')
+
+            cache.get_key('c', self.jwk, 'RS256')
+            cache.get_key('a', self.jwk, 'RS256')
+
+        self.assertEqual(len(cache._keys), 2)
+        self.assertEqual(get_counters('public_key'), {
+            'public_key.miss': 4, 'public_key.hit': 1})
+
+    def test_invalid_key(self):
+        with self.assertRaises(LtiException):
+            PublicKeyCache().get_key(
+                TEST_ISSUER, {'kid': 'kid-1', 'kty': 'RSA'}, 'RS256')
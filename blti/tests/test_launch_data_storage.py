@@ -0,0 +1,132 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+from pylti1p3.contrib.django import DjangoCacheDataStorage
+from pylti1p3.contrib.django.request import DjangoRequest
+from pylti1p3.exception import OIDCException
+from blti.config import get_launch_data_storage, reload_tool_conf
+from blti.launch_data_storage import SignedStateLaunchDataStorage
+from blti.tests.utils import LTIConfigDirectory, TEST_ISSUER, TEST_CLIENT_ID
+from urllib.parse import urlparse, parse_qs
+import mock
+import os
+
+
+SIGNED_STATE_STORAGE = (
+    'blti.launch_data_storage.SignedStateLaunchDataStorage')
+
+
+class SignedStateLaunchDataStorageTest(TestCase):
+    def check_nonce(self, state, nonce):
+        storage = SignedStateLaunchDataStorage()
+        storage.set_request(DjangoRequest(
+            RequestFactory().post('/', {'state': state})))
+        return storage.check_value(f"lti1p3-nonce-{nonce}")
+
+    def test_nonce(self):
+        state, nonce = SignedStateLaunchDataStorage().create_state()
+        self.assertTrue(state.startswith('state-'))
+        self.assertTrue(self.check_nonce(state, nonce))
+
+        # single use
+        self.assertFalse(self.check_nonce(state, nonce))
+
+    def test_invalid_state(self):
+        state, nonce = SignedStateLaunchDataStorage().create_state()
+        other_state, other_nonce = (
+            SignedStateLaunchDataStorage().create_state())
+        self.assertFalse(self.check_nonce(other_state, nonce))
+        self.assertFalse(self.check_nonce(f"{state[:-1]}x", nonce))
+        self.assertFalse(self.check_nonce(state[6:], nonce))
+        self.assertFalse(self.check_nonce('', nonce))
+
+        with override_settings(LTI_OIDC_STATE_MAX_AGE=-1):
+            self.assertFalse(self.check_nonce(state, nonce))
+
+    def test_no_server_side_state(self):
+        storage = SignedStateLaunchDataStorage()
+        storage.set_value('lti1p3-launch-x', {'a': 1})
+        self.assertIsNone(storage.get_value('lti1p3-launch-x'))
+        self.assertIsNone(storage.get_session_cookie_name())
+
+    def test_get_launch_data_storage(self):
+        self.assertIsInstance(
+            get_launch_data_storage(), DjangoCacheDataStorage)
+        with override_settings(LTI_LAUNCH_DATA_STORAGE=SIGNED_STATE_STORAGE):
+            self.assertIsInstance(
+                get_launch_data_storage(), SignedStateLaunchDataStorage)
+
+
+@override_settings(LTI_LAUNCH_DATA_STORAGE=SIGNED_STATE_STORAGE)
+class SignedStateLaunchTest(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = mock.patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    @mock.patch('django.core.cache.backends.locmem.LocMemCache.set')
+    def test_login(self, mock_cache_set):
+        response = self.client.get(reverse('login'), {
+            'iss': TEST_ISSUER,
+            'client_id': TEST_CLIENT_ID,
+            'login_hint': 'hint',
+            'target_link_uri': 'https://testserver/launch',
+            'lti1p3_new_window': '1',
+        }, secure=True)
+
+        self.assertEqual(response.status_code, 302)
+        params = parse_qs(urlparse(response['Location']).query)
+        state, nonce = params['state'][0], params['nonce'][0]
+        self.assertEqual(
+            SignedStateLaunchDataStorage().state_nonce(state), nonce)
+        self.assertIn(f"lti1p3-{state}", response.cookies)
+        self.assertNotIn('lti1p3-session-id', response.cookies)
+        self.assertEqual(mock_cache_set.call_count, 0)
+
+    def test_login_client_store(self):
+        response = self.client.get(reverse('login'), {
+            'iss': TEST_ISSUER,
+            'client_id': TEST_CLIENT_ID,
+            'login_hint': 'hint',
+            'target_link_uri': 'https://testserver/launch',
+            'lti1p3_new_window': '1',
+            'lti_storage_frame': '_parent',
+        }, secure=True)
+
+        self.assertContains(response, '"action": "put"')
+        self.assertContains(response, '"session_cookie_value": "None"')
+
+    @mock.patch('blti.views.launch.BLTILaunchPreValidator.validate_1p3')
+    @mock.patch('blti.views.launch.BLTILaunchView._login_origin_from_iss')
+    @mock.patch('blti.views.raw.BLTIRawView.validate_1p3')
+    def test_client_store_launch(self, mock_validate, mock_origin,
+                                 mock_prevalidate):
+        mock_origin.return_value = 'https://example.com'
+        mock_validate.side_effect = OIDCException('State not found')
+        state, nonce = SignedStateLaunchDataStorage().create_state()
+        params = {'state': state, 'id_token': 'a.b.c',
+                  'lti_storage_target': 'client_store'}
+
+        # without the state cookie, it is fetched from client storage
+        response = self.client.post(
+            reverse('lti-launch-data'), params, secure=True)
+        self.assertContains(response, '"action": "get"')
+        self.assertEqual(mock_validate.call_count, 0)
+
+        params['lti1p3_state'] = state
+        response = self.client.post(
+            reverse('lti-launch-data'), params, secure=True)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(mock_validate.call_count, 1)
+        request = mock_validate.call_args.args[0]
+        self.assertEqual(request.COOKIES[f"lti1p3-{state}"], state)
@@ -147,6 +147,33 @@ class CanvasRolesTest(TestCase):
             BLTIException, Roles(
                 CanvasData(**self.params)).authorize, role='Manager')
 
+    def test_authorize_any(self):
+        self._set_role('Learner')
+        self.launch_data = CanvasData(**self.params)
+        self.assertEqual(None, self._authorize(['Instructor', 'Learner']))
+        self.assertEqual(None, self._authorize(['Manager', 'Student']))
+        self.assertEqual(None, self._authorize(['Instructor', 'public']))
+        self.assertRaises(
+            BLTIException, self._authorize, ['Instructor', 'Designer'])
+        self.assertRaises(BLTIException, self._authorize, ['Manager'])
+
+    def test_authorize_all(self):
+        claim, roles = roles_from_role_name(['Instructor', 'ContentDeveloper'])
+        self.params[claim] = roles
+        roles = Roles(CanvasData(**self.params))
+
+        self.assertEqual(None, roles.authorize(
+            role=['Instructor', 'Designer'], match='all'))
+        self.assertEqual(None, roles.authorize(
+            role=['admin', 'member', 'public'], match='all'))
+        self.assertEqual(None, roles.authorize(role=['public'], match='all'))
+        self.assertRaises(BLTIException, roles.authorize,
+                          role=['Instructor', 'Learner'], match='all')
+        self.assertRaises(BLTIException, roles.authorize,
+                          role=['Instructor', 'Manager'], match='all')
+        self.assertRaises(ImproperlyConfigured, roles.authorize,
+                          role=['Instructor'], match='some')
+
     def _set_role(self, role):
         claim, roles = roles_from_role_name([role])
         self.params[claim] = roles
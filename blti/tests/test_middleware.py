@@ -0,0 +1,142 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import login
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.contrib.sessions.models import Session
+from django.contrib.auth import SESSION_KEY
+from django.urls import reverse
+from django.http import HttpResponse
+from blti import BLTI, LTI_DATA_KEY
+from blti.middleware import LTISessionAuthenticationMiddleware
+from blti.mock_data import Mock1p3Data
+from blti.roles import roles_from_role_name
+from blti.views.raw import BLTIRawView
+import mock
+
+
+@override_settings(AUTHENTICATION_BACKENDS=[
+    'django.contrib.auth.backends.RemoteUserBackend'])
+class LTISessionAuthenticationMiddlewareTest(TestCase):
+    def setUp(self):
+        self.launch_request = self._request()
+        BLTI().set_session(
+            self.launch_request, **Mock1p3Data().launch_data())
+        self.session = self.launch_request.session
+
+    def _request(self, session=None):
+        request = RequestFactory().get('/api')
+        if session is None:
+            SessionMiddleware(
+                get_response=mock.MagicMock()).process_request(request)
+        else:
+            request.session = session
+
+        AuthenticationMiddleware(
+            get_response=mock.MagicMock()).process_request(request)
+        return request
+
+    def _authenticate(self, request):
+        middleware = LTISessionAuthenticationMiddleware(
+            lambda request: HttpResponse())
+        with mock.patch('blti.middleware.login', wraps=login) as mocked:
+            middleware(request)
+            return mocked.call_count
+
+    def test_login_once(self):
+        request = self._request(self.session)
+        self.assertEqual(self._authenticate(request), 1)
+        self.assertEqual(request.user.get_username(), 'javerage')
+
+        # subsequent requests with the same launch skip login
+        request = self._request(self.session)
+        self.assertEqual(self._authenticate(request), 0)
+        self.assertEqual(request.user.get_username(), 'javerage')
+
+    def test_login_new_launch(self):
+        self.assertEqual(self._authenticate(self._request(self.session)), 1)
+
+        # a new launch logs in again
+        request = self._request(self.session)
+        BLTI().set_session(request, **Mock1p3Data().launch_data())
+        self.assertEqual(self._authenticate(request), 1)
+        self.assertEqual(self._authenticate(self._request(self.session)), 0)
+
+    def test_no_launch(self):
+        self.assertEqual(self._authenticate(self._request()), 0)
+
+
+@override_settings(AUTHENTICATION_BACKENDS=[
+    'django.contrib.auth.backends.RemoteUserBackend'])
+@mock.patch('blti.views.launch.BLTILaunchPreValidator.validate_1p3')
+@mock.patch('blti.views.raw.BLTIRawView.validate_1p3')
+class LaunchSessionWriteTest(TestCase):
+    def _session_writes(self, queries):
+        return [q['sql'].split()[0] for q in queries if (
+            Session._meta.db_table in q['sql'] and
+            not q['sql'].startswith('SELECT'))]
+
+    def _launch(self):
+        # the session key as the launch response is rendered
+        rendered = []
+        context_data = BLTIRawView.get_context_data
+
+        def get_context_data(view, **kwargs):
+            rendered.append(view.request.session.session_key)
+            return context_data(view, **kwargs)
+
+        with mock.patch.object(BLTIRawView, 'get_context_data',
+                               autospec=True, side_effect=get_context_data):
+            response = self.client.post(reverse('lti-launch'), {
+                'state': 'state-ac00bf57-bdd7-47c8-8b95-918f94797aef',
+                'id_token': 'a.b.c',
+            }, secure=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(rendered, [response.cookies['sessionid'].value])
+        return response
+
+    def _launch_data(self):
+        launch_data = Mock1p3Data().launch_data()
+        claim, roles = roles_from_role_name(['User', 'Instructor'])
+        launch_data[claim] = roles
+        return launch_data
+
+    def test_launch_session_writes(self, mock_validate, mock_prevalidate):
+        mock_validate.return_value = self._launch_data()
+        with CaptureQueriesContext(connection) as queries:
+            response = self._launch()
+            session_key = response.cookies['sessionid'].value
+
+            # the launch user is already logged in for the next request
+            response = self.client.get(reverse('dev-prepare'), secure=True)
+            self.assertTrue(response.wsgi_request.user.is_authenticated)
+            self.assertNotIn('sessionid', response.cookies)
+
+        # one insert by login, and one update with the final session
+        self.assertEqual(self._session_writes(queries), ['INSERT', 'UPDATE'])
+
+        session = Session.objects.get(session_key=session_key).get_decoded()
+        self.assertIn(LTI_DATA_KEY, session)
+        self.assertIn(SESSION_KEY, session)
+
+    def test_launch_session_writes_without_user(self, mock_validate,
+                                                mock_prevalidate):
+        launch_data = self._launch_data()
+        del launch_data[
+            'https://purl.imsglobal.org/spec/lti/claim/custom'][
+                'canvas_user_login_id']
+        mock_validate.return_value = launch_data
+        with CaptureQueriesContext(connection) as queries:
+            response = self._launch()
+
+        self.assertEqual(self._session_writes(queries), ['INSERT', 'UPDATE'])
+        session = Session.objects.get(
+            session_key=response.cookies['sessionid'].value).get_decoded()
+        self.assertIn(LTI_DATA_KEY, session)
+        self.assertNotIn(SESSION_KEY, session)
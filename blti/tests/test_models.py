@@ -3,9 +3,12 @@
 
 
 from django.test import TestCase
-from blti.models.canvas import CanvasData
+from blti.models.canvas import CanvasData, CompactCanvasData
+from blti.models.base import _1p3_role_mask
+from blti.roles import roles_from_role_name
 import os
 import json
+import mock
 
 
 class TestCanvasModel(TestCase):
@@ -35,3 +38,46 @@ class TestCanvasModel(TestCase):
         self.assertEqual(
             blti_data.user_sis_id, '0C8F043FA5CBE23F2B1E1A63B1BD80B8')
         self.assertEqual(blti_data.course_sis_id, '')
+
+    def test_canvas_model_lazy_roles(self):
+        jwt = self.get_launch_jwt()
+        claim, roles = roles_from_role_name(['Instructor'])
+        jwt[claim] = roles
+        blti_data = CanvasData(**jwt)
+        self.assertNotIn('role_mask', vars(blti_data))
+
+        with mock.patch('blti.models.base._1p3_role_mask',
+                        wraps=_1p3_role_mask) as role_mask:
+            self.assertTrue(blti_data.is_instructor)
+            self.assertTrue(blti_data.is_member)
+            self.assertEqual(role_mask.call_count, len(roles))
+
+        self.assertIn('role_mask', vars(blti_data))
+        self.assertFalse(blti_data.is_student)
+
+    def test_compact_canvas_model(self):
+        jwt = self.get_launch_jwt()
+        claim, roles = roles_from_role_name(['Instructor'])
+        jwt[claim] = roles
+        blti_data = CanvasData(**jwt)
+        compact_data = CompactCanvasData(jwt)
+
+        attributes = [k for k in dir(blti_data) if not k.startswith('_') and (
+            not callable(getattr(blti_data, k)))]
+        self.assertIn('course_sis_id', attributes)
+        self.assertIn('is_instructor', attributes)
+        for attribute in attributes:
+            self.assertEqual(getattr(compact_data, attribute),
+                             getattr(blti_data, attribute), attribute)
+
+        self.assertFalse(hasattr(compact_data, '__dict__'))
+        self.assertRaises(AttributeError, setattr,
+                          compact_data, 'course_sis_id', 'x')
+        with self.assertRaises(TypeError):
+            compact_data._data['iss'] = 'x'
+
+    def test_compact_canvas_model_platform(self):
+        jwt = self.get_launch_jwt()
+        jwt['https://purl.imsglobal.org/spec/lti/claim/tool_platform'][
+            'product_family_code'] = 'my_lms'
+        self.assertRaises(ValueError, CompactCanvasData, jwt)
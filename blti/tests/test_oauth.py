@@ -0,0 +1,216 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, TestCase, override_settings
+from blti.oauth import BLTIOAuthVerifier
+from blti.validators import BLTIRequestValidator
+from blti.exceptions import BLTIException
+from blti.nonce import _nonce_store
+from oauthlib.common import (
+    generate_nonce, generate_timestamp, urldecode, urlencode)
+from oauthlib.oauth1.rfc5849 import signature
+from oauthlib.oauth1.rfc5849.endpoints.signature_only import (
+    SignatureOnlyEndpoint)
+from urllib.parse import urlparse
+import time
+
+
+CONSUMER_KEY = 'XXXXXXXXXXXXXX'
+CONSUMER_SECRET = 'secret'
+LAUNCH_URI = 'https://testserver/launch'
+LAUNCH_PARAMS = [
+    ('lti_message_type', 'basic-lti-launch-request'),
+    ('lti_version', 'LTI-1p0'),
+    ('roles', 'Instructor'),
+    ('context_id', 'xxxxxxxxxxxxxxxxxxxxxxxx'),
+]
+
+
+def oauth_params(**kwargs):
+    params = {
+        'oauth_consumer_key': CONSUMER_KEY,
+        'oauth_signature_method': 'HMAC-SHA1',
+        'oauth_timestamp': generate_timestamp(),
+        'oauth_nonce': generate_nonce(),
+        'oauth_version': '1.0',
+        'oauth_callback': 'about:blank',
+    }
+    params.update(kwargs)
+    return [(k, v) for k, v in params.items() if v is not None]
+
+
+def sign(uri, params, secret=CONSUMER_SECRET, method='POST'):
+    query = urldecode(urlparse(uri).query)
+    base_string = signature.signature_base_string(
+        method, signature.base_string_uri(uri),
+        signature.normalize_parameters(query + params))
+    return signature.sign_hmac_sha1(base_string, secret, None)
+
+
+def signed_body(params=None, uri=LAUNCH_URI, secret=CONSUMER_SECRET,
+                **kwargs):
+    params = (LAUNCH_PARAMS if params is None else params) + oauth_params(
+        **kwargs)
+    return urlencode(params + [('oauth_signature', sign(
+        uri, params, secret))])
+
+
+def signed_query_uri(uri=LAUNCH_URI, method='POST', **kwargs):
+    params = oauth_params(**kwargs)
+    params.append(('oauth_signature', sign(
+        f"{uri}?{urlencode(params)}", [], method=method)))
+    return f"{uri}?{urlencode(params)}"
+
+
+def launch_cases():
+    old = str(int(time.time()) - 120)
+    stale = str(int(time.time()) - 1200)
+    body = signed_body()
+
+    return [
+        ('launch', LAUNCH_URI, 'POST', signed_body(), True),
+        ('query parameters', f"{LAUNCH_URI}?a=1&b=two+words",
+         'POST', signed_body(uri=f"{LAUNCH_URI}?a=1&b=two+words"), True),
+        ('encoded values', LAUNCH_URI, 'POST', signed_body(
+            LAUNCH_PARAMS + [('name', 'Zoë O\'Brien & co ~ 100%'),
+                             ('empty', '')]), True),
+        ('repeated parameters', LAUNCH_URI, 'POST', signed_body(
+            LAUNCH_PARAMS + [('ext', '2'), ('ext', '1')]), True),
+        ('prefixed names', LAUNCH_URI, 'POST', signed_body(
+            LAUNCH_PARAMS + [('ext1', 'c'), ('ext', 'a'), ('ext-b', 'b'),
+                             ('ext%', 'd'), ('ext.', 'e')]), True),
+        ('port', 'https://testserver:8443/launch', 'POST', signed_body(
+            uri='https://testserver:8443/launch'), True),
+        ('default port', 'https://testserver:443/launch', 'POST',
+         signed_body(uri='https://testserver/launch'), True),
+        ('host case', 'https://TestServer/launch', 'POST',
+         signed_body(), True),
+        ('realm', LAUNCH_URI, 'POST', signed_body(
+            LAUNCH_PARAMS + [('realm', 'lti')]), True),
+        ('oauth in query, unsigned body', signed_query_uri(), 'POST',
+         urlencode(LAUNCH_PARAMS), False),
+        ('oauth in query get', signed_query_uri(method='GET'), 'GET',
+         '', True),
+        ('tampered', LAUNCH_URI, 'POST', body.replace(
+            'Instructor', 'Administrator'), False),
+        ('wrong secret', LAUNCH_URI, 'POST', signed_body(
+            secret='wrong'), False),
+        ('wrong path', 'https://testserver/other', 'POST',
+         signed_body(), False),
+        ('unknown consumer', LAUNCH_URI, 'POST', signed_body(
+            oauth_consumer_key='YYYYYYYYYYYYYY'), False),
+        ('short consumer key', LAUNCH_URI, 'POST', signed_body(
+            oauth_consumer_key='XXX'), False),
+        ('nonce characters', LAUNCH_URI, 'POST', signed_body(
+            oauth_nonce='*' * 20), False),
+        ('short nonce', LAUNCH_URI, 'POST', signed_body(
+            oauth_nonce='x' * 10), False),
+        ('old timestamp', LAUNCH_URI, 'POST', signed_body(
+            oauth_timestamp=old), False),
+        ('stale timestamp', LAUNCH_URI, 'POST', signed_body(
+            oauth_timestamp=stale), False),
+        ('short timestamp', LAUNCH_URI, 'POST', signed_body(
+            oauth_timestamp='123456789'), False),
+        ('timestamp characters', LAUNCH_URI, 'POST', signed_body(
+            oauth_timestamp='abcdefghij'), False),
+        ('signature method', LAUNCH_URI, 'POST', signed_body(
+            oauth_signature_method='HMAC-SHA256'), False),
+        ('version', LAUNCH_URI, 'POST', signed_body(
+            oauth_version='1.1'), False),
+        ('no version', LAUNCH_URI, 'POST', signed_body(
+            oauth_version=None), True),
+        ('missing nonce', LAUNCH_URI, 'POST', signed_body(
+            oauth_nonce=None), False),
+        ('missing signature', LAUNCH_URI, 'POST', urlencode(
+            LAUNCH_PARAMS + oauth_params()), False),
+        ('duplicate oauth parameter', LAUNCH_URI, 'POST',
+         f"{body}&oauth_callback=about%3Ablank", False),
+        ('oauth in body and query', f"{LAUNCH_URI}?oauth_callback=x",
+         'POST', signed_body(uri=f"{LAUNCH_URI}?oauth_callback=x"), False),
+        ('insecure', 'http://testserver/launch', 'POST', signed_body(
+            uri='http://testserver/launch'), False),
+        ('oauth token', LAUNCH_URI, 'POST', signed_body(
+            oauth_token='token'), False),
+        ('body characters', LAUNCH_URI, 'POST', f"{body}&x=<a>", False),
+        ('body hex', LAUNCH_URI, 'POST', f"{body}&x=%zz", False),
+        ('body encoding', LAUNCH_URI, 'POST', body.encode(
+            'utf-8') + b'&x=\xff', False),
+        ('empty', LAUNCH_URI, 'POST', '', False),
+    ]
+
+
+def oauthlib_verify(uri, method, body):
+    # the launch verification BLTIOAuthVerifier replaces
+    endpoint = SignatureOnlyEndpoint(BLTIRequestValidator())
+    try:
+        valid, request = endpoint.validate_request(
+            uri, method, body,
+            {'Content-Type': 'application/x-www-form-urlencoded'})
+    except Exception:
+        return None
+
+    return dict(request.params) if valid else None
+
+
+def blti_verify(uri, method, body):
+    try:
+        return BLTIOAuthVerifier().verify_signed_request(uri, method, body)
+    except (BLTIException, ValueError):
+        return None
+
+
+@override_settings(LTI_CONSUMERS={CONSUMER_KEY: CONSUMER_SECRET})
+class BLTIOAuthVerifierTest(TestCase):
+    def _compare(self, cases):
+        for label, uri, method, body, accepted in cases:
+            with self.subTest(label):
+                _nonce_store.cache_clear()
+                expected = oauthlib_verify(uri, method, body)
+                _nonce_store.cache_clear()
+                result = blti_verify(uri, method, body)
+
+                self.assertEqual(expected is not None, accepted)
+                self.assertEqual(result, expected)
+
+    def test_differential(self):
+        self._compare(launch_cases())
+
+    @override_settings(LTI_ENFORCE_SSL=False)
+    def test_differential_insecure(self):
+        self._compare([
+            ('insecure', 'http://testserver/launch', 'POST', signed_body(
+                uri='http://testserver/launch'), True),
+            ('scheme', 'http://testserver/launch', 'POST',
+             signed_body(), False),
+        ])
+
+    def test_replay(self):
+        body = signed_body()
+        self.assertIsNotNone(blti_verify(LAUNCH_URI, 'POST', body))
+        self.assertIsNone(blti_verify(LAUNCH_URI, 'POST', body))
+
+    def test_verify(self):
+        request = RequestFactory().post(
+            '/launch', data=signed_body(), secure=True,
+            content_type='application/x-www-form-urlencoded')
+        params = BLTIOAuthVerifier().verify(request)
+        self.assertEqual(params['roles'], 'Instructor')
+        self.assertNotIn('oauth_signature', params)
+
+        with self.assertRaisesRegex(BLTIException, 'Invalid OAuth Request'):
+            BLTIOAuthVerifier().verify(request)
+
+    def test_proxy_scheme(self):
+        request = RequestFactory().post(
+            '/launch', data=signed_body(),
+            content_type='application/x-www-form-urlencoded',
+            HTTP_X_FORWARDED_PROTO='https')
+        verifier = BLTIOAuthVerifier()
+        self.assertEqual(verifier.launch_uri(request),
+                         'http://testserver/launch')
+
+        with self.settings(LTI_PROXY_SCHEME_HEADER='HTTP_X_FORWARDED_PROTO'):
+            self.assertEqual(verifier.launch_uri(request), LAUNCH_URI)
+            self.assertEqual(
+                verifier.verify(request)['roles'], 'Instructor')
@@ -0,0 +1,151 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import patch
+from blti.config import reload_tool_conf
+from blti.id_token import IdToken
+from blti.metrics import get_counters, reset_counters
+from blti.prevalidation import (
+    BLTILaunchPreValidator, BLTILaunchRejected, UNAUTHORIZED_CONTENT)
+from blti.tests.utils import (
+    LTIConfigDirectory, TEST_ISSUER, TEST_CLIENT_ID, rsa_test_key)
+from oauthlib.common import generate_nonce, generate_timestamp
+import jwt
+import os
+
+
+CONSUMER_KEY = 'XXXXXXXXXXXXXX'
+
+
+def oauth_params(**kwargs):
+    params = {
+        'oauth_consumer_key': CONSUMER_KEY,
+        'oauth_signature_method': 'HMAC-SHA1',
+        'oauth_timestamp': generate_timestamp(),
+        'oauth_nonce': generate_nonce(),
+        'oauth_version': '1.0',
+        'oauth_signature': 'XXXXXXXXXXXXXXXXXXXXXXXXXXX=',
+        'lti_message_type': 'basic-lti-launch-request',
+    }
+    params.update(kwargs)
+    return {k: v for k, v in params.items() if v is not None}
+
+
+def id_token(headers=None, algorithm='RS256', **kwargs):
+    payload = {'iss': TEST_ISSUER, 'aud': TEST_CLIENT_ID}
+    payload.update(kwargs)
+    payload = {k: v for k, v in payload.items() if v is not None}
+    key = rsa_test_key().exportKey(format='PEM') if (
+        algorithm.startswith('RS')) else 'secret'
+    return jwt.encode(payload, key, algorithm=algorithm,
+                      headers={'kid': 'kid-1'} if headers is None else headers)
+
+
+@override_settings(LTI_CONSUMERS={CONSUMER_KEY: 'secret'})
+class BLTILaunchPreValidatorTest(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+        reset_counters('launch')
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    def assertRejected(self, reason, func, *args):
+        with self.assertRaises(BLTILaunchRejected) as cm:
+            func(*args)
+        self.assertEqual(cm.exception.reason, reason)
+
+    def test_validate_size(self):
+        validator = BLTILaunchPreValidator()
+        validator.validate_size(RequestFactory().post('/', {'a': 'b'}))
+        self.assertRejected('size', validator.validate_size,
+                            RequestFactory().post('/', {'a': 'b' * 200000}))
+
+    def test_validate_1p1(self):
+        factory = RequestFactory()
+        validate = BLTILaunchPreValidator().validate_1p1
+        validate(factory.post('/', oauth_params()))
+        validate(factory.post('/', oauth_params(oauth_version=None)))
+        validate(factory.post(
+            '/?oauth_nonce=' + generate_nonce(),
+            oauth_params(oauth_nonce=None)))
+
+        for params in [
+                oauth_params(oauth_signature=None),
+                oauth_params(oauth_signature_method='HMAC-SHA256'),
+                oauth_params(oauth_version='2.0'),
+                oauth_params(oauth_consumer_key='XXX'),
+                oauth_params(oauth_consumer_key='X' * 12 + '*'),
+                oauth_params(oauth_nonce='x' * 10),
+                oauth_params(oauth_nonce=None),
+                oauth_params(oauth_timestamp='123456789'),
+                oauth_params(oauth_timestamp='12345678901')]:
+            self.assertRejected('oauth', validate, factory.post('/', params))
+
+        self.assertRejected('consumer', validate, factory.post(
+            '/', oauth_params(oauth_consumer_key='YYYYYYYYYYYYYY')))
+
+    def test_validate_1p3(self):
+        request = RequestFactory().post('/')
+        validate = BLTILaunchPreValidator().validate_1p3
+        validate(request, IdToken(id_token()))
+        validate(request, IdToken(id_token(aud=[TEST_CLIENT_ID])))
+
+        for reason, token in [
+                ('id_token', None),
+                ('jwt', 'a.b.c'),
+                ('jwt', 'garbage'),
+                ('alg', id_token(algorithm='HS256')),
+                ('kid', id_token(headers={})),
+                ('kid', id_token(headers={'kid': 'k' * 300})),
+                ('iss', id_token(iss='https://unknown.example.edu')),
+                ('iss', id_token(iss=None)),
+                ('client_id', id_token(aud='20000000000002')),
+                ('client_id', id_token(aud={'a': 'b'}))]:
+            self.assertRejected(reason, validate, request, IdToken(token))
+
+        with self.settings(LTI_ID_TOKEN_MAX_SIZE=100):
+            self.assertRejected(
+                'size', validate, request, IdToken(id_token()))
+
+    @patch('blti.views.raw.BLTIRawView.validate_1p3')
+    def test_rejected_launch(self, mocked_1p3):
+        response = self.client.post(reverse('lti-launch'), {
+            'state': 'state-ac00bf57-bdd7-47c8-8b95-918f94797aef',
+            'id_token': id_token(algorithm='HS256'),
+        }, secure=True)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.content, UNAUTHORIZED_CONTENT)
+        self.assertEqual(mocked_1p3.call_count, 0)
+        self.assertEqual(get_counters('launch'), {
+            'launch.rejected.alg': 1})
+
+    @patch('blti.views.raw.BLTIRawView.validate_1p3')
+    def test_prevalidated_launch(self, mocked_1p3):
+        mocked_1p3.side_effect = Exception('State not found')
+        response = self.client.post(reverse('lti-launch'), {
+            'state': 'state-ac00bf57-bdd7-47c8-8b95-918f94797aef',
+            'id_token': id_token(),
+        }, secure=True)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(mocked_1p3.call_count, 1)
+        self.assertEqual(get_counters('launch'), {
+            'launch.protocol.lti1p3': 1})
+
+    @override_settings(LTI_DEVELOP_APP=False)
+    def test_unknown_protocol(self):
+        response = self.client.post(reverse('lti-launch'), secure=True)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(get_counters('launch'), {
+            'launch.rejected.protocol': 1})
@@ -0,0 +1,83 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from blti import BLTI, LTI_DATA_KEY
+from blti.exceptions import BLTIException
+from blti.mock_data import Mock1p3Data
+from blti.serializers import (
+    JSONLaunchDataSerializer, CompactLaunchDataSerializer,
+    CompressedLaunchDataSerializer, loads_launch_data)
+import json
+import mock
+
+
+class LaunchDataSerializerTest(TestCase):
+    def setUp(self):
+        self.data = Mock1p3Data().launch_data()
+        self.data['~custom'] = 'tilde'
+
+    def test_json(self):
+        serialized = JSONLaunchDataSerializer().dumps(self.data)
+        self.assertEqual(json.loads(serialized), self.data)
+        self.assertEqual(loads_launch_data(serialized), self.data)
+
+    def test_compact(self):
+        serialized = CompactLaunchDataSerializer().dumps(self.data)
+        self.assertTrue(serialized.startswith('blti:1:j:'))
+        self.assertNotIn('purl.imsglobal.org/spec/lti/claim', serialized)
+        self.assertLess(len(serialized), len(json.dumps(self.data)))
+        self.assertEqual(
+            CompactLaunchDataSerializer().loads(serialized), self.data)
+        self.assertEqual(loads_launch_data(serialized), self.data)
+
+    def test_compressed(self):
+        serialized = CompressedLaunchDataSerializer().dumps(self.data)
+        self.assertTrue(serialized.startswith('blti:1:z:'))
+        self.assertLess(len(serialized), len(
+            CompactLaunchDataSerializer().dumps(self.data)))
+        self.assertEqual(loads_launch_data(serialized), self.data)
+
+        # small payloads aren't worth compressing
+        self.assertTrue(CompressedLaunchDataSerializer().dumps(
+            {'roles': 'Learner'}).startswith('blti:1:j:'))
+
+    def test_invalid(self):
+        serializer = CompactLaunchDataSerializer()
+        self.assertRaises(BLTIException, serializer.loads, 'blti:2:j:{}')
+        self.assertRaises(BLTIException, serializer.loads, 'blti:1:x:{}')
+        self.assertRaises(BLTIException, serializer.loads, 'blti:1:z:{}')
+        self.assertRaises(
+            BLTIException, serializer.loads, 'blti:1:j:{"~q/x":1}')
+        self.assertRaises(BLTIException, serializer.loads, 'blti:1')
+
+
+class LaunchDataSessionTest(TestCase):
+    def setUp(self):
+        self.data = Mock1p3Data().launch_data()
+        self.request = RequestFactory().post('/test')
+        SessionMiddleware(get_response=mock.MagicMock()).process_request(
+            self.request)
+
+    def _session_request(self):
+        request = RequestFactory().get('/test')
+        request.session = self.request.session
+        return request
+
+    @override_settings(
+        LTI_DATA_SERIALIZER='blti.serializers.CompressedLaunchDataSerializer')
+    def test_session(self):
+        BLTI().set_session(self.request, **self.data)
+        self.assertTrue(
+            self.request.session[LTI_DATA_KEY].startswith('blti:1:z:'))
+        self.assertEqual(
+            BLTI().get_session(self._session_request()), self.data)
+
+    @override_settings(
+        LTI_DATA_SERIALIZER='blti.serializers.CompactLaunchDataSerializer')
+    def test_legacy_session(self):
+        self.request.session[LTI_DATA_KEY] = json.dumps(self.data)
+        self.assertEqual(
+            BLTI().get_session(self._session_request()), self.data)
@@ -0,0 +1,264 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from django.test import TestCase, override_settings
+from django.core.cache import caches
+from django.core.management import call_command
+from pylti1p3.tool_config import ToolConfDict
+from blti.config import (
+    get_tool_conf, get_registration_index, reload_tool_conf,
+    TOOL_CONF_GENERATION_KEY)
+from blti.models import LTIKeyPair, LTIRegistration, LTIDeployment
+from blti.tool_config import IndexedToolConf, merge_tool_conf
+from blti.tests.utils import (
+    LTIConfigDirectory, tool_conf_json, TEST_ISSUER, TEST_CLIENT_ID,
+    TEST_DEPLOYMENT_ID, rsa_test_key)
+from io import StringIO
+import mock
+import json
+import os
+
+
+PARTNER_ISSUER = 'https://canvas.partner.edu'
+
+
+def registration(client_id, default=False, deployment_ids=None):
+    conf = tool_conf_json(client_id=client_id, deployment_ids=deployment_ids)
+    conf = conf[TEST_ISSUER][0]
+    conf['default'] = default
+    return conf
+
+
+def partner_tool_conf():
+    return {
+        TEST_ISSUER: [
+            registration('10000000000001', deployment_ids=['1:a', '1:b']),
+            registration('10000000000002', default=True,
+                         deployment_ids=['2:a']),
+            registration('10000000000003', deployment_ids=['3:a'])],
+        PARTNER_ISSUER: dict(registration('30000000000001'),
+                             deployment_ids=['p:a']),
+    }
+
+
+def tool_confs(tool_conf):
+    # the library's dict implementation and the indexed one, keys set alike
+    dict_conf = ToolConfDict(tool_conf)
+    dict_conf.issuers_relation_types = dict(
+        IndexedToolConf(tool_conf).issuers_relation_types)
+    for iss, iss_conf in tool_conf.items():
+        for conf in (iss_conf if isinstance(iss_conf, list) else [iss_conf]):
+            client_id = conf['client_id'] if isinstance(
+                iss_conf, list) else None
+            dict_conf.set_private_key(iss, 'private', client_id=client_id)
+
+    indexed = {iss: [dict(c, private_key='private') for c in iss_conf] if (
+        isinstance(iss_conf, list)) else dict(iss_conf, private_key='private')
+        for iss, iss_conf in tool_conf.items()}
+    return dict_conf, IndexedToolConf(indexed)
+
+
+class IndexedToolConfTest(TestCase):
+    def lookup(self, func, *args):
+        try:
+            reg = func(*args)
+        except Exception as ex:
+            return str(ex)
+
+        return reg.get_client_id() if (
+            hasattr(reg, 'get_client_id')) else reg and reg.get_deployment_id()
+
+    def test_matches_tool_conf_dict(self):
+        dict_conf, indexed = tool_confs(partner_tool_conf())
+        for iss in [TEST_ISSUER, PARTNER_ISSUER, 'https://unknown.edu']:
+            self.assertEqual(
+                self.lookup(indexed.find_registration_by_issuer, iss),
+                self.lookup(dict_conf.find_registration_by_issuer, iss))
+            self.assertEqual(indexed.check_iss_has_one_client(iss),
+                             dict_conf.check_iss_has_one_client(iss))
+
+            for client_id in [None, '10000000000001', '10000000000003',
+                              '30000000000001', '99999999999999']:
+                self.assertEqual(
+                    self.lookup(indexed.find_registration_by_params,
+                                iss, client_id),
+                    self.lookup(dict_conf.find_registration_by_params,
+                                iss, client_id))
+
+                for deployment_id in ['1:a', '1:b', '2:a', 'p:a', 'x']:
+                    self.assertEqual(
+                        self.lookup(indexed.find_deployment_by_params,
+                                    iss, deployment_id, client_id),
+                        self.lookup(dict_conf.find_deployment_by_params,
+                                    iss, deployment_id, client_id))
+                    self.assertEqual(
+                        self.lookup(indexed.find_deployment,
+                                    iss, deployment_id),
+                        self.lookup(dict_conf.find_deployment,
+                                    iss, deployment_id))
+
+    def test_registration(self):
+        _, indexed = tool_confs(partner_tool_conf())
+        reg = indexed.find_registration_by_params(
+            TEST_ISSUER, '10000000000003')
+        self.assertEqual(reg.get_issuer(), TEST_ISSUER)
+        self.assertEqual(reg.get_auth_login_url(),
+                         f"{TEST_ISSUER}/api/lti/authorize_redirect")
+        self.assertIs(indexed.find_registration_by_params(
+            TEST_ISSUER, '10000000000003'), reg)
+        self.assertEqual(indexed.get_client_ids(), {
+            TEST_ISSUER: frozenset([
+                '10000000000001', '10000000000002', '10000000000003']),
+            PARTNER_ISSUER: frozenset(['30000000000001'])})
+
+    def test_no_default(self):
+        _, indexed = tool_confs({TEST_ISSUER: [
+            registration('10000000000001'), registration('10000000000002')]})
+        self.assertRaisesRegex(
+            Exception, 'client_id=None', indexed.find_registration_by_issuer,
+            TEST_ISSUER)
+
+    def test_relation_types(self):
+        tool_confs({PARTNER_ISSUER: [registration('30000000000001')]})
+        _, indexed = tool_confs(partner_tool_conf())
+        self.assertTrue(indexed.check_iss_has_one_client(PARTNER_ISSUER))
+
+    def test_merge_tool_conf(self):
+        merged = merge_tool_conf([
+            {TEST_ISSUER: [registration('1', default=True)]},
+            {TEST_ISSUER: registration('2'), PARTNER_ISSUER: [
+                registration('3')]},
+            {TEST_ISSUER: [registration('1', deployment_ids=['x']),
+                           registration('4')]},
+        ])
+        self.assertEqual([c['client_id'] for c in merged[TEST_ISSUER]],
+                         ['1', '2', '4'])
+        self.assertEqual(merged[TEST_ISSUER][0]['deployment_ids'],
+                         [TEST_DEPLOYMENT_ID])
+        self.assertEqual(len(merged[PARTNER_ISSUER]), 1)
+
+
+class JSONFileToolConfSourceTest(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = mock.patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    @override_settings(LTI_TOOL_CONF_FILES=['tool.json', 'partners.json'])
+    def test_multiple_files(self):
+        os.mkdir(os.path.join(self.config_dir.path, 'partner'))
+        self.config_dir.write_keys(
+            private_key_file='partner/private.key',
+            public_key_file='partner/public.key', regenerate=True)
+        partners = tool_conf_json(issuer=PARTNER_ISSUER,
+                                  client_id='30000000000001')
+        partners[PARTNER_ISSUER][0].update({
+            'private_key_file': 'partner/private.key',
+            'public_key_file': 'partner/public.key'})
+        partners[TEST_ISSUER] = [registration('10000000000002')]
+        self.config_dir.write('partners.json', json.dumps(partners))
+        reload_tool_conf()
+
+        self.assertEqual(get_registration_index(), {
+            TEST_ISSUER: frozenset([TEST_CLIENT_ID, '10000000000002']),
+            PARTNER_ISSUER: frozenset(['30000000000001'])})
+
+        tool_conf = get_tool_conf()
+        self.assertEqual(tool_conf.find_registration_by_params(
+            PARTNER_ISSUER, '30000000000001').get_tool_public_key(),
+            self.config_dir.public_key)
+        self.assertIsNotNone(tool_conf.find_deployment_by_params(
+            TEST_ISSUER, TEST_DEPLOYMENT_ID, '10000000000002'))
+        self.assertEqual(len(tool_conf.get_jwks()['keys']), 2)
+
+        # a change to any of the files reloads
+        self.config_dir.write_keys(
+            private_key_file='partner/private.key',
+            public_key_file='partner/public.key', regenerate=True)
+        self.assertIsNot(get_tool_conf(), tool_conf)
+        self.assertEqual(get_tool_conf().find_registration_by_params(
+            PARTNER_ISSUER, '30000000000001').get_tool_public_key(),
+            self.config_dir.public_key)
+
+
+@override_settings(LTI_TOOL_CONF_SOURCES=['blti.config.ModelToolConfSource'])
+class ModelToolConfSourceTest(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory(tool_conf_json(
+            deployment_ids=[TEST_DEPLOYMENT_ID, '1:b']))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_tool_conf', os.path.join(
+                self.config_dir.path, 'tool.json'), stdout=StringIO())
+
+        reload_tool_conf()
+
+    def tearDown(self):
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    def test_import_tool_conf(self):
+        registration = LTIRegistration.objects.get(
+            issuer=TEST_ISSUER, client_id=TEST_CLIENT_ID)
+        self.assertTrue(registration.is_default)
+        self.assertEqual(registration.key_pair.public_key,
+                         self.config_dir.public_key)
+        self.assertEqual(sorted(registration.deployments.values_list(
+            'deployment_id', flat=True)), ['1:a1b2c3d4e5f6', '1:b'])
+
+        # importing again updates in place
+        call_command('import_tool_conf', os.path.join(
+            self.config_dir.path, 'tool.json'), stdout=StringIO())
+        self.assertEqual(LTIRegistration.objects.count(), 1)
+        self.assertEqual(LTIDeployment.objects.count(), 2)
+        self.assertEqual(LTIKeyPair.objects.count(), 1)
+
+    def test_tool_conf(self):
+        tool_conf = get_tool_conf()
+        reg = tool_conf.find_registration_by_params(
+            TEST_ISSUER, TEST_CLIENT_ID)
+        self.assertEqual(reg.get_tool_private_key().private_numbers(
+            ).public_numbers.n, rsa_test_key().n)
+        self.assertEqual(reg.get_tool_public_key(),
+                         self.config_dir.public_key)
+        self.assertIsNotNone(tool_conf.find_deployment_by_params(
+            TEST_ISSUER, '1:b', TEST_CLIENT_ID))
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_tool_conf(), tool_conf)
+
+    def test_reload_on_change(self):
+        tool_conf = get_tool_conf()
+        with self.captureOnCommitCallbacks(execute=True):
+            LTIDeployment.objects.create(
+                registration=LTIRegistration.objects.get(),
+                deployment_id='1:c')
+
+        reloaded = get_tool_conf()
+        self.assertIsNot(reloaded, tool_conf)
+        self.assertIsNotNone(reloaded.find_deployment_by_params(
+            TEST_ISSUER, '1:c', TEST_CLIENT_ID))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LTIRegistration.objects.update(is_active=False)
+            LTIDeployment.objects.get(deployment_id='1:c').delete()
+
+        self.assertEqual(get_registration_index(), {})
+
+    @override_settings(LTI_TOOL_CONF_CHECK_INTERVAL=0)
+    def test_reload_on_generation(self):
+        # another process bumps the shared generation
+        tool_conf = get_tool_conf()
+        caches['default'].incr(TOOL_CONF_GENERATION_KEY)
+        self.assertIsNot(get_tool_conf(), tool_conf)
+
+        caches['default'].delete(TOOL_CONF_GENERATION_KEY)
+        tool_conf = get_tool_conf()
+        self.assertIs(get_tool_conf(), tool_conf)
@@ -3,10 +3,25 @@
 
 
 from django.conf import settings
-from django.test import TestCase, Client
+from django.test import TestCase, Client, RequestFactory, override_settings
 from django.urls import reverse
 from unittest.mock import patch
+from blti.config import get_tool_conf, reload_tool_conf
 from blti.views.launch import BLTILaunchView
+from blti.metrics import (
+    get_counters, reset_counters, get_histograms, reset_histograms,
+    Histogram)
+from blti.client_store import (
+    get_client_store_script_url, get_client_store_timeout,
+    client_store_beacon_token)
+from pylti1p3.exception import OIDCException
+from blti.cookie import COOKIES_ALLOWED_COOKIE_NAME
+from blti.tests.utils import (
+    LTIConfigDirectory, TEST_ISSUER, TEST_CLIENT_ID)
+import hashlib
+import json
+import os
+import re
 
 
 class TestLaunchViews(TestCase):
@@ -24,8 +39,9 @@ class TestLaunchViews(TestCase):
         response = self.client.post(reverse('lti-launch'), secure=True)
         self.assertEqual(response.status_code, 200)
 
+    @patch('blti.views.launch.BLTILaunchPreValidator.validate_1p3')
     @patch('blti.views.launch.BLTILaunchView._login_origin_from_iss')
-    def test_client_store_redirect(self, mocked):
+    def test_client_store_redirect(self, mocked, mocked_prevalidate):
         mocked.return_value = 'https://example.com'
         response = self.client.post(reverse('lti-launch-data'), {
             'state': 'state-ac00bf57-bdd7-47c8-8b95-918f94797aef',
@@ -36,6 +52,302 @@ class TestLaunchViews(TestCase):
         }, secure=True)
 
         self.assertEqual(response.status_code, 200)
-        self.assertContains(response, 'getClientData')
-        self.assertContains(response, 'ltiClientStoreResponse')
-        self.assertContains(response, 'doRedirection')
+        self.assertContains(response, get_client_store_script_url())
+        self.assertContains(response, '"action": "get"')
+        self.assertContains(response, '"origin": "https://example.com"')
+        self.assertContains(response, '"beacon_token": ')
+
+        # the page runs only the script carrying its nonce
+        nonce = re.search(r'nonce="([^"]+)"', response.content.decode())[1]
+        self.assertIn(f"script-src 'nonce-{nonce}'",
+                      response['Content-Security-Policy'])
+        self.assertEqual(response['Cache-Control'], 'no-store')
+
+    def test_client_store_script(self):
+        url = get_client_store_script_url()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/javascript')
+        self.assertEqual(response['Cache-Control'],
+                         'public, max-age=31536000, immutable')
+        self.assertIn(b'lti.capabilities', response.content)
+
+        response = self.client.get(reverse(
+            'client-store-script', kwargs={'version': '0123abcd'}))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    @patch('blti.views.launch.BLTILaunchPreValidator.validate_1p3')
+    @patch('blti.views.raw.BLTIRawView.validate_1p3')
+    @patch('blti.views.raw.BLTIRawView.validate_1p1')
+    def test_launch_protocol_1p3(self, mocked_1p1, mocked_1p3,
+                                 mocked_prevalidate):
+        reset_counters('launch.protocol')
+        mocked_1p3.side_effect = OIDCException('State not found')
+        response = self.client.post(reverse('lti-launch'), {
+            'state': 'state-ac00bf57-bdd7-47c8-8b95-918f94797aef',
+            'id_token': 'a.b.c',
+        }, secure=True)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(mocked_1p1.call_count, 0)
+        self.assertEqual(mocked_1p3.call_count, 1)
+        self.assertEqual(
+            get_counters('launch.protocol'), {'launch.protocol.lti1p3': 1})
+
+    @patch('blti.views.launch.BLTILaunchPreValidator.validate_1p1')
+    @patch('blti.views.raw.BLTIRawView.validate_1p3')
+    def test_launch_protocol_1p1(self, mocked_1p3, mocked_prevalidate):
+        reset_counters('launch.protocol')
+        response = self.client.post(reverse('lti-launch'), {
+            'oauth_signature': 'XXXXXXXXXXXXXXXXXXXXXXXXXXX=',
+            'lti_message_type': 'basic-lti-launch-request',
+        }, secure=True)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(mocked_1p3.call_count, 0)
+        self.assertEqual(
+            get_counters('launch.protocol'), {'launch.protocol.lti1p1': 1})
+
+    def test_launch_protocol(self):
+        factory = RequestFactory()
+        view = BLTILaunchView()
+        self.assertEqual(view.launch_protocol(factory.post(
+            '/', {'id_token': 'x', 'state': 'y'})), 'lti1p3')
+        self.assertEqual(view.launch_protocol(factory.get(
+            '/', {'state': 'y'})), 'lti1p3')
+        self.assertEqual(view.launch_protocol(factory.post(
+            '/', {'oauth_signature': 'x'})), 'lti1p1')
+        self.assertEqual(view.launch_protocol(factory.post(
+            '/', {'lti_message_type': 'basic-lti-launch-request'})), 'lti1p1')
+        self.assertIsNone(view.launch_protocol(factory.post('/', {})))
+
+
+class TestJWKSView(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    def test_jwks(self):
+        response = self.client.get(reverse('jwks'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+        self.assertEqual(response['ETag'], '"{}"'.format(
+            hashlib.sha256(response.content).hexdigest()))
+
+        keys = response.json()['keys']
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(keys[0]['alg'], 'RS256')
+        self.assertEqual(keys[0]['use'], 'sig')
+
+    @override_settings(LTI_JWKS_MAX_AGE=60)
+    def test_jwks_max_age(self):
+        response = self.client.get(reverse('jwks'))
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    def test_jwks_not_modified(self):
+        etag = self.client.get(reverse('jwks'))['ETag']
+
+        response = self.client.get(
+            reverse('jwks'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+        response = self.client.get(
+            reverse('jwks'), HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            reverse('jwks'), HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_jwks_built_once(self):
+        with patch('blti.views.jwks.get_tool_conf',
+                   wraps=get_tool_conf) as mocked:
+            etag = self.client.get(reverse('jwks'))['ETag']
+            self.assertEqual(self.client.get(reverse('jwks'))['ETag'], etag)
+            self.assertEqual(mocked.call_count, 1)
+
+        self.config_dir.write_keys(regenerate=True)
+        self.assertNotEqual(self.client.get(reverse('jwks'))['ETag'], etag)
+
+
+class TestLoginCookieCheck(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+        reset_counters('login.cookie_check')
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+
+    def login(self, **kwargs):
+        params = {
+            'iss': TEST_ISSUER,
+            'client_id': TEST_CLIENT_ID,
+            'login_hint': 'hint',
+            'target_link_uri': 'https://testserver/launch',
+        }
+        params.update(kwargs)
+        return self.client.get(reverse('login'), params, secure=True)
+
+    def test_cookie_check_remembered(self):
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(COOKIES_ALLOWED_COOKIE_NAME, response.cookies)
+
+        # the check passed and reloaded the login
+        response = self.login(lti1p3_new_window='1')
+        self.assertEqual(response.status_code, 302)
+        cookie = response.cookies[COOKIES_ALLOWED_COOKIE_NAME]
+        self.assertIn('Partitioned', cookie.output())
+        self.assertEqual(cookie['samesite'], 'None')
+
+        response = self.login()
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(get_counters('login.cookie_check'), {
+            'login.cookie_check.performed': 1,
+            'login.cookie_check.skipped': 1})
+
+    def test_cookie_check_not_remembered(self):
+        # cookies withheld, so the state goes to client side storage
+        response = self.login(lti1p3_new_window='1',
+                              lti_storage_frame='_parent')
+        self.assertNotIn(COOKIES_ALLOWED_COOKIE_NAME, response.cookies)
+
+        self.client.cookies[COOKIES_ALLOWED_COOKIE_NAME] = '1'
+        self.assertEqual(self.login().status_code, 200)
+
+
+class TestClientStoreBeacon(TestCase):
+    def setUp(self):
+        self.config_dir = LTIConfigDirectory()
+        self.environ = patch.dict(
+            os.environ, {'LTI_CONFIG_DIRECTORY': self.config_dir.path})
+        self.environ.start()
+        reload_tool_conf()
+        reset_counters('client_store')
+        reset_histograms('client_store')
+
+    def tearDown(self):
+        self.environ.stop()
+        self.config_dir.cleanup()
+        reload_tool_conf()
+        reset_counters('client_store')
+        reset_histograms('client_store')
+
+    def beacon(self, action, origin=TEST_ISSUER, **report):
+        report.setdefault(
+            'beacon_token', client_store_beacon_token(action, origin))
+        return self.client.post(
+            reverse('client-store-beacon'), json.dumps(report),
+            content_type='text/plain')
+
+    def test_beacon(self):
+        response = self.beacon(action='put', origin=TEST_ISSUER,
+                               capabilities_ms=80, complete_ms=400)
+        self.assertEqual(response.status_code, 204)
+        self.beacon(action='put', origin=TEST_ISSUER, capabilities_ms=90,
+                    fallback=True)
+        self.beacon(action='get', origin='https://elsewhere.example.com',
+                    complete_ms=1200)
+
+        histograms = get_histograms('client_store')
+        complete = histograms[f"client_store.put.complete_ms.{TEST_ISSUER}"]
+        self.assertEqual(complete['count'], 1)
+        self.assertEqual(complete['buckets']['500'], 1)
+        self.assertEqual(complete['buckets']['+Inf'], 0)
+        self.assertEqual(histograms[
+            f"client_store.put.capabilities_ms.{TEST_ISSUER}"]['count'], 2)
+        self.assertEqual(get_counters('client_store'), {
+            f"client_store.put.completed.{TEST_ISSUER}": 1,
+            f"client_store.put.fallback.{TEST_ISSUER}": 1,
+            'client_store.get.completed.other': 1})
+
+    def test_invalid_beacon(self):
+        self.assertEqual(self.beacon(action='drop').status_code, 400)
+        self.assertEqual(self.beacon(
+            action='put', complete_ms=-1).status_code, 400)
+        self.assertEqual(self.beacon(
+            action='put', complete_ms='fast').status_code, 400)
+        self.assertEqual(self.beacon(
+            action='put', origin='x' * 2000).status_code, 400)
+        self.assertEqual(self.beacon(
+            action='put', capabilities_ms=500, complete_ms=400).status_code,
+            400)
+        self.assertEqual(self.client.post(
+            reverse('client-store-beacon'), '[1]',
+            content_type='text/plain').status_code, 400)
+        self.assertEqual(self.client.get(
+            reverse('client-store-beacon')).status_code, 405)
+        self.assertEqual(get_histograms('client_store'), {})
+
+    def test_beacon_token(self):
+        token = client_store_beacon_token('put', TEST_ISSUER)
+
+        # the token names the flow, and is accepted once
+        response = self.beacon(action='get', origin='https://example.com',
+                               beacon_token=token, complete_ms=400)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.beacon(
+            action='put', beacon_token=token, complete_ms=400).status_code,
+            400)
+        self.assertEqual(get_counters('client_store'), {
+            f"client_store.put.completed.{TEST_ISSUER}": 1})
+
+        self.assertEqual(self.beacon(
+            action='put', beacon_token=None, complete_ms=400).status_code,
+            400)
+        self.assertEqual(self.beacon(
+            action='put', beacon_token=f"{token[:-1]}x",
+            complete_ms=400).status_code, 400)
+        with self.settings(LTI_CLIENT_STORE_BEACON_MAX_AGE=-1):
+            self.assertEqual(self.beacon(
+                action='put', complete_ms=400).status_code, 400)
+
+    def test_adaptive_timeout(self):
+        self.assertEqual(get_client_store_timeout('put', TEST_ISSUER), 5000)
+        for _ in range(19):
+            self.beacon(action='put', origin=TEST_ISSUER, complete_ms=1400)
+
+        with self.settings(LTI_CLIENT_STORE_TIMEOUT_PERCENTILE=95):
+            # too few reports
+            self.assertEqual(
+                get_client_store_timeout('put', TEST_ISSUER), 5000)
+
+            self.beacon(action='put', origin=TEST_ISSUER, complete_ms=1400)
+            self.assertEqual(
+                get_client_store_timeout('put', TEST_ISSUER), 1500)
+            self.assertEqual(
+                get_client_store_timeout('get', TEST_ISSUER), 5000)
+
+            # fallbacks leave the timeout as it was
+            for _ in range(5):
+                self.beacon(action='put', origin=TEST_ISSUER, fallback=True)
+            self.assertEqual(
+                get_client_store_timeout('put', TEST_ISSUER), 1500)
+            self.assertEqual(get_counters('client_store')[
+                f"client_store.put.fallback.{TEST_ISSUER}"], 5)
+
+    def test_histogram_percentile(self):
+        histogram = Histogram(bounds=(10, 100))
+        for value in [5, 8, 50, 500]:
+            histogram.observe(value)
+
+        self.assertEqual(histogram.percentile(50), 10)
+        self.assertEqual(histogram.percentile(75), 100)
+        self.assertEqual(histogram.percentile(100), float('inf'))
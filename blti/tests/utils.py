@@ -0,0 +1,84 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from Crypto.PublicKey import RSA
+from jwcrypto.jwk import JWK
+import tempfile
+import shutil
+import json
+import os
+
+
+TEST_ISSUER = 'https://canvas.test.instructure.com'
+TEST_CLIENT_ID = '10000000000001'
+TEST_DEPLOYMENT_ID = '1:a1b2c3d4e5f6'
+TEST_KEY_LENGTH = 2048
+
+_test_key = None
+
+
+def rsa_test_key(regenerate=False):
+    global _test_key
+    if _test_key is None or regenerate:
+        _test_key = RSA.generate(TEST_KEY_LENGTH)
+
+    return _test_key
+
+
+def public_jwk(key, kid, alg='RS256'):
+    jwk = JWK.from_pem(key.publickey().exportKey(format='PEM')).export_public(
+        as_dict=True)
+    jwk.update({'kid': kid, 'alg': alg, 'use': 'sig'})
+    return jwk
+
+
+def tool_conf_json(issuer=TEST_ISSUER, client_id=TEST_CLIENT_ID,
+                   deployment_ids=None):
+    return {
+        issuer: [{
+            'default': True,
+            'client_id': client_id,
+            'auth_login_url': f"{issuer}/api/lti/authorize_redirect",
+            'auth_token_url': f"{issuer}/login/oauth2/token",
+            'key_set_url': f"{issuer}/api/lti/security/jwks",
+            'private_key_file': 'private.key',
+            'public_key_file': 'public.key',
+            'deployment_ids': deployment_ids or [TEST_DEPLOYMENT_ID]
+        }]
+    }
+
+
+class LTIConfigDirectory(object):
+    """
+    Temporary LTI_CONFIG_DIRECTORY holding a tool.json and a freshly
+    generated key pair.
+    """
+    def __init__(self, tool_conf=None):
+        self.path = tempfile.mkdtemp()
+        self.write_keys()
+        self.write_tool_conf(tool_conf or tool_conf_json())
+
+    def write_keys(self, private_key_file='private.key',
+                   public_key_file='public.key', regenerate=False):
+        key = rsa_test_key(regenerate)
+        self.private_key = key.exportKey(format='PEM').decode('utf-8')
+        self.public_key = key.publickey().exportKey(
+            format='PEM').decode('utf-8')
+        self.write(private_key_file, self.private_key)
+        self.write(public_key_file, self.public_key)
+
+    def write_tool_conf(self, tool_conf):
+        self.write('tool.json', json.dumps(tool_conf))
+
+    def write(self, name, content):
+        # replace rather than rewrite so the inode changes too
+        path = os.path.join(self.path, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+
+        os.replace(tmp_path, path)
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
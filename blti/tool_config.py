@@ -0,0 +1,213 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key)
+from pylti1p3.tool_config import ToolConfDict
+from pylti1p3.deployment import Deployment
+from pylti1p3.registration import Registration
+from urllib.parse import urlparse
+
+
+def merge_tool_conf(tool_confs):
+    """
+    Combine tool.json style dicts into one.  An issuer configured in
+    several of them gets all of their client ids, with the first
+    registration of a client id taking precedence.
+    """
+    merged = {}
+    for tool_conf in tool_confs:
+        for iss, iss_conf in tool_conf.items():
+            if iss not in merged:
+                merged[iss] = iss_conf
+                continue
+
+            current = merged[iss] if isinstance(merged[iss], list) else [
+                merged[iss]]
+            client_ids = set(conf.get('client_id') for conf in current)
+            merged[iss] = current + [conf for conf in (
+                iss_conf if isinstance(iss_conf, list) else [iss_conf]) if (
+                    conf.get('client_id') not in client_ids)]
+
+    return merged
+
+
+class BLTIRegistration(Registration):
+    """
+    Registration signing with a private key object deserialized once,
+    from its own key or else the keyring's current key, so rotating the
+    keyring changes the signing key without a restart
+    """
+    def __init__(self, keyring=None):
+        self._keyring = keyring
+        self._signing_key = None
+        self._kid = None
+
+    def get_tool_private_key(self):
+        if self._tool_private_key:
+            if self._signing_key is None:
+                self._signing_key = load_pem_private_key(
+                    self._tool_private_key.encode('utf-8'), password=None)
+
+            return self._signing_key
+
+        key = self._current_key()
+        return key.signing_key if key else None
+
+    def get_kid(self):
+        if self._tool_private_key:
+            if self._kid is None and self._tool_public_key:
+                self._kid = self.get_jwk(self._tool_public_key).get('kid')
+
+            return self._kid
+
+        key = self._current_key()
+        return key.kid if key else None
+
+    def get_jwks(self):
+        if self._tool_private_key or self._keyring is None:
+            return super().get_jwks()
+
+        return self._keyring.jwks()
+
+    def _current_key(self):
+        return self._keyring.current() if self._keyring else None
+
+
+class IndexedToolConf(ToolConfDict):
+    """
+    ToolConfDict indexed by issuer, (issuer, client id) and (issuer,
+    client id, deployment id) when it is built, so registration and
+    deployment lookups cost the same however many platforms are
+    configured.  Registration conf items carry their key content as
+    "private_key" and "public_key", and those without sign with the
+    keyring's current key.
+    """
+    def __init__(self, json_data, keyring=None):
+        # relation types are otherwise shared by every ToolConfAbstract
+        self.issuers_relation_types = {}
+        self.keyring = keyring
+        super().__init__(json_data)
+
+        self._registrations = {}
+        self._defaults = {}
+        self._deployments = {}
+        self._client_ids = {}
+        self._origins = set()
+        for iss, iss_conf in json_data.items():
+            if isinstance(iss_conf, list):
+                self._index_issuer(iss, iss_conf)
+            else:
+                self._index_issuer(iss, [iss_conf], one_client=True)
+
+    def _index_issuer(self, iss, iss_confs, one_client=False):
+        client_ids = []
+        for iss_conf in iss_confs:
+            client_id = iss_conf['client_id']
+            if (iss, client_id) in self._registrations:
+                continue
+
+            client_id_arg = None if one_client else client_id
+            if iss_conf.get('private_key'):
+                self.set_private_key(
+                    iss, iss_conf['private_key'], client_id=client_id_arg)
+            if iss_conf.get('public_key'):
+                self.set_public_key(
+                    iss, iss_conf['public_key'], client_id=client_id_arg)
+
+            registration = self._get_registration(iss, iss_conf)
+            self._registrations[(iss, client_id)] = registration
+            for url in [iss_conf['auth_login_url'],
+                        iss_conf['auth_token_url']]:
+                url = urlparse(url)
+                self._origins.add(f"{url.scheme}://{url.netloc}")
+            client_ids.append(client_id)
+
+            # as get_iss_config(), the first default or only conf item
+            if iss not in self._defaults and (
+                    iss_conf.get('default', False) or len(iss_confs) == 1):
+                self._defaults[iss] = registration
+
+            for deployment_id in iss_conf['deployment_ids']:
+                self._deployments[(iss, client_id, deployment_id)] = (
+                    Deployment().set_deployment_id(deployment_id))
+
+        self._client_ids[iss] = frozenset(client_ids)
+
+    def _get_registration(self, iss, iss_conf):
+        client_id = iss_conf['client_id']
+        registration = BLTIRegistration(self.keyring)
+        registration.set_issuer(iss).set_client_id(client_id)
+        registration.set_auth_login_url(iss_conf['auth_login_url'])
+        registration.set_auth_token_url(iss_conf['auth_token_url'])
+        registration.set_key_set_url(iss_conf.get('key_set_url'))
+        registration.set_key_set(iss_conf.get('key_set'))
+
+        if iss_conf.get('auth_audience'):
+            registration.set_auth_audience(iss_conf['auth_audience'])
+
+        private_key = self.get_private_key(iss, client_id)
+        if private_key:
+            registration.set_tool_private_key(private_key)
+
+        public_key = self.get_public_key(iss, client_id)
+        if public_key:
+            registration.set_tool_public_key(public_key)
+
+        return registration
+
+    def get_jwks(self, iss=None, client_id=None, **kwargs):
+        jwks = super().get_jwks(iss, client_id, **kwargs)
+        if iss or client_id or self.keyring is None:
+            return jwks
+
+        kids = set(key.get('kid') for key in jwks['keys'])
+        return {'keys': jwks['keys'] + [key for key in (
+            self.keyring.jwks()) if key['kid'] not in kids]}
+
+    def get_client_ids(self):
+        """
+        Client ids registered for each issuer
+        """
+        return self._client_ids
+
+    def get_platform_origins(self):
+        """
+        Origins of the registered platforms' authorization endpoints
+        """
+        return self._origins
+
+    def find_registration_by_issuer(self, iss, *args, **kwargs):
+        try:
+            return self._defaults[iss]
+        except KeyError:
+            if iss in self._client_ids:
+                raise Exception(
+                    f"iss {iss} [client_id=None] not found in settings")
+
+            raise Exception(f"iss {iss} not found in settings")
+
+    def find_registration_by_params(self, iss, client_id, *args, **kwargs):
+        if not client_id or self.check_iss_has_one_client(iss):
+            return self.find_registration_by_issuer(iss)
+
+        try:
+            return self._registrations[(iss, client_id)]
+        except KeyError:
+            if iss in self._client_ids:
+                raise Exception(
+                    f"iss {iss} [client_id={client_id}] not found in settings")
+
+            raise Exception(f"iss {iss} not found in settings")
+
+    def find_deployment(self, iss, deployment_id):
+        return self._deployments.get((
+            iss, self.find_registration_by_issuer(iss).get_client_id(),
+            deployment_id))
+
+    def find_deployment_by_params(
+            self, iss, deployment_id, client_id, *args, **kwargs):
+        return self._deployments.get((
+            iss, self.find_registration_by_params(
+                iss, client_id).get_client_id(), deployment_id))
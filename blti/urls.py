@@ -4,12 +4,18 @@
 
 from django.conf import settings
 from django.urls import re_path
-from blti.views import login, get_jwks, BLTIRawView
+from blti.views import (
+    login, get_jwks, get_client_store_script, client_store_beacon,
+    BLTIRawView)
 
 
 urlpatterns = [
     re_path(r'^login/?$', login, name='login'),
     re_path(r'^jwks/?$', get_jwks, name='jwks'),
+    re_path(r'^js/client_store\.(?P<version>[0-9a-f]+)\.js$',
+            get_client_store_script, name='client-store-script'),
+    re_path(r'^client_store/beacon/?$', client_store_beacon,
+            name='client-store-beacon'),
     re_path(r'^$', BLTIRawView.as_view(), name='lti-launch-data'),
 ]
 
@@ -7,14 +7,27 @@ from django.core.exceptions import ImproperlyConfigured
 from oauthlib.oauth1.rfc5849.request_validator import RequestValidator
 from oauthlib.oauth1.rfc5849.utils import UNICODE_ASCII_CHARACTER_SET
 from blti.exceptions import BLTIException
+from blti.consumers import get_consumer_registry
+from blti.metrics import increment_counter
+from blti.nonce import get_nonce_store
+from blti.models.base import (
+    ROLE_MEMBER, ROLE_ADMINISTRATOR, ROLE_STAFF, ROLE_INSTRUCTOR,
+    ROLE_TEACHING_ASSISTANT, ROLE_STUDENT, ROLE_DESIGNER)
+from functools import lru_cache
 import time
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+OAUTH_TIMESTAMP_WINDOW = 60
+
 
 class BLTIRequestValidator(RequestValidator):
+    def __init__(self, *args, **kwargs):
+        super(BLTIRequestValidator, self).__init__(*args, **kwargs)
+        self._nonces = {}
+
     @property
     def allowed_signature_methods(self):
         return ['HMAC-SHA1']
@@ -45,45 +58,135 @@ class BLTIRequestValidator(RequestValidator):
             client_key, request) != self.dummy_client
 
     def get_client_secret(self, client_key, request):
-        try:
-            return getattr(
-                settings, 'LTI_CONSUMERS', {})[client_key]
-        except KeyError:
-            return self.dummy_client
+        secret = get_consumer_registry().get_secret(client_key)
+        return secret if secret is not None else self.dummy_client
 
     def validate_timestamp_and_nonce(self, client_key, timestamp, nonce,
                                      request, request_token=None,
                                      access_token=None):
-        now = int(time.time())
-        return (now - 60) <= int(timestamp) <= (now + 60)
+        # the result is kept so revalidating the same request, as
+        # with an https scheme, isn't seen as a replay
+        key = (client_key, timestamp, nonce)
+        if key not in self._nonces:
+            self._nonces[key] = check_timestamp_and_nonce(
+                client_key, timestamp, nonce)
+
+        return self._nonces[key]
+
+
+def check_timestamp_and_nonce(client_key, timestamp, nonce):
+    """
+    Accept a timestamp within OAUTH_TIMESTAMP_WINDOW seconds and a nonce
+    unseen for as long as its timestamp is acceptable
+    """
+    now = int(time.time())
+    timestamp = int(timestamp)
+    if not ((now - OAUTH_TIMESTAMP_WINDOW) <= timestamp <= (
+            now + OAUTH_TIMESTAMP_WINDOW)):
+        return False
+
+    key = f"{client_key}:{timestamp}:{nonce}"
+    if not get_nonce_store().check_and_add(
+            key, timestamp + OAUTH_TIMESTAMP_WINDOW):
+        increment_counter('oauth.nonce.replay')
+        logger.info(f"Rejected replayed OAuth nonce: {key}")
+        return False
+
+    return True
+
+
+# authorized_role names and the launch role bits they accept
+AUTHORIZED_ROLE_MASKS = {
+    'member': ROLE_MEMBER,
+    'admin': ROLE_ADMINISTRATOR,
+    'administrator': ROLE_STAFF,
+    'sysadmin': ROLE_STAFF,
+    'instructor': ROLE_INSTRUCTOR,
+    'teacher': ROLE_INSTRUCTOR,
+    'teachingassistant': ROLE_TEACHING_ASSISTANT,
+    'ta': ROLE_TEACHING_ASSISTANT,
+    'student': ROLE_STUDENT,
+    'learner': ROLE_STUDENT,
+    'contentdeveloper': ROLE_DESIGNER,
+    'designer': ROLE_DESIGNER,
+}
+PUBLIC_ROLE = 'public'
+ROLES_ANY = 'any'
+ROLES_ALL = 'all'
+
+# never set on a launch, so unknown roles can't be satisfied
+ROLE_UNKNOWN = 1 << 31
+
+# launch data properties for each role bit, for launch data without
+# a role_mask
+ROLE_PROPERTIES = (
+    (ROLE_MEMBER, 'is_member'),
+    (ROLE_ADMINISTRATOR, 'is_administrator'),
+    (ROLE_STAFF, 'is_staff'),
+    (ROLE_INSTRUCTOR, 'is_instructor'),
+    (ROLE_TEACHING_ASSISTANT, 'is_teaching_assistant'),
+    (ROLE_STUDENT, 'is_student'),
+    (ROLE_DESIGNER, 'is_designer'),
+)
+
+
+@lru_cache(maxsize=256)
+def authorized_role_mask(roles, match=ROLES_ANY):
+    """
+    Reduce a tuple of authorized role names to a role mask, or None if
+    access is unrestricted
+    """
+    mask = 0
+    for role in roles:
+        role = role.lower() if role else None
+        if not role or role == PUBLIC_ROLE:
+            if match == ROLES_ANY:
+                return None
+        else:
+            mask |= AUTHORIZED_ROLE_MASKS.get(role, ROLE_UNKNOWN)
+
+    if not mask and match == ROLES_ALL:
+        return None
+
+    return mask
+
+
+def launch_role_mask(launch_data):
+    """
+    The launch data's role mask, or one built from its is_* properties
+    """
+    mask = getattr(launch_data, 'role_mask', None)
+    if mask is not None:
+        return mask
+
+    mask = 0
+    for role_bit, name in ROLE_PROPERTIES:
+        if getattr(launch_data, name, False):
+            mask |= role_bit
+
+    return mask
 
 
 class Roles(object):
     def __init__(self, launch_data):
         self.blti = launch_data
 
-    def authorize(self, role='member'):
+    def authorize(self, role='member', match=ROLES_ANY):
         if not hasattr(self, 'blti') or self.blti is None:
             raise ImproperlyConfigured(
                 'Roles class requires a blti model')
 
-        role = role.lower() if role else None
-        if not role or role == 'public' or (
-                role == 'member' and
-                self.blti.is_member) or (
-                    role == 'admin' and
-                    self.blti.is_administrator) or (
-                        role in ['administrator', 'sysadmin'] and
-                        self.blti.is_staff) or (
-                            role in ['instructor', 'teacher']
-                            and self.blti.is_instructor) or (
-                                role in ['teachingassistant', 'ta'] and
-                                self.blti.is_teaching_assistant) or (
-                                    role in ['student', 'learner'] and
-                                    self.blti.is_student) or (
-                                        role in [
-                                            'contentdeveloper', 'designer'] and
-                                        self.blti.is_designer):
+        if match not in (ROLES_ANY, ROLES_ALL):
+            raise ImproperlyConfigured(
+                f"Invalid role match: {match}")
+
+        roles = tuple(role) if isinstance(role, (list, tuple)) else (role,)
+        mask = authorized_role_mask(roles, match)
+        if mask is None:
+            return
+
+        granted = launch_role_mask(self.blti) & mask
+        if granted and (match == ROLES_ANY or granted == mask):
             return
 
         raise BLTIException('You are not authorized to view this content')
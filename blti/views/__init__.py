@@ -4,6 +4,7 @@
 
 from .login import login
 from .jwks import get_jwks
+from .client_store import get_client_store_script, client_store_beacon
 from .base import BLTIView
 from .launch import BLTILaunchView
 from .raw import BLTIRawView
@@ -7,12 +7,15 @@ from django.views.decorators.csrf import csrf_exempt
 from blti import BLTI
 from blti.models import CanvasData
 from blti.exceptions import BLTIException
-from blti.validators import Roles
+from blti.validators import Roles, ROLES_ANY
 
 
 @method_decorator(csrf_exempt, name='dispatch')
 class BLTIView(TemplateView):
+    # a role name, or a list of role names matched per
+    # authorized_role_match as 'any' or 'all'
     authorized_role = 'member'
+    authorized_role_match = ROLES_ANY
 
     def dispatch(self, request, *args, **kwargs):
         try:
@@ -34,6 +37,9 @@ class BLTIView(TemplateView):
     def set_session(self, **kwargs):
         BLTI().set_session(self.request, **kwargs)
 
+    def issue_session_key(self):
+        BLTI().issue_session_key(self.request)
+
     def get_session(self):
         return BLTI().get_session(self.request)
 
@@ -44,7 +50,8 @@ class BLTIView(TemplateView):
             self.authorize(self.authorized_role)
 
     def authorize(self, role):
-        Roles(self.blti).authorize(role=role)
+        Roles(self.blti).authorize(
+            role=role, match=self.authorized_role_match)
 
     def launch_data_model(self):
         return CanvasData(**self.get_session())
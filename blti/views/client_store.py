@@ -0,0 +1,47 @@
+# Copyright 2026 UW-IT, University of Washington
+# SPDX-License-Identifier: Apache-2.0
+
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from blti.client_store import (
+    client_store_script, record_client_store_report)
+import json
+
+
+CLIENT_STORE_SCRIPT_MAX_AGE = 31536000
+STALE_SCRIPT_MAX_AGE = 60
+MAX_BEACON_SIZE = 1024
+
+
+def get_client_store_script(request, version):
+    content, current_version = client_store_script()
+
+    # the url is fingerprinted, so the current script never changes
+    # and pages naming a previous version get it only briefly
+    cache_control = 'public, max-age={}, immutable'.format(
+        CLIENT_STORE_SCRIPT_MAX_AGE) if version == current_version else (
+            'public, max-age={}'.format(STALE_SCRIPT_MAX_AGE))
+
+    response = HttpResponse(content, content_type='text/javascript')
+    response['Cache-Control'] = cache_control
+    return response
+
+
+@csrf_exempt
+@require_POST
+def client_store_beacon(request):
+    # timing reported by the client side storage script
+    try:
+        if int(request.META.get('CONTENT_LENGTH') or 0) > MAX_BEACON_SIZE:
+            raise ValueError('Beacon too large')
+
+        report = json.loads(request.body)
+        if not isinstance(report, dict):
+            raise ValueError('Invalid beacon')
+
+        record_client_store_report(report)
+    except ValueError:
+        return HttpResponse(status=400)
+
+    return HttpResponse(status=204)
@@ -1,12 +1,78 @@
 # Copyright 2026 UW-IT, University of Washington
 # SPDX-License-Identifier: Apache-2.0
 
+from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
-from blti.config import get_tool_conf
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseNotModified
+from blti.config import get_tool_conf, get_tool_conf_version
+import hashlib
+import threading
+import json
+
+
+DEFAULT_JWKS_MAX_AGE = 3600
+
+
+class JWKSDocument(object):
+    """
+    Tool JWKS, serialized once per tool configuration version and
+    kept as encoded bytes along with its strong ETag, published
+    together as one (content, etag) tuple.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._document = (None, None)
+
+    def refresh(self):
+        """
+        The current (content, etag)
+        """
+        version = get_tool_conf_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    content = json.dumps(
+                        get_tool_conf().get_jwks(),
+                        separators=(',', ':')).encode('utf-8')
+                    self._document = (content, '"{}"'.format(
+                        hashlib.sha256(content).hexdigest()))
+                    self._version = version
+
+        return self._document
+
+
+_jwks_document = JWKSDocument()
+
+
+def _etag_matches(if_none_match, etag):
+    if if_none_match.strip() == '*':
+        return True
+
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+
+        if tag == etag:
+            return True
+
+    return False
 
 
 @csrf_exempt
 def get_jwks(request):
-    tool_conf = get_tool_conf()
-    return JsonResponse(tool_conf.get_jwks(), safe=False)
+    content, etag = _jwks_document.refresh()
+    cache_control = 'public, max-age={}'.format(
+        getattr(settings, 'LTI_JWKS_MAX_AGE', DEFAULT_JWKS_MAX_AGE))
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and _etag_matches(if_none_match, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(
+            content, content_type='application/json')
+
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
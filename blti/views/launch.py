@@ -3,26 +3,32 @@
 
 
 from .base import BLTIView
+from django.conf import settings
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from blti.config import get_tool_conf, get_launch_data_storage
 from blti.request import BLTIRequest
 from blti.exceptions import BLTIException
-from blti.validators import BLTIRequestValidator
+from blti.oauth import BLTIOAuthVerifier
 from blti.launch_redirect import BLTILaunchRedirect
 from blti.cookie import BLTICookieService
+from blti.message_launch import BLTIMessageLaunch
+from blti.id_token import get_id_token
+from blti.prevalidation import (
+    BLTILaunchPreValidator, BLTILaunchRejected, unauthorized_response)
+from blti.metrics import increment_counter
+from blti.middleware import LTI_AUTH_REQUEST_ATTR
 from pylti1p3.exception import OIDCException
-from pylti1p3.contrib.django import DjangoMessageLaunch
-from oauthlib.oauth1.rfc5849.endpoints.signature_only import (
-    SignatureOnlyEndpoint)
 from pylti1p3.contrib.django.session import DjangoSessionService
 from urllib.parse import urljoin, urlparse, urlencode
-import json
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+LTI_1P1 = 'lti1p1'
+LTI_1P3 = 'lti1p3'
+
 
 @method_decorator(csrf_exempt, name='dispatch')
 class BLTILaunchView(BLTIView):
@@ -44,55 +50,97 @@ class BLTILaunchView(BLTIView):
 
     def dispatch(self, request, *args, **kwargs):
         try:
-            launch_data = self.validate_1p1(request)
-            logger.debug(f"LTI 1.1 launch")
-        except BLTIException as ex:
-            try:
+            protocol = self.prevalidate(request)
+        except BLTILaunchRejected as ex:
+            increment_counter(f"launch.rejected.{ex.reason}")
+            logger.info(f"LTI launch rejected: {ex.reason}")
+            return unauthorized_response()
+
+        increment_counter(f"launch.protocol.{protocol or 'unknown'}")
+
+        try:
+            launch_data = None
+            if protocol != LTI_1P3:
+                try:
+                    launch_data = self.validate_1p1(request)
+                    logger.debug(f"LTI 1.1 launch")
+                except BLTIException:
+                    # without protocol markers, fall back to 1.3
+                    if protocol == LTI_1P1:
+                        raise
+
+            if launch_data is None:
                 if self._missing_lti_parameters(request):
                     return self._client_store_redirect(request)
 
                 launch_data = self.validate_1p3(request)
                 logger.debug(f"LTI 1.3 launch")
-            except OIDCException as ex:
-                logger.error(f"LTI authentication failure: {ex}")
-                self.template_name = 'blti/401.html'
-                return self.render_to_response(
-                    {'LTI authentication failure': str(ex)}, status=401)
-            except Exception as ex:
-                logger.error(f"LTI launch error: {ex}")
-                self.template_name = 'blti/401.html'
-                return self.render_to_response(
-                    {'LTI launch failure': str(ex)}, status=401)
+        except (OIDCException, BLTIException) as ex:
+            logger.error(f"LTI authentication failure: {ex}")
+            self.template_name = 'blti/401.html'
+            return self.render_to_response(
+                {'LTI authentication failure': str(ex)}, status=401)
+        except Exception as ex:
+            logger.error(f"LTI launch error: {ex}")
+            self.template_name = 'blti/401.html'
+            return self.render_to_response(
+                {'LTI launch failure': str(ex)}, status=401)
 
         self.set_session(**launch_data)
+
+        # the launch user is logged in before a new session has a key,
+        # so the key isn't cycled after the browser is given it
+        authentication = getattr(request, LTI_AUTH_REQUEST_ATTR, None)
+        if authentication is not None:
+            authentication.authenticate(request)
+
+        self.issue_session_key()
         return super(BLTILaunchView, self).dispatch(request, *args, **kwargs)
 
-    def validate_1p1(self, request):
-        request_validator = BLTIRequestValidator()
-        endpoint = SignatureOnlyEndpoint(request_validator)
-        uri = request.build_absolute_uri()
-        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    def prevalidate(self, request):
+        # reject junk launches before any signature is checked
+        pre_validator = BLTILaunchPreValidator()
+        pre_validator.validate_size(request)
+
+        protocol = self.launch_protocol(request)
+        if protocol == LTI_1P1:
+            pre_validator.validate_1p1(request)
+        elif protocol == LTI_1P3:
+            pre_validator.validate_1p3(request, self.get_id_token(request))
+        elif not getattr(settings, 'LTI_DEVELOP_APP', False):
+            # only development launches arrive without protocol markers
+            raise BLTILaunchRejected('protocol')
+
+        return protocol
+
+    def launch_protocol(self, request):
+        # classify the launch by its parameters so only the
+        # matching validator is run.  the raw body is read before
+        # the form is parsed so it remains available for validate_1p1
+        if request.method == 'POST':
+            _ = request.body
+
+        params = request.POST if request.method == 'POST' else request.GET
+        if 'oauth_signature' in params:
+            return LTI_1P1
 
-        valid, oauth_req = endpoint.validate_request(
-            uri, request.method, request.body, headers)
+        if 'id_token' in params or 'state' in params:
+            return LTI_1P3
 
-        # if non-ssl fixup scheme to validate signature generated
-        # on the other side of ingress
-        if not valid and uri.startswith('http:') and request.is_secure():
-            valid, oauth_req = endpoint.validate_request(
-                f"https{uri[4:]}", request.method, request.body, headers)
+        if 'lti_message_type' in params:
+            return LTI_1P1
 
-        if not valid:
-            raise BLTIException('Invalid OAuth Request')
+        return None
 
-        blti_params = dict(oauth_req.params)
-        return blti_params
+    def validate_1p1(self, request):
+        return BLTIOAuthVerifier().verify(request)
 
     def validate_1p3(self, request):
         tool_conf = get_tool_conf()
         launch_data_storage = get_launch_data_storage()
-        message_launch = DjangoMessageLaunch(
-            request, tool_conf, launch_data_storage=launch_data_storage)
+        message_launch = BLTIMessageLaunch(
+            request, tool_conf, launch_data_storage=launch_data_storage
+        ).set_id_token(self.get_id_token(request))
         return message_launch.get_launch_data()
 
     def _missing_lti_parameters(self, request):
@@ -103,15 +151,17 @@ class BLTILaunchView(BLTIView):
         data_storage.set_request(blti_request)
 
         session_cookie_name = data_storage.get_session_cookie_name()
-        session_id = cookie_service.get_cookie(session_cookie_name) if (
-            session_cookie_name) else None
+        if not session_cookie_name:
+            return self._missing_state_cookie(request, cookie_service)
+
+        session_id = cookie_service.get_cookie(session_cookie_name)
 
         if not session_id:
             # peel parameters inserted from client side storage
             # off and insert them into the request validation
             session_id = self.get_parameter(
                 request, self._oidc_launch_client_store_session_id)
-            if session_cookie_name and session_id:
+            if session_id:
                 # insert request session cookie
                 cookie_service.set_request_cookie(
                     session_cookie_name, session_id)
@@ -131,35 +181,47 @@ class BLTILaunchView(BLTIView):
 
         return False
 
+    def _missing_state_cookie(self, request, cookie_service):
+        # without a launch data session, only the state cookie
+        # is needed, restored from client side storage if withheld
+        state = self.get_parameter(request, 'state')
+        if state and cookie_service.get_cookie(state):
+            return False
+
+        state = self.get_parameter(
+            request, self._oidc_launch_client_store_state)
+        if state:
+            cookie_service.set_request_cookie(state, state)
+            return False
+
+        return bool(self.get_parameter(request, 'lti_storage_target'))
+
     def _client_store_redirect(self, request):
         redirect_uri = request.build_absolute_uri()
 
         if redirect_uri.startswith('http:') and request.is_secure():
-            redirect_uri = f"https{uri[4:]}"
+            redirect_uri = f"https{redirect_uri[4:]}"
 
         parameters = {k: self.get_parameter(request, k) for (
             k) in self._oidc_launch_keys}
-        auth_origin = self._login_origin_from_iss(parameters['id_token'])
+        auth_origin = self._login_origin_from_iss(self.get_id_token(request))
 
         logger.debug(f"LTI 1.3 client side storage redirect")
         return BLTILaunchRedirect(
-            redirect_uri, parameters, auth_origin).do_js_redirect()
+            redirect_uri, parameters, auth_origin,
+            request=request).do_js_redirect()
 
     def _login_origin_from_iss(self, id_token):
-        # oidc auth origin from iss dug out of jwt
-        jwt = self._jwt_from_id_token(id_token)
-        iss = jwt.get('iss')
-        reg = get_tool_conf().find_registration_by_issuer(iss)
+        # oidc auth origin from the registration for the id_token iss
+        reg = id_token.find_registration(get_tool_conf())
+        if not reg:
+            raise BLTIException('Registration not found')
+
         auth_url = urlparse(reg.get_auth_token_url())
         return f"{auth_url.scheme}://{auth_url.netloc}"
 
-    def _jwt_from_id_token(self, id_token):
-        parts = id_token.split('.')
-        if len(parts) != 3:
-            raise BLTIException("Invalid id_token")
-
-        raw_body = DjangoMessageLaunch.urlsafe_b64decode(parts[1])
-        return json.loads(raw_body)
+    def get_id_token(self, request):
+        return get_id_token(request, self.get_parameter(request, 'id_token'))
 
     def get_parameter(self, request, key):
         params = request.POST if request.method == 'POST' else request.GET
@@ -5,6 +5,8 @@ from django.views.decorators.csrf import csrf_exempt
 from django.template.response import TemplateResponse
 from blti.config import get_tool_conf, get_launch_data_storage
 from blti.oidc_login import BLTIOIDCLogin
+from blti.cookie import cookies_allowed_remembered, remember_cookies_allowed
+from blti.metrics import increment_counter
 import logging
 
 
@@ -24,8 +26,23 @@ def login(request):
         if target_link_uri.startswith('http:') and request.is_secure():
             target_link_uri = f"https:{target_link_uri[5:]}"
 
-        return oidc_login.enable_check_cookies().redirect(
-            target_link_uri, js_redirect)
+        remembered = cookies_allowed_remembered(request)
+        if remembered:
+            increment_counter('login.cookie_check.skipped')
+        else:
+            oidc_login.enable_check_cookies()
+            if not oidc_login.is_new_window_request():
+                increment_counter('login.cookie_check.performed')
+
+        response = oidc_login.redirect(target_link_uri, js_redirect)
+
+        # the check reloads the login without a storage frame only
+        # when the browser accepted its cookie
+        if not remembered and not js_redirect and (
+                oidc_login.is_new_window_request()):
+            remember_cookies_allowed(request, response)
+
+        return response
     except KeyError:
         logger.error(f"Missing 'target_link_uri' in {request.method} params: "
                      "{request.body.decode('utf-8')}")
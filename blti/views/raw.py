@@ -11,8 +11,10 @@ class BLTIRawView(BLTILaunchView):
     authorized_role = 'admin'
 
     def get_context_data(self, **kwargs):
-        params = [(k, getattr(self.blti, k)) for k in sorted(
-            vars(self.blti)) if not k.startswith("_")]
+        # include lazily evaluated attributes, like the role flags
+        params = [(k, v) for k, v in (
+            (k, getattr(self.blti, k)) for k in sorted(
+                dir(self.blti)) if not k.startswith("_")) if not callable(v)]
 
         return {
             'digested_lti_params': params,